@@ -0,0 +1,413 @@
+"""
+解析器基准测试 - 用固定的页面样本核对各解析后端的输出与黄金结果一致，
+并测量每个后端的 页/秒、条/秒 和峰值RSS，结果追加到 results.jsonl 以便与历次运行比较
+
+用法:
+    python benchmarks/bench_parser.py                      # 核对黄金结果 + 基准测试全部后端
+    python benchmarks/bench_parser.py --scale 1 10 50      # 同时测试把条目数放大10倍、50倍的合成页面
+    python benchmarks/bench_parser.py --update-golden      # 用BeautifulSoup解析器重新生成黄金结果
+    python benchmarks/bench_parser.py --import-cache 3     # 从页面缓存中每类复制3个真实页面作为样本
+
+样本文件名以页面类型开头：comments*、reviews*、review_detail*、movie*
+"""
+import argparse
+import copy
+import json
+import os
+import subprocess
+import sys
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+try:
+    # 峰值RSS（Windows上没有resource模块，不测量内存）
+    import resource
+except ImportError:
+    resource = None
+
+from lxml import etree
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.dirname(BENCH_DIR))
+
+from src.parser import create_parser, PARSER_BACKENDS
+
+FIXTURE_DIR = os.path.join(BENCH_DIR, 'fixtures')
+GOLDEN_DIR = os.path.join(BENCH_DIR, 'golden')
+RESULTS_FILE = os.path.join(BENCH_DIR, 'results.jsonl')
+
+# 文件名前缀 -> 页面类型（按顺序匹配，review_detail 要在 reviews 之前）
+FIXTURE_KINDS = [
+    ('review_detail', 'full_review'),
+    ('reviews', 'reviews'),
+    ('comments', 'comments'),
+    ('movie', 'movie_info'),
+]
+
+# 黄金结果覆盖解析器的全部公开方法
+GOLDEN_METHODS: Dict[str, Callable] = {
+    'parse_movie_info': lambda parser, html: parser.parse_movie_info(html),
+    'parse_comments_page': lambda parser, html: parser.parse_comments_page(html),
+    'parse_reviews_page': lambda parser, html: parser.parse_reviews_page(html),
+    'parse_page_comments': lambda parser, html: parser.parse_page(html, 'comments'),
+    'parse_page_reviews': lambda parser, html: parser.parse_page(html, 'reviews'),
+    'parse_full_review': lambda parser, html: parser.parse_full_review(html),
+    'parse_review_replies': lambda parser, html: parser.parse_review_replies(html),
+    'get_total_comments_count': lambda parser, html: parser.get_total_comments_count(html),
+    'get_total_reviews_count': lambda parser, html: parser.get_total_reviews_count(html),
+    'has_next_page': lambda parser, html: parser.has_next_page(html),
+}
+
+# 每类页面在爬取时实际调用的方法（基准测试的对象）
+BENCH_METHODS: Dict[str, Callable] = {
+    'comments': lambda parser, html: parser.parse_page(html, 'comments'),
+    'reviews': lambda parser, html: parser.parse_page(html, 'reviews'),
+    'full_review': lambda parser, html: parser.parse_full_review(html),
+    'movie_info': lambda parser, html: parser.parse_movie_info(html),
+}
+
+# 合成放大时复制的条目节点
+ITEM_XPATHS = {
+    'comments': "//div[contains(concat(' ', normalize-space(@class), ' '), ' comment-item ')]",
+    'reviews': "//div[contains(concat(' ', normalize-space(@class), ' '), ' review-item ')]",
+    'full_review': "//div[@id='comments']//div[contains(concat(' ', normalize-space(@class), ' '), ' comment-item ')]",
+}
+
+
+def fixture_kind(name: str) -> str:
+    """根据样本文件名判断页面类型"""
+    for prefix, kind in FIXTURE_KINDS:
+        if name.startswith(prefix):
+            return kind
+    raise ValueError(f"无法识别样本类型（文件名应以 comments/reviews/review_detail/movie 开头）: {name}")
+
+
+def load_fixtures() -> Dict[str, str]:
+    """读取全部样本页面，按文件名排序"""
+    fixtures = {}
+    for name in sorted(os.listdir(FIXTURE_DIR)):
+        if name.endswith('.html'):
+            with open(os.path.join(FIXTURE_DIR, name), 'r', encoding='utf-8') as f:
+                fixtures[name] = f.read()
+    return fixtures
+
+
+def run_methods(parser, html: str) -> Dict:
+    """对一个页面调用全部公开方法，异常记为错误类型（解析器之间也要一致）"""
+    results = {}
+    for method, call in GOLDEN_METHODS.items():
+        try:
+            results[method] = call(parser, html)
+        except Exception as e:
+            results[method] = {'error': type(e).__name__}
+    # 经过一次JSON往返，与黄金文件中的类型一致（元组变列表等）
+    return json.loads(json.dumps(results, ensure_ascii=False))
+
+
+def golden_path(name: str) -> str:
+    return os.path.join(GOLDEN_DIR, os.path.splitext(name)[0] + '.json')
+
+
+def update_golden(fixtures: Dict[str, str]):
+    """用BeautifulSoup解析器（参考实现）重新生成黄金结果"""
+    os.makedirs(GOLDEN_DIR, exist_ok=True)
+    parser = create_parser('bs4')
+    for name, html in fixtures.items():
+        with open(golden_path(name), 'w', encoding='utf-8') as f:
+            json.dump(run_methods(parser, html), f, ensure_ascii=False, indent=2)
+            f.write('\n')
+        print(f"  已生成 {os.path.relpath(golden_path(name), BENCH_DIR)}")
+
+
+def check_golden(fixtures: Dict[str, str], backends: List[str]) -> int:
+    """
+    核对各后端的输出与黄金结果一致（包括字段顺序）
+
+    Returns:
+        不一致的 (后端, 样本, 方法) 数量
+    """
+    mismatches = 0
+    for backend in backends:
+        parser = create_parser(backend)
+        for name, html in fixtures.items():
+            path = golden_path(name)
+            if not os.path.exists(path):
+                print(f"  ⚠️ 缺少黄金结果: {name}（运行 --update-golden 生成）")
+                mismatches += 1
+                continue
+            with open(path, 'r', encoding='utf-8') as f:
+                golden = json.load(f)
+            actual = run_methods(parser, html)
+            for method in GOLDEN_METHODS:
+                if json.dumps(actual.get(method), ensure_ascii=False) != json.dumps(golden.get(method), ensure_ascii=False):
+                    print(f"  ❌ {backend} {name} {method} 与黄金结果不一致")
+                    mismatches += 1
+    return mismatches
+
+
+def scale_page(html: str, kind: str, factor: int) -> str:
+    """
+    合成放大页面：把页面中的条目节点复制为 factor 倍（data-cid 加后缀保持唯一）
+
+    Args:
+        html: 样本页面
+        kind: 页面类型
+        factor: 放大倍数
+
+    Returns:
+        放大后的HTML；电影详情页等没有条目的页面原样返回
+    """
+    if factor <= 1 or kind not in ITEM_XPATHS:
+        return html
+    root = etree.HTML(html)
+    items = root.xpath(ITEM_XPATHS[kind])
+    if not items:
+        return html
+
+    last = items[-1]
+    for n in range(1, factor):
+        for item in items:
+            clone = copy.deepcopy(item)
+            if clone.get('data-cid'):
+                clone.set('data-cid', f"{clone.get('data-cid')}-{n}")
+            last.addnext(clone)
+            last = clone
+    return etree.tostring(root, encoding='unicode', method='html')
+
+
+def count_items(kind: str, result) -> int:
+    """一个页面解析出的条目数（短评/影评条数、回应条数，电影信息计为1）"""
+    if kind in ('comments', 'reviews'):
+        return len(result['items'])
+    if kind == 'full_review':
+        return len(result['replies'])
+    return 1
+
+
+def _max_rss_kb() -> float:
+    """
+    当前进程的峰值RSS（KB）
+
+    Linux上读取 /proc/self/status 的 VmHWM：ru_maxrss 在exec之后仍保留父进程的峰值，
+    基准测试进程内存较大时子进程测不出增长；其他平台使用 ru_maxrss（macOS上单位是字节）
+    """
+    try:
+        with open('/proc/self/status', 'r') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return float(line.split()[1])
+    except OSError:
+        pass
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss / 1024 if sys.platform == 'darwin' else max_rss
+
+
+def measure_rss(backend: str, kind: str):
+    """子进程入口：从标准输入读取页面，解析一次，输出解析期间峰值RSS的增长（KB）"""
+    html = sys.stdin.read()
+    parser = create_parser(backend)
+    before = _max_rss_kb()
+    BENCH_METHODS[kind](parser, html)
+    print(max(_max_rss_kb() - before, 0))
+
+
+def peak_rss_kb(backend: str, html: str, kind: str) -> Optional[float]:
+    """
+    在新的子进程中解析一次页面，测量峰值RSS的增长
+
+    tracemalloc只能看到Python对象的分配，看不到libxml2等C库的内存，lxml后端的结果会严重偏小；
+    RSS包括全部内存，每次在新进程中测量，避免前面的测量抬高峰值
+
+    Returns:
+        峰值RSS增长（KB）；不支持的平台或子进程失败时返回None
+    """
+    if resource is None:
+        return None
+    proc = subprocess.run([sys.executable, os.path.abspath(__file__), '--measure-rss', backend, kind],
+                          input=html, capture_output=True, text=True, encoding='utf-8', timeout=300)
+    if proc.returncode != 0:
+        return None
+    return float(proc.stdout.strip().splitlines()[-1])
+
+
+def bench_page(backend: str, html: str, kind: str, min_time: float) -> Dict:
+    """
+    测量一个后端解析一个页面的吞吐量和峰值RSS
+
+    Args:
+        backend: 解析后端
+        html: 页面HTML
+        kind: 页面类型
+        min_time: 最短测量时间（秒），至少解析3次
+
+    Returns:
+        {items, pages_per_sec, items_per_sec, peak_rss_kb, output}
+    """
+    parser = create_parser(backend)
+    call = BENCH_METHODS[kind]
+    output = call(parser, html)
+    peak = peak_rss_kb(backend, html, kind)
+
+    runs = 0
+    started = time.perf_counter()
+    elapsed = 0.0
+    while runs < 3 or elapsed < min_time:
+        call(parser, html)
+        runs += 1
+        elapsed = time.perf_counter() - started
+
+    items = count_items(kind, output)
+    pages_per_sec = runs / elapsed
+    return {
+        'items': items,
+        'pages_per_sec': round(pages_per_sec, 2),
+        'items_per_sec': round(pages_per_sec * items, 1),
+        'peak_rss_kb': round(peak, 1) if peak is not None else None,
+        'output': output
+    }
+
+
+def load_history() -> Dict:
+    """历次运行中每个 (后端, 样本, 倍数) 的最近一次结果"""
+    latest = {}
+    if os.path.exists(RESULTS_FILE):
+        with open(RESULTS_FILE, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                latest[(record['backend'], record['fixture'], record['scale'])] = record
+    return latest
+
+
+def git_commit() -> str:
+    """当前代码的提交号（不在git仓库中时为空）"""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BENCH_DIR,
+                              capture_output=True, text=True, timeout=10).stdout.strip()
+    except Exception:
+        return ''
+
+
+def run_benchmark(fixtures: Dict[str, str], backends: List[str], scales: List[int],
+                  min_time: float, threshold: float, save: bool) -> int:
+    """
+    运行基准测试并与上一次结果比较
+
+    Returns:
+        后端之间输出不一致的页面数
+    """
+    history = load_history()
+    run_info = {'time': datetime.now().isoformat(timespec='seconds'), 'commit': git_commit(),
+                'python': sys.version.split()[0]}
+    records = []
+    mismatches = 0
+
+    print(f"\n  {'样本':<24}{'倍数':>5}{'后端':>7}{'条目':>7}{'页/秒':>11}{'条/秒':>12}{'峰值RSS':>12}{'变化':>9}")
+    for name, html in fixtures.items():
+        kind = fixture_kind(name)
+        for scale in scales:
+            if scale > 1 and kind not in ITEM_XPATHS:
+                continue
+            page = scale_page(html, kind, scale)
+            outputs = []
+            for backend in backends:
+                result = bench_page(backend, page, kind, min_time)
+                outputs.append(json.dumps(result.pop('output'), ensure_ascii=False))
+                record = dict(run_info, backend=backend, fixture=name, scale=scale, bytes=len(page.encode('utf-8')),
+                              **result)
+                records.append(record)
+
+                peak = f"{record['peak_rss_kb']:.0f}KB" if record['peak_rss_kb'] is not None else '-'
+                previous = history.get((backend, name, scale))
+                change = ''
+                if previous and previous.get('pages_per_sec'):
+                    ratio = record['pages_per_sec'] / previous['pages_per_sec'] - 1
+                    change = f"{ratio:+.0%}" + (' ⚠️' if ratio < -threshold else '')
+                print(f"  {name:<24}{scale:>5}{backend:>7}{record['items']:>7}{record['pages_per_sec']:>11.1f}"
+                      f"{record['items_per_sec']:>12.1f}{peak:>12}{change:>9}")
+
+            if len(set(outputs)) > 1:
+                print(f"  ❌ {name} ×{scale}: 各后端输出不一致")
+                mismatches += 1
+
+    if save:
+        with open(RESULTS_FILE, 'a', encoding='utf-8') as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+        print(f"\n  结果已追加到 {os.path.relpath(RESULTS_FILE)}")
+    return mismatches
+
+
+def import_cache_pages(per_kind: int):
+    """从页面缓存中每类复制若干个真实页面作为样本（之后需要 --update-golden 生成黄金结果）"""
+    from src.cache import PageCache
+
+    cache = PageCache()
+    markers = [('/review/', 'review_detail'), ('/reviews', 'reviews'), ('/comments', 'comments'),
+               ('/subject/', 'movie')]
+    copied = {prefix: 0 for _, prefix in markers}
+    for url, entry in cache.entries.items():
+        prefix = next((prefix for marker, prefix in markers if marker in url), None)
+        if prefix is None or copied[prefix] >= per_kind:
+            continue
+        html = cache.get(url)
+        if not html:
+            continue
+        path = os.path.join(FIXTURE_DIR, f"{prefix}_cache_{entry['sha256'][:8]}.html")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(html)
+        copied[prefix] += 1
+        print(f"  {url} -> {os.path.relpath(path, BENCH_DIR)}")
+    print(f"  共复制 {sum(copied.values())} 个页面，请运行 --update-golden 生成黄金结果")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='解析器黄金结果核对与基准测试')
+    parser.add_argument('--backends', nargs='+', choices=PARSER_BACKENDS, default=list(PARSER_BACKENDS),
+                        help='参与测试的解析后端（默认全部）')
+    parser.add_argument('--scale', nargs='+', type=int, default=[1, 10],
+                        help='列表页和回应的放大倍数（默认 1 10）')
+    parser.add_argument('--min-time', type=float, default=1.0,
+                        help='每项测量的最短时间，秒（默认1）')
+    parser.add_argument('--threshold', type=float, default=0.15,
+                        help='页/秒比上一次下降超过该比例时标记为性能退化（默认0.15）')
+    parser.add_argument('--update-golden', action='store_true',
+                        help='用BeautifulSoup解析器重新生成黄金结果')
+    parser.add_argument('--import-cache', type=int, metavar='N',
+                        help='从页面缓存中每类复制N个真实页面作为样本')
+    parser.add_argument('--no-save', action='store_true',
+                        help='不把结果追加到 results.jsonl')
+    parser.add_argument('--measure-rss', nargs=2, metavar=('BACKEND', 'KIND'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure_rss:
+        measure_rss(*args.measure_rss)
+        return 0
+
+    if args.import_cache:
+        print("📥 复制缓存页面...")
+        import_cache_pages(args.import_cache)
+        return 0
+
+    fixtures = load_fixtures()
+    if args.update_golden:
+        print("📝 生成黄金结果...")
+        update_golden(fixtures)
+        return 0
+
+    print(f"🔍 核对黄金结果（{len(fixtures)} 个样本）...")
+    mismatches = check_golden(fixtures, args.backends)
+    if not mismatches:
+        print("  ✅ 全部一致")
+
+    print("⏱️ 基准测试...")
+    mismatches += run_benchmark(fixtures, args.backends, args.scale, args.min_time,
+                                args.threshold, not args.no_save)
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,12 +8,23 @@ import os
 MOVIE_URL = "https://movie.douban.com/subject/36176155/"
 MOVIE_ID = "36176155"
 
+# 电影主页URL模板（批量爬取多部电影时使用）
+MOVIE_URL_TEMPLATE = "https://movie.douban.com/subject/{movie_id}/"
+
 # 短评页面URL模板
 COMMENTS_URL_TEMPLATE = "https://movie.douban.com/subject/{movie_id}/comments?start={start}&limit=20&status=P&sort=new_score"
 
 # 长评页面URL模板
 REVIEWS_URL_TEMPLATE = "https://movie.douban.com/subject/{movie_id}/reviews?start={start}"
 
+# 多维度短评URL模板（--facets）：status=P看过/F想看，sort=new_score热门/time最新，
+# percent_type=h好评/m一般/l差评（留空为全部）
+COMMENTS_FACET_URL_TEMPLATE = "https://movie.douban.com/subject/{movie_id}/comments?percent_type={percent_type}&start={start}&limit=20&status={status}&sort={sort}"
+
+# 按时间倒序的页面URL模板（增量爬取使用，最新的评论在最前面）
+COMMENTS_LATEST_URL_TEMPLATE = "https://movie.douban.com/subject/{movie_id}/comments?start={start}&limit=20&status=P&sort=time"
+REVIEWS_LATEST_URL_TEMPLATE = "https://movie.douban.com/subject/{movie_id}/reviews?start={start}&sort=time"
+
 # ==================== 爬虫行为配置 ====================
 # 请求间隔（秒）- 为避免被封，建议5-10秒
 REQUEST_DELAY_MIN = 5
@@ -27,16 +38,125 @@ REVIEWS_PER_PAGE = 10
 MAX_COMMENT_PAGES = None  # 短评最大页数
 MAX_REVIEW_PAGES = None   # 长评最大页数
 
+# 是否多维度爬取短评（按下面的维度分别翻页后合并，覆盖单一排序拿不到的短评）
+FACET_CRAWL = False
+
+# 多维度爬取的维度列表：豆瓣对单一排序只提供有限页数的短评，分别翻页后按comment_id去重合并。
+# 排在前面的维度先请求，与已爬取维度重叠的维度会很快停止
+COMMENT_FACETS = [
+    {'status': 'P', 'sort': 'new_score', 'percent_type': ''},
+    {'status': 'P', 'sort': 'time', 'percent_type': ''},
+    {'status': 'P', 'sort': 'new_score', 'percent_type': 'h'},
+    {'status': 'P', 'sort': 'new_score', 'percent_type': 'm'},
+    {'status': 'P', 'sort': 'new_score', 'percent_type': 'l'},
+    {'status': 'F', 'sort': 'new_score', 'percent_type': ''},
+    {'status': 'F', 'sort': 'time', 'percent_type': ''},
+]
+
+# 某个维度连续多少页没有新短评时停止该维度
+FACET_STALE_PAGES = 2
+
 # 重试次数
 MAX_RETRIES = 3
 
 # 请求超时（秒）
 REQUEST_TIMEOUT = 30
 
+# 失败重试前的退避时间（秒）：第n次重试前等待 RETRY_BACKOFF_BASE * 2^(n-1)（不超过 RETRY_BACKOFF_MAX），
+# 再乘以0.5~1.5的随机抖动
+RETRY_BACKOFF_BASE = 2
+RETRY_BACKOFF_MAX = 60
+
+# 熔断：连续 CIRCUIT_BREAKER_THRESHOLD 次遇到安全验证后，暂停爬取 CIRCUIT_BREAKER_COOLDOWN 秒
+CIRCUIT_BREAKER_THRESHOLD = 3
+CIRCUIT_BREAKER_COOLDOWN = 600
+
+# 页面获取方式
+# "browser": 所有页面都通过浏览器加载
+# "hybrid": 优先使用HTTP连接池直接请求，遇到安全验证或登录墙时才交给浏览器
+FETCH_MODE = "browser"
+
+# HTTP连接池大小（hybrid模式）
+HTTP_POOL_SIZE = 4
+
+# 并发浏览器数量（大于1时启用浏览器池，多个浏览器同时获取不同页）
+BROWSER_WORKERS = 1
+
+# 浏览器池额外预取的页数（解析当前页时空闲浏览器继续获取后续页）
+PREFETCH_PAGES = 2
+
+# 浏览器池全局请求间隔（秒）- 所有浏览器共享，合计每隔该时间最多发起一次请求
+POOL_REQUEST_INTERVAL_MIN = 2
+POOL_REQUEST_INTERVAL_MAX = 4
+
+# 自适应请求间隔（AIMD）：页面正常时每次缩短 PACING_DECREASE_STEP 秒，
+# 遇到安全验证、超时或异常空页时乘以 PACING_BACKOFF_FACTOR；
+# 学到的间隔保存在 PACING_STATE_FILE，下次运行从该间隔开始
+ADAPTIVE_PACING = False
+PACING_MIN_DELAY = 1       # 间隔下限（秒）
+PACING_MAX_DELAY = 120     # 间隔上限（秒）
+PACING_DECREASE_STEP = 0.5
+PACING_BACKOFF_FACTOR = 2
+PACING_JITTER = 0.5        # 实际间隔在 [间隔, 间隔 * 1.5] 之间随机
+PACING_STATE_FILE = os.path.join(os.path.dirname(__file__), "..", "data", "pacing_state.json")
+
+# 是否抓取影评详情页：列表页只有截断的摘要，详情页有完整正文和回应
+# 详情页与列表页共用同一个节流器/浏览器池并发获取
+FETCH_FULL_REVIEWS = False
+
+# 每篇影评最多抓取的回应页数（每页100条），None表示全部
+MAX_REPLY_PAGES = 1
+
 # ==================== 浏览器配置 ====================
 # 是否使用无头模式（不显示浏览器窗口）
 HEADLESS = False  # 首次运行建议False，方便处理验证码
 
+# 精简加载模式：屏蔽图片/字体/样式等用不到的资源，使用eager页面加载策略，
+# 并等待评论元素出现而不是整个页面加载完成
+LEAN_PAGE_LOAD = False
+
+# 精简模式下通过Chrome DevTools屏蔽的资源URL模式
+# 注意：遇到需要手动完成的安全验证时，屏蔽样式和图片可能导致验证码无法正常显示
+BLOCKED_URL_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf",
+    "*.css",
+    "*.mp4", "*.m3u8",
+]
+
+# 精简模式下等待内容元素出现的超时时间（秒），超时后按空页交给解析器判断
+CONTENT_WAIT_TIMEOUT = 10
+
+# 浏览器内提取：列表页在浏览器中执行JavaScript直接提取短评/影评字段，只传回紧凑的JSON，
+# 不再传输整个page_source并在Python中解析（注意：这样获取的列表页不会写入页面缓存）
+BROWSER_EXTRACT = False
+
+# 页面解析后端："bs4"（BeautifulSoup）或 "lxml"（预编译XPath，输出与bs4一致，解析大批页面/离线重放时快数倍）
+PARSER_BACKEND = "bs4"
+
+# 解析进程数：大于0时获取页面放到单独的线程中，列表页交给解析进程并行解析，获取与解析重叠进行；
+# 0表示在主线程中逐页获取、解析（默认）
+PARSE_WORKERS = 0
+
+# 解析进程池模式下获取线程最多领先的页数（队列满时暂停获取；增量爬取提前结束时最多多请求这么多页）
+PARSE_QUEUE_SIZE = 4
+
+# 备用浏览器：后台预热一个已加载Cookie的浏览器，当前浏览器窗口关闭或崩溃时立即替换
+# （会多占用一个Chrome进程的内存）
+STANDBY_DRIVER = False
+
+# 持久化浏览器配置目录：登录状态、HTTP缓存和HSTS数据在多次运行之间保留，
+# 配置目录中的登录仍然有效时启动后不再注入Cookie（失效时仍会加载保存的Cookie）
+USE_CHROME_PROFILE = False
+CHROME_PROFILE_DIR = os.path.join(os.path.dirname(__file__), "..", "data", "chrome_profile")
+
+# 浏览器守护进程：python main.py --daemon 常驻一个已准备好登录状态的Chrome，
+# 其他命令连接它（--attach）而不是每次冷启动浏览器；守护进程未运行时照常启动浏览器
+USE_BROWSER_DAEMON = False
+DAEMON_DEBUG_PORT = 9333      # 远程调试端口（只监听127.0.0.1）
+DAEMON_STATE_FILE = os.path.join(os.path.dirname(__file__), "..", "data", "browser_daemon.json")
+DAEMON_CHECK_INTERVAL = 5     # 守护进程检查浏览器是否存活的间隔（秒）
+
 # Chrome浏览器路径（留空自动检测）
 CHROME_PATH = ""
 
@@ -51,12 +171,38 @@ COOKIE_FILE = os.path.join(os.path.dirname(__file__), "..", "data", "cookies.jso
 # 数据输出目录
 DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
 
+# 批量爬取时每部电影的输出目录为 MOVIES_DIR/<电影ID>/
+MOVIES_DIR = os.path.join(os.path.dirname(__file__), "..", "data", "movies")
+
+# 爬取断点文件（记录已完成/失败的页和已获取的条目ID，用于 --resume）
+CRAWL_STATE_FILE = os.path.join(os.path.dirname(__file__), "..", "data", "crawl_state.json")
+
+# 已知条目索引文件（记录历次爬取得到的短评ID和影评URL，用于 --incremental）
+KNOWN_INDEX_FILE = os.path.join(os.path.dirname(__file__), "..", "data", "known_ids.json")
+
+# 是否流式保存：每爬完一页立即追加写入 data/comments.jsonl、data/reviews.jsonl，
+# 内存中不再累积全部条目，结束时再转换为CSV
+STREAM_TO_DISK = False
+
+# 页面缓存：保存抓取到的原始HTML（gzip压缩，按内容哈希去重），
+# 修改解析器或分类器后可用 --replay 离线重放，无需重新爬取。缓存不会自动清理，默认关闭，
+# 需要时加 --cache 或改为True
+PAGE_CACHE_ENABLED = False
+PAGE_CACHE_DIR = os.path.join(os.path.dirname(__file__), "..", "data", "page_cache")
+
+# 电影主页缓存有效期（秒），有效期内直接使用缓存
+MOVIE_INFO_CACHE_TTL = 24 * 3600
+
 # 输出文件名
 OUTPUT_COMMENTS_CSV = "comments.csv"
 OUTPUT_REVIEWS_CSV = "reviews.csv"
 OUTPUT_STATS_JSON = "statistics.json"
 OUTPUT_CLASSIFIED_JSON = "classified_comments.json"
 
+# 分析状态文件（保存在数据目录中）：可合并的统计聚合和已分析的条目ID，
+# 增量分析（--analyze --incremental）时只分析新评论并合并到聚合中
+OUTPUT_ANALYSIS_STATE = "analysis_state.json"
+
 # ==================== 评分映射 ====================
 RATING_MAP = {
     "allstar50": 5,  # 力荐
@@ -80,6 +226,21 @@ RATING_TEXT_MAP = {
 SENTIMENT_POSITIVE_THRESHOLD = 0.6  # 大于此值为正面
 SENTIMENT_NEGATIVE_THRESHOLD = 0.4  # 小于此值为负面
 
+# 情感分析进程数：1表示在当前进程中逐条分析，0表示使用全部CPU核心；
+# 大于1时评论按 SENTIMENT_CHUNK_SIZE 条分块并行分析（每个进程只加载一次模型），结果与逐条分析一致
+SENTIMENT_WORKERS = 1
+SENTIMENT_CHUNK_SIZE = 500
+
+# 情感分析缓存：以评论内容哈希为键保存分析结果（SQLite），再次分析时只对新评论调用SnowNLP；
+# 模型文件或上面的阈值变化时缓存自动清空。条目数超过上限时淘汰最久未使用的条目（0表示不限制）
+SENTIMENT_CACHE_ENABLED = True
+SENTIMENT_CACHE_FILE = os.path.join(os.path.dirname(__file__), "..", "data", "sentiment_cache.sqlite")
+SENTIMENT_CACHE_MAX_ENTRIES = 1000000
+
+# 关键词提取的样本字符数上限：评论总长度超过上限时等距抽取评论提取关键词（0表示使用全部评论），
+# 词频仍统计全部评论
+KEYWORD_SAMPLE_CHARS = 200000
+
 # 评分分类
 RATING_CATEGORIES = {
     "好评": [4, 5],
@@ -91,3 +252,8 @@ RATING_CATEGORIES = {
 # ==================== 日志配置 ====================
 LOG_LEVEL = "INFO"
 LOG_FILE = os.path.join(os.path.dirname(__file__), "..", "data", "scraper.log")
+
+# 爬取指标：每次页面获取和每页解析的耗时明细（JSONL），以及Prometheus文本格式的累计指标
+METRICS_ENABLED = True
+METRICS_FILE = os.path.join(os.path.dirname(__file__), "..", "data", "metrics.jsonl")
+METRICS_PROM_FILE = os.path.join(os.path.dirname(__file__), "..", "data", "metrics.prom")
@@ -10,6 +10,7 @@
     2. 爬取所有数据: python main.py --scrape
     3. 只分析已有数据: python main.py --analyze
     4. 完整流程: python main.py --all
+    5. 批量爬取多部电影: python main.py --scrape --movies 36176155 1292052
 """
 import argparse
 import os
@@ -20,8 +21,10 @@ PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, PROJECT_ROOT)
 
 from src.scraper import DoubanScraper
+from src.daemon import BrowserDaemon, stop_daemon
 from src.classifier import CommentClassifier
-from config.settings import DATA_DIR, MOVIE_URL
+from src.metrics import setup_logging
+from config.settings import DATA_DIR, MOVIE_URL, MOVIES_DIR
 
 
 def print_banner():
@@ -39,12 +42,18 @@ def print_banner():
     print(f"    目标电影: {MOVIE_URL}\n")
 
 
-def login():
-    """手动登录豆瓣"""
+def login(profile: bool = None, attach: bool = None):
+    """
+    手动登录豆瓣
+    
+    Args:
+        profile: 是否在持久化的浏览器配置目录中登录（登录状态保存在配置目录中）
+        attach: 是否在浏览器守护进程的浏览器中登录
+    """
     print("\n📝 启动登录模式...")
     print("=" * 50)
     
-    scraper = DoubanScraper(headless=False)
+    scraper = DoubanScraper(headless=False, profile=profile, attach=attach)
     try:
         scraper.login_manual()
         print("\n✅ 登录成功！Cookie已保存，下次运行将自动使用。")
@@ -54,18 +63,35 @@ def login():
         scraper.stop()
 
 
-def scrape(max_comment_pages: int = None, max_review_pages: int = None):
+def run_daemon(profile: bool = None):
+    """
+    启动浏览器守护进程（在前台运行，可放到后台或交给计划任务/服务管理器）
+    
+    Args:
+        profile: 守护进程的浏览器是否使用持久化的配置目录
+    """
+    print("\n🛰️ 启动浏览器守护进程...")
+    print("=" * 50)
+    
+    # 守护进程本身只有一个浏览器：不连接其他守护进程，也不预热备用浏览器
+    scraper = DoubanScraper(headless=False, profile=profile, attach=False, standby=False)
+    BrowserDaemon(scraper).run()
+
+
+def scrape(max_comment_pages: int = None, max_review_pages: int = None, **scraper_options):
     """
     爬取评论数据
     
     Args:
         max_comment_pages: 短评最大页数
         max_review_pages: 长评最大页数
+        **scraper_options: 传给 DoubanScraper 的其他选项
+            （fetch_mode、workers、resume、incremental、stream 等）
     """
     print("\n🕷️ 启动爬虫模式...")
     print("=" * 50)
     
-    scraper = DoubanScraper(headless=False)  # 首次建议显示浏览器
+    scraper = DoubanScraper(headless=False, **scraper_options)  # 首次建议显示浏览器
     
     try:
         # 爬取所有数据
@@ -77,32 +103,95 @@ def scrape(max_comment_pages: int = None, max_review_pages: int = None):
         # 保存原始数据
         scraper.save_raw_data()
         
+        # 流式模式下条目不在内存中，只有计数
+        counts = data['counts'] if scraper.stream else {
+            'comments': len(data.get('comments', [])),
+            'reviews': len(data.get('reviews', []))
+        }
         print("\n✅ 爬取完成！")
-        print(f"   短评: {len(data.get('comments', []))} 条")
-        print(f"   长评: {len(data.get('reviews', []))} 条")
+        print(f"   短评: {counts['comments']} 条")
+        print(f"   长评: {counts['reviews']} 条")
         
         return data
         
     except KeyboardInterrupt:
         print("\n\n⚠️ 用户中断，正在保存已爬取的数据...")
         scraper.save_raw_data()
-        print("数据已保存。")
+        print("数据已保存。使用 --resume 可从断点继续。")
     except Exception as e:
         print(f"\n❌ 爬取出错: {e}")
         scraper.save_raw_data()
+        print("使用 --resume 可从断点继续。")
         raise
     finally:
         scraper.stop()
 
 
-def analyze():
-    """分析已爬取的数据"""
+def scrape_batch(movie_ids: list, max_comment_pages: int = None, max_review_pages: int = None,
+                 **scraper_options):
+    """
+    批量爬取多部电影（共用一个浏览器会话）
+    
+    Args:
+        movie_ids: 电影ID列表
+        max_comment_pages: 每部电影的短评最大页数
+        max_review_pages: 每部电影的长评最大页数
+        **scraper_options: 传给 DoubanScraper 的其他选项
+        
+    Returns:
+        每部电影的爬取摘要
+    """
+    print(f"\n🕷️ 启动批量爬虫模式，共 {len(movie_ids)} 部电影...")
+    print("=" * 50)
+    
+    scraper = DoubanScraper(headless=False, **scraper_options)
+    
+    try:
+        summary = scraper.scrape_batch(movie_ids, max_comment_pages, max_review_pages)
+    except KeyboardInterrupt:
+        print("\n\n⚠️ 用户中断，当前电影已爬取的数据已保存。使用 --resume 可从断点继续。")
+        return {}
+    
+    print("\n✅ 批量爬取完成！")
+    for movie_id, result in summary.items():
+        if 'error' in result:
+            print(f"   {movie_id}: ❌ {result['error']}")
+        else:
+            print(f"   {movie_id} {result['title']}: 短评 {result['comments']} 条, 长评 {result['reviews']} 条")
+    
+    return summary
+
+
+def load_movie_ids(args) -> list:
+    """从 --movies 和 --movie-list 参数收集电影ID"""
+    movie_ids = list(args.movies or [])
+    
+    if args.movie_list:
+        with open(args.movie_list, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.split('#', 1)[0].strip()
+                if line:
+                    movie_ids.append(line)
+    
+    # 去重并保持顺序
+    return list(dict.fromkeys(movie_ids))
+
+
+def analyze(data_dir: str = None, **classifier_options):
+    """
+    分析已爬取的数据
+    
+    Args:
+        data_dir: 数据目录，None时使用配置文件中的DATA_DIR
+        **classifier_options: 传给 CommentClassifier 的其他选项
+    """
     print("\n📊 启动分析模式...")
     print("=" * 50)
     
     # 检查数据文件是否存在
-    comments_file = os.path.join(DATA_DIR, 'comments.csv')
-    reviews_file = os.path.join(DATA_DIR, 'reviews.csv')
+    data_dir = data_dir or DATA_DIR
+    comments_file = os.path.join(data_dir, 'comments.csv')
+    reviews_file = os.path.join(data_dir, 'reviews.csv')
     
     if not os.path.exists(comments_file):
         print(f"❌ 找不到数据文件: {comments_file}")
@@ -110,8 +199,9 @@ def analyze():
         return
     
     # 创建分类器并加载数据
-    classifier = CommentClassifier()
+    classifier = CommentClassifier(**classifier_options)
     classifier.load_from_csv(comments_file, reviews_file)
+    classifier.load_state(data_dir)
     
     # 执行分类
     classifier.classify_all()
@@ -123,24 +213,31 @@ def analyze():
     classifier.print_summary()
     
     # 保存结果
-    classifier.save_results()
+    classifier.save_results(data_dir)
     
     print("\n✅ 分析完成！")
 
 
-def run_all(max_comment_pages: int = None, max_review_pages: int = None):
+def run_all(max_comment_pages: int = None, max_review_pages: int = None,
+            classifier_options: dict = None, **scraper_options):
     """运行完整流程：爬取 + 分析"""
+    classifier_options = classifier_options or {}
     print("\n🚀 启动完整流程...")
     
     # 爬取数据
-    data = scrape(max_comment_pages, max_review_pages)
+    data = scrape(max_comment_pages, max_review_pages, **scraper_options)
     
-    if data and data.get('comments'):
+    if data and not data.get('comments') and data['counts']['comments']:
+        # 流式模式下数据已写入CSV，从文件加载分析
+        analyze(**classifier_options)
+    elif data and data.get('comments'):
         # 直接使用爬取的数据进行分析
         classifier = CommentClassifier(
             comments=data.get('comments', []),
-            reviews=data.get('reviews', [])
+            reviews=data.get('reviews', []),
+            **classifier_options
         )
+        classifier.load_state()
         
         # 执行分类
         classifier.classify_all()
@@ -172,6 +269,29 @@ def main():
   python main.py --analyze                  # 分析已有数据
   python main.py --all                      # 爬取 + 分析
   python main.py --all --pages 10           # 爬取前10页 + 分析
+  python main.py --scrape --fetch-mode hybrid  # HTTP直连，仅在验证时使用浏览器
+  python main.py --scrape --workers 3       # 3个浏览器并发爬取
+  python main.py --scrape --resume          # 从上次中断处继续爬取
+  python main.py --scrape --incremental     # 只爬取上次之后的新评论
+  python main.py --scrape --stream          # 逐页写入磁盘，适合超大规模爬取
+  python main.py --scrape --lean            # 精简加载，不下载图片/字体/样式
+  python main.py --all --replay             # 用页面缓存离线重新解析 + 分析
+  python main.py --scrape --full-reviews    # 同时抓取影评全文和回应
+  python main.py --scrape --adaptive        # 根据限流情况自动调整请求间隔
+  python main.py --scrape --standby         # 后台预热备用浏览器，崩溃时立即替换
+  python main.py --scrape --facets          # 多维度爬取短评，突破单一排序的页数上限
+  python main.py --scrape --extract         # 在浏览器内提取评论字段，不传输整个页面
+  python main.py --all --replay --parser lxml  # 用lxml后端快速重新解析页面缓存
+  python main.py --scrape --parse-workers 2    # 2个解析进程，获取与解析并行
+  python main.py --login --profile          # 在持久化浏览器配置目录中登录
+  python main.py --scrape --profile         # 复用配置目录中的登录状态和缓存，快速启动
+  python main.py --daemon --profile         # 启动常驻的浏览器守护进程
+  python main.py --scrape --attach          # 连接守护进程中的浏览器，几乎立即开始爬取
+  python main.py --daemon-stop              # 停止浏览器守护进程
+  python main.py --analyze --sentiment-workers 4  # 4个进程并行进行情感分析
+  python main.py --all --incremental        # 增量爬取 + 只分析新评论
+  python main.py --scrape --movies 36176155 1292052  # 批量爬取多部电影
+  python main.py --all --movie-list movies.txt       # 从文件读取电影ID，批量爬取 + 分析
         """
     )
     
@@ -187,14 +307,69 @@ def main():
                         help='最大爬取页数（默认爬取全部）')
     parser.add_argument('--review-pages', type=int, default=None,
                         help='长评最大爬取页数（默认同--pages）')
+    parser.add_argument('--fetch-mode', choices=['browser', 'hybrid'], default=None,
+                        help='页面获取方式：browser=全部用浏览器，hybrid=HTTP优先（默认见配置文件）')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='并发浏览器数量（默认见配置文件BROWSER_WORKERS）')
+    parser.add_argument('--resume', action='store_true',
+                        help='从上次中断的断点继续爬取（跳过已完成的页）')
+    parser.add_argument('--incremental', action='store_true',
+                        help='增量爬取：按时间倒序爬取，遇到已知评论即停止，并合并到已有数据；'
+                             '增量分析：只分析新评论，合并到已保存的统计聚合中')
+    parser.add_argument('--stream', action='store_true', default=None,
+                        help='逐页流式写入磁盘（data/*.jsonl），内存占用恒定，结束时转换为CSV')
+    parser.add_argument('--lean', action='store_true', default=None,
+                        help='精简加载：屏蔽图片/字体/样式，eager加载并只等待评论元素')
+    parser.add_argument('--cache', action='store_true', default=None,
+                        help='把抓取到的页面写入页面缓存（data/page_cache/），之后可用 --replay 离线重放')
+    parser.add_argument('--replay', action='store_true',
+                        help='离线重放：用页面缓存重新解析，不启动浏览器也不访问豆瓣')
+    parser.add_argument('--full-reviews', action='store_true', default=None,
+                        help='抓取影评详情页的完整正文和回应（data/full_reviews.jsonl）')
+    parser.add_argument('--adaptive', action='store_true', default=None,
+                        help='自适应请求间隔：页面正常时逐步加快，遇到验证/超时/空页时成倍放慢')
+    parser.add_argument('--standby', action='store_true', default=None,
+                        help='后台预热一个已加载Cookie的备用浏览器，浏览器窗口失效时立即替换')
+    parser.add_argument('--facets', action='store_true', default=None,
+                        help='按 看过/想看 × 热门/最新 × 好评/一般/差评 多维度爬取短评并去重合并')
+    parser.add_argument('--extract', action='store_true', default=None,
+                        help='浏览器内提取：在页面中执行JavaScript提取评论字段，只传回JSON（列表页不写入缓存）')
+    parser.add_argument('--parser', choices=['bs4', 'lxml'], default=None, dest='parser_backend',
+                        help='页面解析后端：bs4=BeautifulSoup，lxml=预编译XPath（更快，输出一致；默认见配置文件）')
+    parser.add_argument('--parse-workers', type=int, default=None,
+                        help='列表页解析进程数：获取页面与解析并行进行（默认见配置文件PARSE_WORKERS，0表示不启用）')
+    parser.add_argument('--profile', action='store_true', default=None,
+                        help='使用持久化浏览器配置目录（data/chrome_profile/），保留登录状态和HTTP缓存')
+    parser.add_argument('--daemon', action='store_true',
+                        help='启动浏览器守护进程：常驻一个已准备好登录状态的Chrome，供 --attach 连接')
+    parser.add_argument('--daemon-stop', action='store_true',
+                        help='停止浏览器守护进程')
+    parser.add_argument('--attach', action='store_true', default=None,
+                        help='连接浏览器守护进程中的Chrome，不再启动新浏览器（守护进程未运行时照常启动）')
+    parser.add_argument('--sentiment-workers', type=int, default=None,
+                        help='情感分析进程数（默认见配置文件SENTIMENT_WORKERS，1表示不并行，0表示使用全部CPU核心）')
+    parser.add_argument('--movies', nargs='+', metavar='MOVIE_ID',
+                        help='批量爬取的电影ID列表（输出到 data/movies/<电影ID>/）')
+    parser.add_argument('--movie-list', metavar='FILE',
+                        help='电影ID列表文件，每行一个ID，#后为注释')
     
     args = parser.parse_args()
     
+    # 日志文件（爬取指标明细和摘要）
+    setup_logging()
+    
     # 打印欢迎信息
     print_banner()
     
+    # 浏览器守护进程
+    if args.daemon_stop:
+        stop_daemon()
+    if args.daemon:
+        run_daemon(profile=args.profile)
+        return
+    
     # 如果没有指定任何操作，显示帮助
-    if not any([args.login, args.scrape, args.analyze, args.all]):
+    if not any([args.login, args.scrape, args.analyze, args.all, args.daemon_stop]):
         parser.print_help()
         print("\n💡 快速开始:")
         print("   1. 首次运行: python main.py --login")
@@ -202,20 +377,56 @@ def main():
         print("   3. 分析数据: python main.py --analyze")
         return
     
+    # 爬虫选项
+    scraper_options = {
+        'fetch_mode': args.fetch_mode,
+        'workers': args.workers,
+        'resume': args.resume,
+        'incremental': args.incremental,
+        'stream': args.stream,
+        'lean': args.lean,
+        'replay': args.replay,
+        'full_reviews': args.full_reviews,
+        'adaptive': args.adaptive,
+        'standby': args.standby,
+        'facets': args.facets,
+        'extract': args.extract,
+        'parser_backend': args.parser_backend,
+        'parse_workers': args.parse_workers,
+        'profile': args.profile,
+        'attach': args.attach,
+        'cache': args.cache,
+    }
+    # 分析选项
+    classifier_options = {
+        'sentiment_workers': args.sentiment_workers,
+        'incremental': args.incremental,
+    }
+    review_pages = args.review_pages or args.pages
+    movie_ids = load_movie_ids(args)
+    
     # 执行对应操作
     if args.login:
-        login()
+        login(profile=args.profile, attach=args.attach)
+    
+    if movie_ids:
+        # 批量模式：--scrape/--all 爬取列表中的所有电影，--analyze/--all 逐部分析
+        if args.scrape or args.all:
+            scrape_batch(movie_ids, args.pages, review_pages, **scraper_options)
+        if args.analyze or args.all:
+            for movie_id in movie_ids:
+                analyze(os.path.join(MOVIES_DIR, movie_id), **classifier_options)
+        return
     
     if args.scrape:
-        review_pages = args.review_pages or args.pages
-        scrape(max_comment_pages=args.pages, max_review_pages=review_pages)
+        scrape(max_comment_pages=args.pages, max_review_pages=review_pages, **scraper_options)
     
     if args.analyze:
-        analyze()
+        analyze(**classifier_options)
     
     if args.all:
-        review_pages = args.review_pages or args.pages
-        run_all(max_comment_pages=args.pages, max_review_pages=review_pages)
+        run_all(max_comment_pages=args.pages, max_review_pages=review_pages,
+                classifier_options=classifier_options, **scraper_options)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,340 @@
+"""
+分析状态 - 保存可合并的统计聚合（评分/情感计数、有用数汇总、关键词计数、热门样本），
+增量分析时只处理新评论，再由聚合重新生成统计数据和分类结果
+"""
+import heapq
+import json
+import math
+import os
+from collections import Counter
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import DATA_DIR, OUTPUT_ANALYSIS_STATE, RATING_CATEGORIES, RATING_TEXT_MAP
+from src.sentiment_cache import model_version
+from src.storage import item_key
+
+# 热门评论数量（按有用数排序的前N条）
+POPULAR_TOP_N = 100
+
+# 每个分类保存的示例评论数
+SAMPLE_SIZE = 5
+
+# 最多保留的关键词计数
+MAX_KEYWORDS = 1000
+
+SENTIMENTS = ("正面", "中性", "负面")
+
+
+def column(df: pd.DataFrame, name: str, default) -> pd.Series:
+    """取一列，没有这一列时返回全部为默认值的列"""
+    if name in df:
+        return df[name]
+    return pd.Series(default, index=df.index)
+
+
+def votes_order(df: pd.DataFrame, rows: np.ndarray = None) -> np.ndarray:
+    """
+    按有用数从高到低排列的行号
+
+    有用数相同时保持原有顺序，与 sorted(..., key=votes, reverse=True) 一致
+
+    Args:
+        df: 评论表
+        rows: 参与排序的行号，None表示全部行
+
+    Returns:
+        行号数组
+    """
+    votes = column(df, 'votes', 0).to_numpy()
+    if rows is None:
+        rows = np.arange(len(df))
+    return rows[np.argsort(-votes[rows], kind='stable')]
+
+
+def to_samples(df: pd.DataFrame, rows: np.ndarray) -> List[Dict]:
+    """把指定行转换为分类结果中的示例评论"""
+    subset = df.iloc[rows]
+    return [
+        {"content": content[:100], "rating": rating, "votes": votes}
+        for content, rating, votes in zip(
+            column(subset, 'content', '').tolist(),
+            column(subset, 'rating', 0).tolist(),
+            column(subset, 'votes', 0).tolist()
+        )
+    ]
+
+
+def _item_keys(df: pd.DataFrame, field: str, text_field: str) -> List[str]:
+    """
+    每个条目的唯一标识
+
+    Args:
+        df: 短评或影评表
+        field: ID列（comment_id 或 review_url）
+        text_field: 缺少ID时参与组成标识的文本列（content 或 title）
+
+    Returns:
+        ID字符串列表，与爬取时去重使用的 item_key 一致
+    """
+    keys = []
+    for value, username, time_, text in zip(
+        column(df, field, None).tolist(),
+        column(df, 'username', '').tolist(),
+        column(df, 'time', '').tolist(),
+        column(df, text_field, '').tolist()
+    ):
+        if isinstance(value, float):
+            # CSV中含空值的ID列会被读成浮点数
+            value = None if math.isnan(value) else int(value)
+        keys.append(item_key({field: value, 'username': username, 'time': time_, text_field: text}, field))
+    return keys
+
+
+def _top(samples: Iterable[Dict], n: int) -> List[Dict]:
+    """按有用数取前n条（与 sorted(..., reverse=True)[:n] 一致，有用数相同时保持原有顺序）"""
+    return heapq.nlargest(n, samples, key=lambda sample: sample['votes'])
+
+
+class AnalysisState:
+    """可合并的分析聚合
+
+    只保存与评论总数无关的小规模数据：已分析条目ID、计数器、有用数的和与最大值、
+    关键词计数，以及每个分类按有用数排序的前几条示例。把一批新评论的聚合合并进来，
+    即可生成与全量分析相同结构的 statistics.json 和 classified_comments.json。
+    评论以 DataFrame 传入，计数和取前几条都按列计算
+    """
+
+    def __init__(self, data_dir: str = None, path: str = None):
+        """
+        读取分析状态
+
+        Args:
+            data_dir: 数据目录，None时使用配置文件中的DATA_DIR
+            path: 状态文件路径，None时为数据目录下的 OUTPUT_ANALYSIS_STATE
+        """
+        self.path = path or os.path.join(data_dir or DATA_DIR, OUTPUT_ANALYSIS_STATE)
+        # 情感模型、阈值或评分分类变化后旧的聚合不能再合并
+        self.version = f"{model_version()}|{json.dumps(RATING_CATEGORIES, ensure_ascii=False, sort_keys=True)}"
+        self.reset()
+
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except Exception as e:
+                print(f"读取分析状态失败: {e}")
+                return
+            if data.get('version') != self.version:
+                print("情感模型或分类配置已变化，重新进行全量分析")
+                return
+            self.comment_ids = set(data['comment_ids'])
+            self.review_ids = set(data['review_ids'])
+            self.counts = data['counts']
+            self.ratings = Counter({int(rating): count for rating, count in data['ratings'].items()})
+            self.sentiments = Counter(data['sentiments'])
+            self.votes = data['votes']
+            self.keywords = Counter(data['keywords'])
+            self.samples = data['samples']
+            self.popular = data['popular']
+
+    def reset(self):
+        """清空所有聚合"""
+        self.comment_ids = set()
+        self.review_ids = set()
+        # 与全量分析一致，按传入的条数计数（全量分析时不去重）
+        self.counts = {'comments': 0, 'reviews': 0}
+        self.ratings = Counter()
+        self.sentiments = Counter()
+        self.votes = {'sum': 0, 'max': 0, 'over_100': 0, 'over_1000': 0}
+        self.keywords = Counter()
+        self.samples = {
+            'by_rating': {category: [] for category in RATING_CATEGORIES},
+            'by_sentiment': {sentiment: [] for sentiment in SENTIMENTS}
+        }
+        self.popular = []
+
+    @property
+    def comment_count(self) -> int:
+        return self.counts['comments']
+
+    def filter_new(self, comments: pd.DataFrame, reviews: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        筛选出尚未分析过的短评和影评（同一批数据中的重复条目只保留第一条）
+
+        Returns:
+            (新短评表, 新影评表)
+        """
+        def new_rows(df, field, text_field, known):
+            keys = pd.Series(_item_keys(df, field, text_field), index=df.index, dtype=object)
+            mask = ~keys.isin(known) & ~keys.duplicated()
+            return df[mask].reset_index(drop=True)
+
+        return (new_rows(comments, 'comment_id', 'content', self.comment_ids),
+                new_rows(reviews, 'review_url', 'title', self.review_ids))
+
+    def update(self, comments: pd.DataFrame, reviews: pd.DataFrame, keywords: Dict[str, int]):
+        """
+        合并一批新数据的聚合
+
+        Args:
+            comments: 新短评（已完成情感分析的带有 sentiment 列）
+            reviews: 新影评
+            keywords: 关键词计数的增量（见 CommentClassifier._keyword_increments）
+        """
+        self.comment_ids.update(_item_keys(comments, 'comment_id', 'content'))
+        self.review_ids.update(_item_keys(reviews, 'review_url', 'title'))
+        self.counts['comments'] += len(comments)
+        self.counts['reviews'] += len(reviews)
+
+        rating = column(comments, 'rating', 0)
+        for value, count in rating[rating.isin(list(RATING_TEXT_MAP))].value_counts(sort=False).items():
+            self.ratings[int(value)] += int(count)
+
+        # 示例评论：已有的前几条在前，有用数相同时保持先后顺序
+        for category, ratings in RATING_CATEGORIES.items():
+            rows = votes_order(comments, np.flatnonzero(rating.isin(ratings).to_numpy()))
+            samples = self.samples['by_rating'][category] + to_samples(comments, rows[:SAMPLE_SIZE])
+            self.samples['by_rating'][category] = _top(samples, SAMPLE_SIZE)
+
+        sentiment = column(comments, 'sentiment', None).astype(object).to_numpy()
+        for label in SENTIMENTS:
+            rows = np.flatnonzero(sentiment == label)
+            if len(rows):
+                self.sentiments[label] += len(rows)
+            samples = self.samples['by_sentiment'][label] + to_samples(comments, votes_order(comments, rows)[:SAMPLE_SIZE])
+            self.samples['by_sentiment'][label] = _top(samples, SAMPLE_SIZE)
+
+        votes = column(comments, 'votes', 0).to_numpy()
+        if len(votes):
+            self.votes['sum'] += votes.sum().item()
+            self.votes['max'] = max(self.votes['max'], votes.max().item())
+            self.votes['over_100'] += int((votes > 100).sum())
+            self.votes['over_1000'] += int((votes > 1000).sum())
+
+        rows = votes_order(comments)[:POPULAR_TOP_N + SAMPLE_SIZE]
+        self.popular = _top(self.popular + to_samples(comments, rows), POPULAR_TOP_N + SAMPLE_SIZE)
+
+        self.keywords.update(keywords)
+        if len(self.keywords) > MAX_KEYWORDS:
+            self.keywords = Counter(dict(self.keywords.most_common(MAX_KEYWORDS)))
+
+    def statistics(self, top_keywords: int = 20) -> Dict:
+        """
+        由聚合生成统计数据（结构与 CommentClassifier.generate_statistics 相同）
+
+        Args:
+            top_keywords: 关键词统计中的关键词数量
+
+        Returns:
+            统计结果字典
+        """
+        total = self.comment_count
+
+        def share(count):
+            percentage = count / total * 100 if total else 0
+            return {"数量": count, "占比": f"{percentage:.1f}%"}
+
+        stats = {
+            "总评论数": {
+                "短评": total,
+                "长评": self.counts['reviews'],
+                "合计": total + self.counts['reviews']
+            },
+            "评分分布": {
+                category: share(sum(self.ratings.get(rating, 0) for rating in ratings))
+                for category, ratings in RATING_CATEGORIES.items()
+            },
+            "情感分布": {sentiment: share(self.sentiments.get(sentiment, 0)) for sentiment in SENTIMENTS},
+            "热度统计": {},
+            "关键词统计": dict(self.keywords.most_common(top_keywords))
+        }
+
+        if total:
+            stats["热度统计"] = {
+                "最高有用数": self.votes['max'],
+                "平均有用数": f"{self.votes['sum'] / total:.1f}",
+                "有用数>100的评论": self.votes['over_100'],
+                "有用数>1000的评论": self.votes['over_1000']
+            }
+
+        stats["详细评分"] = {
+            f"{rating}星 ({RATING_TEXT_MAP.get(rating, '')})": share(self.ratings.get(rating, 0))
+            for rating in range(5, 0, -1)
+        }
+        return stats
+
+    def classified_summary(self) -> Dict:
+        """
+        由聚合生成分类结果摘要（结构与全量分析保存的 classified_comments.json 相同）
+
+        Returns:
+            {分类方式: {类别: {count, samples}}}
+        """
+        total = self.comment_count
+        rating_counts = {
+            category: sum(self.ratings.get(rating, 0) for rating in ratings)
+            for category, ratings in RATING_CATEGORIES.items()
+        }
+        return {
+            'by_rating': {
+                category: {"count": rating_counts[category], "samples": samples}
+                for category, samples in self.samples['by_rating'].items()
+            },
+            'by_sentiment': {
+                sentiment: {"count": self.sentiments.get(sentiment, 0), "samples": samples}
+                for sentiment, samples in self.samples['by_sentiment'].items()
+            },
+            'by_popularity': {
+                "热门评论": {"count": min(total, POPULAR_TOP_N), "samples": self.popular[:SAMPLE_SIZE]},
+                "普通评论": {"count": max(total - POPULAR_TOP_N, 0), "samples": self.popular[POPULAR_TOP_N:]}
+            }
+        }
+
+    def get_samples(self, category: str, n: int = 5) -> List[Dict]:
+        """
+        获取某个评分或情感类别中有用数最高的示例评论
+
+        Args:
+            category: 类别名称
+            n: 示例数量（最多 SAMPLE_SIZE 条）
+
+        Returns:
+            示例评论列表
+        """
+        for classify_type in ('by_rating', 'by_sentiment'):
+            if category in self.samples[classify_type]:
+                return self.samples[classify_type][category][:n]
+        return []
+
+    def save(self):
+        """保存分析状态（先写临时文件再替换）"""
+        data = {
+            'version': self.version,
+            'comment_ids': list(self.comment_ids),
+            'review_ids': list(self.review_ids),
+            'counts': self.counts,
+            'ratings': {str(rating): count for rating, count in self.ratings.items()},
+            'sentiments': dict(self.sentiments),
+            'votes': self.votes,
+            'keywords': dict(self.keywords),
+            'samples': self.samples,
+            'popular': self.popular
+        }
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+
+# 测试代码
+if __name__ == "__main__":
+    state = AnalysisState()
+    print(f"已分析短评: {state.comment_count} 条, 影评: {state.counts['reviews']} 条")
+    print(json.dumps(state.statistics(), ensure_ascii=False, indent=2))
@@ -0,0 +1,96 @@
+"""
+页面缓存 - 以内容哈希寻址、gzip压缩保存抓取到的原始HTML，支持离线重放
+"""
+import gzip
+import hashlib
+import json
+import os
+import time
+from typing import Dict, Optional
+
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import PAGE_CACHE_DIR
+
+
+class PageCache:
+    """原始HTML缓存
+
+    目录结构:
+        objects/ab/abcdef....html.gz   按内容SHA-256寻址的压缩HTML，相同内容只存一份
+        index.jsonl                    每次抓取追加一行 {url, sha256, fetched_at}
+    """
+
+    def __init__(self, cache_dir: str = None):
+        """
+        打开缓存目录
+
+        Args:
+            cache_dir: 缓存目录，None时使用配置文件设置
+        """
+        self.cache_dir = cache_dir or PAGE_CACHE_DIR
+        self.index_file = os.path.join(self.cache_dir, 'index.jsonl')
+        self.entries: Dict[str, Dict] = {}
+
+        if os.path.exists(self.index_file):
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    # 同一URL以最后一次抓取为准
+                    self.entries[entry['url']] = entry
+
+    def _object_path(self, digest: str) -> str:
+        """内容哈希对应的文件路径"""
+        return os.path.join(self.cache_dir, 'objects', digest[:2], f'{digest}.html.gz')
+
+    def put(self, url: str, html: str):
+        """
+        保存一次抓取结果
+
+        Args:
+            url: 页面URL
+            html: 页面HTML内容
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        data = html.encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._object_path(digest)
+
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = path + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(gzip.compress(data))
+            os.replace(tmp_path, path)
+
+        entry = {'url': url, 'sha256': digest, 'fetched_at': time.time()}
+        with open(self.index_file, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        self.entries[url] = entry
+
+    def get(self, url: str, max_age: float = None) -> Optional[str]:
+        """
+        读取缓存的页面
+
+        Args:
+            url: 页面URL
+            max_age: 最长有效期（秒），None表示不过期
+
+        Returns:
+            页面HTML内容；未缓存或已过期时返回None
+        """
+        entry = self.entries.get(url)
+        if not entry:
+            return None
+        if max_age is not None and time.time() - entry['fetched_at'] > max_age:
+            return None
+
+        path = self._object_path(entry['sha256'])
+        if not os.path.exists(path):
+            return None
+        with open(path, 'rb') as f:
+            return gzip.decompress(f.read()).decode('utf-8')
@@ -0,0 +1,187 @@
+"""
+爬取断点 - 记录每页的爬取进度，中断后可从断点继续
+"""
+import json
+import os
+from typing import Dict, Iterable, Iterator
+
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import CRAWL_STATE_FILE
+
+
+# 由页面记录重建、不写入状态文件的字段
+_PAGE_FIELDS = ('completed', 'item_ids')
+
+
+class CrawlState:
+    """爬取状态
+
+    状态文件（JSON）只保存总数、失败页、是否完成等少量数据，每次变化时整体重写；
+    每页的完成记录和新增条目ID逐行追加到页面记录文件（状态文件同名的 .pages.jsonl），
+    爬取很多页时每页的写入量也不会随已爬取的条目数增长
+    """
+
+    def __init__(self, movie_id: str, path: str = None, persist: bool = True):
+        """
+        初始化爬取状态
+
+        Args:
+            movie_id: 电影ID，状态文件属于其他电影时会被重置
+            path: 状态文件路径，None时使用配置文件设置
+            persist: 是否读写状态文件（离线重放时只在内存中记录）
+        """
+        self.movie_id = movie_id
+        self.path = path or CRAWL_STATE_FILE
+        self.pages_path = os.path.splitext(self.path)[0] + '.pages.jsonl'
+        self.persist = persist
+        self.data = {'movie_id': movie_id, 'sections': {}}
+
+        if persist and os.path.exists(self.path):
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('movie_id') == movie_id:
+                    self.data = data
+            except Exception as e:
+                print(f"读取爬取状态失败: {e}")
+
+        # 旧版状态文件中的页面记录转存到页面记录文件
+        legacy = False
+        for kind, section in self.data['sections'].items():
+            completed = section.pop('completed', [])
+            item_ids = section.pop('item_ids', [])
+            for index, start in enumerate(completed):
+                self._append_page(kind, start, item_ids if index == 0 else [])
+                legacy = True
+            section['completed'] = []
+            section['item_ids'] = []
+        if legacy:
+            self.save()
+
+        for record in self._read_pages():
+            section = self.section(record['kind'])
+            if record['start'] not in section['completed']:
+                section['completed'].append(record['start'])
+            section['item_ids'].extend(record['item_ids'])
+        for section in self.data['sections'].values():
+            completed = set(section['completed'])
+            section['failed'] = [start for start in section.get('failed', []) if start not in completed]
+
+    def _read_pages(self) -> Iterator[Dict]:
+        """读取属于当前电影的页面记录（跳过中断时写了一半的最后一行）"""
+        if not self.persist or not os.path.exists(self.pages_path):
+            return
+        with open(self.pages_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if record.get('movie_id') == self.movie_id:
+                    yield record
+
+    def section(self, kind: str) -> Dict:
+        """
+        获取某类数据（comments/reviews）的爬取状态
+
+        Args:
+            kind: 数据类型
+
+        Returns:
+            包含 completed、failed、item_ids、total_count、finished 的字典
+        """
+        return self.data['sections'].setdefault(kind, {
+            'completed': [],
+            'failed': [],
+            'item_ids': [],
+            'total_count': 0,
+            'finished': False
+        })
+
+    def reset(self, kind: str):
+        """清空某类数据的爬取状态"""
+        self.data['sections'].pop(kind, None)
+        self.save()
+        if self.persist and os.path.exists(self.pages_path):
+            records = [record for record in self._read_pages() if record['kind'] != kind]
+            tmp_path = self.pages_path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.writelines(json.dumps(record, ensure_ascii=False) + '\n' for record in records)
+            os.replace(tmp_path, self.pages_path)
+
+    def set_total(self, kind: str, total_count: int):
+        """记录总条目数"""
+        self.section(kind)['total_count'] = total_count
+        self.save()
+
+    def record_page(self, kind: str, start: int, item_ids: Iterable[str]):
+        """
+        记录一页爬取成功（追加一行页面记录并刷新到磁盘）
+
+        调用前该页的条目应已写入磁盘，断点续爬时跳过的页面不会丢失数据
+
+        Args:
+            kind: 数据类型
+            start: 页面偏移
+            item_ids: 该页新增条目的ID
+        """
+        item_ids = list(item_ids)
+        section = self.section(kind)
+        if start not in section['completed']:
+            section['completed'].append(start)
+        section['item_ids'].extend(item_ids)
+
+        self._append_page(kind, start, item_ids)
+
+        if start in section['failed']:
+            section['failed'].remove(start)
+        # 状态文件不含页面记录，重写的开销与已爬取的页数无关（多维度爬取的进度也随之保存）
+        self.save()
+
+    def _append_page(self, kind: str, start, item_ids: list):
+        """追加一行页面记录并刷新到磁盘"""
+        if not self.persist:
+            return
+        os.makedirs(os.path.dirname(self.pages_path), exist_ok=True)
+        record = {'movie_id': self.movie_id, 'kind': kind, 'start': start, 'item_ids': item_ids}
+        with open(self.pages_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+    def record_failure(self, kind: str, start: int):
+        """记录一页爬取失败"""
+        section = self.section(kind)
+        if start not in section['failed']:
+            section['failed'].append(start)
+        self.save()
+
+    def finish(self, kind: str):
+        """标记某类数据已爬取完毕"""
+        self.section(kind)['finished'] = True
+        self.save()
+
+    def save(self):
+        """原子写入状态文件，避免中断时留下半个文件"""
+        if not self.persist:
+            return
+        data = dict(self.data, sections={
+            kind: {key: value for key, value in section.items() if key not in _PAGE_FIELDS}
+            for kind, section in self.data['sections'].items()
+        })
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    def clear(self):
+        """整个爬取完成后删除状态文件和页面记录"""
+        self.data = {'movie_id': self.movie_id, 'sections': {}}
+        if not self.persist:
+            return
+        for path in (self.path, self.pages_path):
+            if os.path.exists(path):
+                os.remove(path)
@@ -3,9 +3,12 @@
 支持按评分、情感、热度等多种方式分类
 """
 import json
+import multiprocessing
 import os
-from typing import List, Dict, Tuple
-from collections import Counter
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Optional, Tuple
+import numpy as np
 import pandas as pd
 
 try:
@@ -20,23 +23,106 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config.settings import (
     RATING_TEXT_MAP, RATING_CATEGORIES,
     SENTIMENT_POSITIVE_THRESHOLD, SENTIMENT_NEGATIVE_THRESHOLD,
+    SENTIMENT_WORKERS, SENTIMENT_CHUNK_SIZE, SENTIMENT_CACHE_ENABLED, KEYWORD_SAMPLE_CHARS,
     DATA_DIR, OUTPUT_STATS_JSON, OUTPUT_CLASSIFIED_JSON
 )
+from src.sentiment_cache import SentimentCache
+from src.analysis_state import (
+    AnalysisState, POPULAR_TOP_N, SENTIMENTS, column, votes_order, to_samples
+)
+from src.keywords import KeywordCounter, sample_texts
+
+# 重复率高的字符串列，以category类型保存（每个不同的值只存一份，各行只存整数编码）
+INTERNED_COLUMNS = ('username', 'user_url')
+
+
+def _score_text(text: str) -> Optional[float]:
+    """
+    用SnowNLP计算一段文本的情感分数
+    
+    Returns:
+        情感分数0-1；文本为空、SnowNLP不可用或分析出错时返回None
+    """
+    if not text or not SnowNLP:
+        return None
+    try:
+        return SnowNLP(text).sentiments
+    except Exception as e:
+        print(f"情感分析出错: {e}")
+        return None
+
+
+def _init_sentiment_worker():
+    """情感分析进程初始化：每个进程只加载一次SnowNLP情感模型"""
+    if SnowNLP:
+        import snownlp.sentiment  # noqa: F401  导入时加载模型
+
+
+def _score_chunk(texts: List[str]) -> List[Optional[float]]:
+    """在情感分析进程中计算一批文本的情感分数（保持输入顺序）"""
+    return [_score_text(text) for text in texts]
+
+
+def _to_frame(items) -> pd.DataFrame:
+    """
+    把评论列表转换为列式存储
+    
+    Args:
+        items: 评论字典列表或DataFrame
+        
+    Returns:
+        行号从0开始的DataFrame，INTERNED_COLUMNS 中的列为category类型
+    """
+    if isinstance(items, pd.DataFrame):
+        df = items.reset_index(drop=True)
+    else:
+        df = pd.DataFrame(items or [])
+    for name in INTERNED_COLUMNS:
+        if name in df and not isinstance(df[name].dtype, pd.CategoricalDtype):
+            df[name] = df[name].astype('category')
+    return df
+
+
+def _contents(df: pd.DataFrame) -> List[str]:
+    """评论表中非空的评论内容"""
+    return [content for content in column(df, 'content', '').tolist() if isinstance(content, str) and content]
 
 
 class CommentClassifier:
-    """评论分类器"""
+    """评论分类器
+    
+    评论以列式存储（DataFrame，用户名和用户链接为category类型），
+    各分类结果只保存行号数组，分组按列向量化计算
+    """
     
-    def __init__(self, comments: List[Dict] = None, reviews: List[Dict] = None):
+    def __init__(self, comments: List[Dict] = None, reviews: List[Dict] = None,
+                 sentiment_workers: int = None, sentiment_cache: bool = None, incremental: bool = False):
         """
         初始化分类器
         
         Args:
-            comments: 短评列表
-            reviews: 长评列表
+            comments: 短评列表（字典列表或DataFrame）
+            reviews: 长评列表（字典列表或DataFrame）
+            sentiment_workers: 情感分析进程数（1表示在当前进程中逐条分析，0表示使用全部CPU核心），
+                None时使用配置文件设置
+            sentiment_cache: 是否使用情感分析缓存，None时使用配置文件设置
+            incremental: 是否增量分析（load_state 后只分析新评论，统计由已保存的聚合合并得到）
         """
-        self.comments = comments or []
-        self.reviews = reviews or []
+        self.comments = _to_frame(comments)
+        self.reviews = _to_frame(reviews)
+        workers = sentiment_workers if sentiment_workers is not None else SENTIMENT_WORKERS
+        self.sentiment_workers = workers or os.cpu_count() or 1
+        
+        self.sentiment_cache = None
+        use_cache = sentiment_cache if sentiment_cache is not None else SENTIMENT_CACHE_ENABLED
+        if use_cache and SnowNLP:
+            try:
+                self.sentiment_cache = SentimentCache()
+            except (sqlite3.Error, OSError) as e:
+                print(f"⚠️ 无法打开情感分析缓存，本次不使用缓存: {e}")
+        self.incremental = incremental
+        self.state = None
+        self._state_merged = False
         self.classified_data = {}
         self.statistics = {}
     
@@ -48,16 +134,36 @@ class CommentClassifier:
             comments_file: 短评CSV文件路径
             reviews_file: 长评CSV文件路径
         """
+        dtype = {name: 'category' for name in INTERNED_COLUMNS}
+        
         if comments_file and os.path.exists(comments_file):
-            df = pd.read_csv(comments_file)
-            self.comments = df.to_dict('records')
+            self.comments = _to_frame(pd.read_csv(comments_file, dtype=dtype))
             print(f"已加载 {len(self.comments)} 条短评")
         
         if reviews_file and os.path.exists(reviews_file):
-            df = pd.read_csv(reviews_file)
-            self.reviews = df.to_dict('records')
+            self.reviews = _to_frame(pd.read_csv(reviews_file, dtype=dtype))
             print(f"已加载 {len(self.reviews)} 条长评")
     
+    def load_state(self, data_dir: str = None):
+        """
+        读取数据目录中的分析状态
+        
+        增量分析时去掉已经分析过的评论，之后的分类只处理新评论；
+        全量分析时从空的聚合开始，保存结果时重新生成分析状态，供之后的增量分析使用
+        
+        Args:
+            data_dir: 数据目录，None时使用配置文件中的DATA_DIR
+        """
+        self.state = AnalysisState(data_dir)
+        self._state_merged = False
+        if not self.incremental:
+            self.state.reset()
+            return
+        
+        total = len(self.comments)
+        self.comments, self.reviews = self.state.filter_new(self.comments, self.reviews)
+        print(f"增量分析: 已分析 {self.state.comment_count} 条短评，本次新增 {len(self.comments)}/{total} 条")
+    
     def analyze_sentiment(self, text: str) -> Tuple[float, str]:
         """
         分析文本情感
@@ -68,77 +174,144 @@ class CommentClassifier:
         Returns:
             (情感分数0-1, 情感类别)
         """
-        if not text or not SnowNLP:
-            return 0.5, "中性"
+        cacheable = self.sentiment_cache is not None and isinstance(text, str) and text
+        if cacheable:
+            cached = self.sentiment_cache.get(text)
+            if cached:
+                return cached
+        
+        score = _score_text(text)
+        if cacheable and score is not None:
+            self.sentiment_cache.put(text, *self._sentiment_label(score))
+        return self._sentiment_label(score)
+    
+    @staticmethod
+    def _sentiment_label(score: Optional[float]) -> Tuple[float, str]:
+        """
+        按阈值划分情感类别
         
-        try:
-            s = SnowNLP(text)
-            score = s.sentiments
+        Args:
+            score: 情感分数，None表示无法分析
             
-            if score >= SENTIMENT_POSITIVE_THRESHOLD:
-                sentiment = "正面"
-            elif score <= SENTIMENT_NEGATIVE_THRESHOLD:
-                sentiment = "负面"
-            else:
-                sentiment = "中性"
+        Returns:
+            (情感分数0-1, 情感类别)，无法分析时为 (0.5, 中性)
+        """
+        if score is None:
+            return 0.5, "中性"
+        
+        if score >= SENTIMENT_POSITIVE_THRESHOLD:
+            sentiment = "正面"
+        elif score <= SENTIMENT_NEGATIVE_THRESHOLD:
+            sentiment = "负面"
+        else:
+            sentiment = "中性"
+        
+        return score, sentiment
+    
+    def analyze_sentiments(self, texts: List[str]) -> List[Tuple[float, str]]:
+        """
+        批量分析文本情感
+        
+        先查情感分析缓存，只对未缓存的文本（相同内容只分析一次）调用SnowNLP，
+        结果按输入顺序返回，与逐条调用 analyze_sentiment 完全一致
+        
+        Args:
+            texts: 待分析的文本列表
             
-            return score, sentiment
+        Returns:
+            与输入顺序对应的 (情感分数0-1, 情感类别) 列表
+        """
+        if self.sentiment_cache is None:
+            return [self._sentiment_label(score) for score in self._score_texts(texts)]
+        
+        cacheable = [text for text in texts if isinstance(text, str) and text]
+        cached = self.sentiment_cache.get_many(cacheable)
+        missing = list(dict.fromkeys(text for text in cacheable if text not in cached))
+        hits = sum(1 for text in cacheable if text in cached)
+        print(f"情感分析缓存命中 {hits}/{len(texts)} 条，需要分析 {len(missing)} 条")
+        
+        new_results = {}
+        for text, score in zip(missing, self._score_texts(missing)):
+            if score is not None:
+                new_results[text] = self._sentiment_label(score)
+        self.sentiment_cache.put_many(new_results)
+        cached.update(new_results)
+        
+        return [cached.get(text) or self._sentiment_label(None) for text in texts]
+    
+    def _score_texts(self, texts: List[str]) -> List[Optional[float]]:
+        """
+        计算一批文本的情感分数
+        
+        情感分析进程数大于1且文本足够多时，按 SENTIMENT_CHUNK_SIZE 分块交给进程池，结果保持输入顺序
+        
+        Args:
+            texts: 待分析的文本列表
             
-        except Exception as e:
-            print(f"情感分析出错: {e}")
-            return 0.5, "中性"
+        Returns:
+            与输入顺序对应的情感分数，无法分析的文本为None
+        """
+        total = len(texts)
+        chunks = [texts[i:i + SENTIMENT_CHUNK_SIZE] for i in range(0, total, SENTIMENT_CHUNK_SIZE)]
+        scores = []
+        
+        if self.sentiment_workers > 1 and len(chunks) > 1 and SnowNLP:
+            workers = min(self.sentiment_workers, len(chunks))
+            print(f"使用 {workers} 个进程进行情感分析...")
+            with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+                                     initializer=_init_sentiment_worker) as executor:
+                for chunk_scores in executor.map(_score_chunk, chunks):
+                    scores.extend(chunk_scores)
+                    print(f"已分析 {len(scores)}/{total} 条评论")
+        else:
+            for text in texts:
+                scores.append(_score_text(text))
+                # 进度显示
+                if len(scores) % 100 == 0:
+                    print(f"已分析 {len(scores)}/{total} 条评论")
+        
+        return scores
     
-    def classify_by_rating(self) -> Dict[str, List[Dict]]:
+    def classify_by_rating(self) -> Dict[str, np.ndarray]:
         """
         按评分分类
         
         Returns:
-            按评分分类的评论字典
+            {类别: 该类评论的行号数组}
         """
-        result = {category: [] for category in RATING_CATEGORIES.keys()}
+        rating = column(self.comments, 'rating', 0)
+        # 每条评论的类别编码，-1表示不属于任何类别
+        codes = np.full(len(self.comments), -1, dtype=np.int8)
+        for code, ratings in enumerate(RATING_CATEGORIES.values()):
+            codes[(codes == -1) & rating.isin(ratings).to_numpy()] = code
         
-        for comment in self.comments:
-            rating = comment.get('rating', 0)
-            for category, ratings in RATING_CATEGORIES.items():
-                if rating in ratings:
-                    result[category].append(comment)
-                    break
+        result = {category: np.flatnonzero(codes == code) for code, category in enumerate(RATING_CATEGORIES)}
         
         self.classified_data['by_rating'] = result
         return result
     
-    def classify_by_sentiment(self) -> Dict[str, List[Dict]]:
+    def classify_by_sentiment(self) -> Dict[str, np.ndarray]:
         """
         按情感分类
         
         Returns:
-            按情感分类的评论字典
+            {情感类别: 该类评论的行号数组}
         """
-        result = {
-            "正面": [],
-            "中性": [],
-            "负面": []
-        }
-        
         print("正在进行情感分析...")
-        for i, comment in enumerate(self.comments):
-            content = comment.get('content', '')
-            score, sentiment = self.analyze_sentiment(content)
-            
-            # 添加情感信息到评论
-            comment['sentiment_score'] = score
-            comment['sentiment'] = sentiment
-            
-            result[sentiment].append(comment)
-            
-            # 进度显示
-            if (i + 1) % 100 == 0:
-                print(f"已分析 {i + 1}/{len(self.comments)} 条评论")
+        texts = column(self.comments, 'content', '').tolist()
+        results = self.analyze_sentiments(texts)
+        
+        # 添加情感信息到评论
+        self.comments['sentiment_score'] = [score for score, _ in results]
+        self.comments['sentiment'] = pd.Categorical([sentiment for _, sentiment in results], categories=SENTIMENTS)
+        
+        codes = self.comments['sentiment'].cat.codes.to_numpy()
+        result = {sentiment: np.flatnonzero(codes == code) for code, sentiment in enumerate(SENTIMENTS)}
         
         self.classified_data['by_sentiment'] = result
         return result
     
-    def classify_by_popularity(self, top_n: int = 100) -> Dict[str, List[Dict]]:
+    def classify_by_popularity(self, top_n: int = POPULAR_TOP_N) -> Dict[str, np.ndarray]:
         """
         按热度（有用数）分类
         
@@ -146,17 +319,13 @@ class CommentClassifier:
             top_n: 热门评论数量
             
         Returns:
-            热度分类结果
+            {热门评论/普通评论: 按有用数从高到低排列的行号数组}
         """
-        sorted_comments = sorted(
-            self.comments,
-            key=lambda x: x.get('votes', 0),
-            reverse=True
-        )
+        order = votes_order(self.comments)
         
         result = {
-            "热门评论": sorted_comments[:top_n],
-            "普通评论": sorted_comments[top_n:]
+            "热门评论": order[:top_n],
+            "普通评论": order[top_n:]
         }
         
         self.classified_data['by_popularity'] = result
@@ -188,9 +357,18 @@ class CommentClassifier:
         """
         生成统计数据
         
+        调用过 load_state 时先把本次评论的聚合合并到分析状态中，再由聚合生成统计
+        
         Returns:
             统计结果字典
         """
+        if self.state is not None:
+            if not self._state_merged:
+                self.state.update(self.comments, self.reviews, self._keyword_increments())
+                self._state_merged = True
+            self.statistics = self.state.statistics()
+            return self.statistics
+        
         stats = {
             "总评论数": {
                 "短评": len(self.comments),
@@ -205,20 +383,20 @@ class CommentClassifier:
         
         # 评分分布统计
         if 'by_rating' in self.classified_data:
-            for category, comments in self.classified_data['by_rating'].items():
-                count = len(comments)
-                percentage = count / len(self.comments) * 100 if self.comments else 0
+            for category, rows in self.classified_data['by_rating'].items():
+                count = len(rows)
+                percentage = count / len(self.comments) * 100 if len(self.comments) else 0
                 stats["评分分布"][category] = {
                     "数量": count,
                     "占比": f"{percentage:.1f}%"
                 }
         
         # 详细评分统计（1-5星）
-        rating_counter = Counter([c.get('rating', 0) for c in self.comments])
+        rating_counter = column(self.comments, 'rating', 0).value_counts().to_dict()
         stats["详细评分"] = {}
         for rating in range(5, 0, -1):
-            count = rating_counter.get(rating, 0)
-            percentage = count / len(self.comments) * 100 if self.comments else 0
+            count = int(rating_counter.get(rating, 0))
+            percentage = count / len(self.comments) * 100 if len(self.comments) else 0
             stats["详细评分"][f"{rating}星 ({RATING_TEXT_MAP.get(rating, '')})"] = {
                 "数量": count,
                 "占比": f"{percentage:.1f}%"
@@ -226,22 +404,22 @@ class CommentClassifier:
         
         # 情感分布统计
         if 'by_sentiment' in self.classified_data:
-            for sentiment, comments in self.classified_data['by_sentiment'].items():
-                count = len(comments)
-                percentage = count / len(self.comments) * 100 if self.comments else 0
+            for sentiment, rows in self.classified_data['by_sentiment'].items():
+                count = len(rows)
+                percentage = count / len(self.comments) * 100 if len(self.comments) else 0
                 stats["情感分布"][sentiment] = {
                     "数量": count,
                     "占比": f"{percentage:.1f}%"
                 }
         
         # 热度统计
-        if self.comments:
-            votes = [c.get('votes', 0) for c in self.comments]
+        if len(self.comments):
+            votes = column(self.comments, 'votes', 0).to_numpy()
             stats["热度统计"] = {
-                "最高有用数": max(votes) if votes else 0,
-                "平均有用数": f"{sum(votes) / len(votes):.1f}" if votes else 0,
-                "有用数>100的评论": len([v for v in votes if v > 100]),
-                "有用数>1000的评论": len([v for v in votes if v > 1000])
+                "最高有用数": votes.max().item(),
+                "平均有用数": f"{votes.sum().item() / len(votes):.1f}",
+                "有用数>100的评论": int((votes > 100).sum()),
+                "有用数>1000的评论": int((votes > 1000).sum())
             }
         
         # 高频词统计
@@ -254,38 +432,63 @@ class CommentClassifier:
         """
         提取高频关键词
         
+        关键词从不超过 KEYWORD_SAMPLE_CHARS 个字符的评论样本中提取，
+        再用多关键词自动机对全部评论各扫描一次统计词频
+        
         Args:
             top_n: 返回的关键词数量
             
         Returns:
             关键词及其频次
         """
-        if not SnowNLP:
+        contents = _contents(self.comments)
+        keywords = self._keyword_candidates(contents, top_n)
+        if not keywords:
             return {}
         
-        all_text = ' '.join([c.get('content', '') for c in self.comments])
+        # 统计词频（与逐个关键词 content.count 的结果相同）
+        word_counter = KeywordCounter(keywords).count_all(contents)
+        return dict(word_counter.most_common(top_n))
+    
+    def _keyword_candidates(self, contents: List[str], top_n: int = 20) -> List[str]:
+        """
+        从评论样本中提取关键词
         
-        if not all_text:
-            return {}
+        Args:
+            contents: 评论内容
+            top_n: 关键词数量
+            
+        Returns:
+            关键词列表；没有SnowNLP或提取出错时返回空列表
+        """
+        if not SnowNLP or not contents:
+            return []
         
         try:
-            s = SnowNLP(all_text)
-            # 获取关键词
-            keywords = s.keywords(top_n)
-            
-            # 统计词频
-            word_counter = Counter()
-            for comment in self.comments:
-                content = comment.get('content', '')
-                for keyword in keywords:
-                    if keyword in content:
-                        word_counter[keyword] += content.count(keyword)
-            
-            return dict(word_counter.most_common(top_n))
-            
+            s = SnowNLP(' '.join(sample_texts(contents, KEYWORD_SAMPLE_CHARS)))
+            return s.keywords(top_n)
         except Exception as e:
             print(f"关键词提取出错: {e}")
+            return []
+    
+    def _keyword_increments(self) -> Dict[str, int]:
+        """
+        本批短评对分析状态中关键词计数的增量
+        
+        分析状态中已有的关键词加上本批提取的关键词，只统计本批短评中的次数（不重新扫描已分析的短评）。
+        全量分析时分析状态为空，结果与 _extract_keywords 相同；增量分析时后加入的关键词
+        缺少之前各批中的次数，计数是近似值
+        
+        Returns:
+            关键词 -> 要累加的次数
+        """
+        contents = _contents(self.comments)
+        if not contents:
             return {}
+        
+        keywords = list(self.state.keywords)
+        keywords += [word for word in self._keyword_candidates(contents) if word not in self.state.keywords]
+        return dict(KeywordCounter(keywords).count_all(contents))
     
     def get_sample_comments(self, category: str, n: int = 5) -> List[Dict]:
         """
@@ -298,16 +501,14 @@ class CommentClassifier:
         Returns:
             示例评论列表
         """
-        if 'by_rating' in self.classified_data and category in self.classified_data['by_rating']:
-            comments = self.classified_data['by_rating'][category]
-            # 按有用数排序，取最热门的
-            sorted_comments = sorted(comments, key=lambda x: x.get('votes', 0), reverse=True)
-            return sorted_comments[:n]
+        if self.state is not None:
+            return self.state.get_samples(category, n)
         
-        if 'by_sentiment' in self.classified_data and category in self.classified_data['by_sentiment']:
-            comments = self.classified_data['by_sentiment'][category]
-            sorted_comments = sorted(comments, key=lambda x: x.get('votes', 0), reverse=True)
-            return sorted_comments[:n]
+        for classify_type in ('by_rating', 'by_sentiment'):
+            if classify_type in self.classified_data and category in self.classified_data[classify_type]:
+                rows = self.classified_data[classify_type][category]
+                # 按有用数排序，取最热门的
+                return self.comments.iloc[votes_order(self.comments, rows)[:n]].to_dict('records')
         
         return []
     
@@ -357,43 +558,51 @@ class CommentClassifier:
                     content = sample.get('content', '')[:50] + "..." if len(sample.get('content', '')) > 50 else sample.get('content', '')
                     print(f"   {i}. {content} (👍{sample.get('votes', 0)})")
     
-    def save_results(self):
-        """保存分类结果和统计数据"""
-        os.makedirs(DATA_DIR, exist_ok=True)
+    def save_results(self, output_dir: str = None):
+        """
+        保存分类结果和统计数据
+        
+        Args:
+            output_dir: 输出目录，None时使用配置文件中的DATA_DIR
+        """
+        output_dir = output_dir or DATA_DIR
+        os.makedirs(output_dir, exist_ok=True)
         
         # 保存统计数据
-        stats_file = os.path.join(DATA_DIR, OUTPUT_STATS_JSON)
+        stats_file = os.path.join(output_dir, OUTPUT_STATS_JSON)
         with open(stats_file, 'w', encoding='utf-8') as f:
             json.dump(self.statistics, f, ensure_ascii=False, indent=2)
         print(f"\n统计数据已保存到: {stats_file}")
         
         # 保存分类结果（只保存摘要，完整数据太大）
-        classified_summary = {}
-        for classify_type, data in self.classified_data.items():
-            classified_summary[classify_type] = {}
-            for category, comments in data.items():
-                classified_summary[classify_type][category] = {
-                    "count": len(comments),
-                    "samples": [
-                        {
-                            "content": c.get('content', '')[:100],
-                            "rating": c.get('rating', 0),
-                            "votes": c.get('votes', 0)
-                        }
-                        for c in sorted(comments, key=lambda x: x.get('votes', 0), reverse=True)[:5]
-                    ]
-                }
-        
-        classified_file = os.path.join(DATA_DIR, OUTPUT_CLASSIFIED_JSON)
+        if self.state is not None:
+            classified_summary = self.state.classified_summary()
+            self.state.save()
+        else:
+            classified_summary = {}
+            for classify_type, data in self.classified_data.items():
+                classified_summary[classify_type] = {}
+                for category, rows in data.items():
+                    classified_summary[classify_type][category] = {
+                        "count": len(rows),
+                        "samples": to_samples(self.comments, votes_order(self.comments, rows)[:5])
+                    }
+        
+        classified_file = os.path.join(output_dir, OUTPUT_CLASSIFIED_JSON)
         with open(classified_file, 'w', encoding='utf-8') as f:
             json.dump(classified_summary, f, ensure_ascii=False, indent=2)
         print(f"分类结果已保存到: {classified_file}")
         
         # 保存带情感标注的完整数据
-        if self.comments:
-            df = pd.DataFrame(self.comments)
-            sentiment_file = os.path.join(DATA_DIR, 'comments_with_sentiment.csv')
-            df.to_csv(sentiment_file, index=False, encoding='utf-8-sig')
+        if len(self.comments):
+            sentiment_file = os.path.join(output_dir, 'comments_with_sentiment.csv')
+            if self.incremental and self.state is not None and os.path.exists(sentiment_file):
+                # 增量分析：只追加新评论，列顺序与已有文件一致
+                columns = pd.read_csv(sentiment_file, nrows=0, encoding='utf-8-sig').columns
+                self.comments.reindex(columns=columns).to_csv(sentiment_file, mode='a', header=False,
+                                                              index=False, encoding='utf-8-sig')
+            else:
+                self.comments.to_csv(sentiment_file, index=False, encoding='utf-8-sig')
             print(f"带情感标注的评论已保存到: {sentiment_file}")
 
 
@@ -0,0 +1,177 @@
+"""
+浏览器守护进程 - 常驻一个已准备好登录状态的Chrome，命令行各命令通过远程调试端口连接，不再每次冷启动浏览器
+"""
+import json
+import os
+import time
+import urllib.request
+from typing import Dict, Optional
+
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import DAEMON_DEBUG_PORT, DAEMON_STATE_FILE, DAEMON_CHECK_INTERVAL
+
+
+def _debugger_alive(address: str) -> bool:
+    """远程调试端口是否有Chrome在响应"""
+    try:
+        with urllib.request.urlopen(f"http://{address}/json/version", timeout=2) as response:
+            return response.status == 200
+    except Exception:
+        return False
+
+
+def read_state(state_file: str = None) -> Optional[Dict]:
+    """
+    读取守护进程状态
+
+    Args:
+        state_file: 状态文件路径，None时使用配置文件设置
+
+    Returns:
+        {pid, debugger_address, driver_path, started_at}；状态文件不存在或损坏时返回None
+    """
+    state_file = state_file or DAEMON_STATE_FILE
+    if not os.path.exists(state_file):
+        return None
+    try:
+        with open(state_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def daemon_address(state_file: str = None) -> Optional[str]:
+    """
+    正在运行的守护进程中Chrome的远程调试地址
+
+    Args:
+        state_file: 状态文件路径，None时使用配置文件设置
+
+    Returns:
+        host:port；守护进程未运行或其浏览器没有响应时返回None
+    """
+    state = read_state(state_file)
+    if state and _debugger_alive(state['debugger_address']):
+        return state['debugger_address']
+    return None
+
+
+def daemon_driver_path(state_file: str = None) -> Optional[str]:
+    """
+    守护进程启动浏览器时使用的undetected-chromedriver补丁版chromedriver
+
+    连接守护进程时用同一个chromedriver，避免Selenium Manager另外下载一个未打补丁的版本
+
+    Args:
+        state_file: 状态文件路径，None时使用配置文件设置
+
+    Returns:
+        chromedriver路径；状态文件中没有记录或文件已不存在时返回None
+    """
+    state = read_state(state_file)
+    path = state.get('driver_path') if state else None
+    if path and os.path.exists(path):
+        return path
+    return None
+
+
+def stop_daemon(state_file: str = None, timeout: float = None) -> bool:
+    """
+    通知守护进程退出（删除状态文件，守护进程在下一次检查时关闭浏览器并退出）
+
+    Args:
+        state_file: 状态文件路径，None时使用配置文件设置
+        timeout: 等待浏览器关闭的最长时间（秒），None时为检查间隔加10秒
+
+    Returns:
+        守护进程的浏览器是否已关闭
+    """
+    state_file = state_file or DAEMON_STATE_FILE
+    state = read_state(state_file)
+    if not state:
+        print("浏览器守护进程未运行")
+        return True
+
+    os.remove(state_file)
+    deadline = time.monotonic() + (timeout if timeout is not None else DAEMON_CHECK_INTERVAL + 10)
+    while time.monotonic() < deadline:
+        if not _debugger_alive(state['debugger_address']):
+            print("浏览器守护进程已停止")
+            return True
+        time.sleep(0.5)
+    print(f"浏览器守护进程（PID {state['pid']}）没有在预期时间内退出")
+    return False
+
+
+class BrowserDaemon:
+    """浏览器守护进程
+
+    在固定的远程调试端口（只监听127.0.0.1）上启动Chrome并准备好登录状态，之后每隔一段时间检查一次：
+    浏览器崩溃时重新启动，状态文件被删除（--daemon-stop）时关闭浏览器退出
+    """
+
+    def __init__(self, scraper, port: int = None, state_file: str = None, check_interval: float = None):
+        """
+        初始化守护进程
+
+        Args:
+            scraper: 用于创建浏览器和准备登录状态的 DoubanScraper（不连接守护进程）
+            port: 远程调试端口，None时使用配置文件设置
+            state_file: 状态文件路径，None时使用配置文件设置
+            check_interval: 检查间隔（秒），None时使用配置文件设置
+        """
+        self.scraper = scraper
+        self.address = f"127.0.0.1:{port or DAEMON_DEBUG_PORT}"
+        self.state_file = state_file or DAEMON_STATE_FILE
+        self.check_interval = check_interval or DAEMON_CHECK_INTERVAL
+
+    def _write_state(self):
+        """写入状态文件（先写临时文件再替换）"""
+        os.makedirs(os.path.dirname(self.state_file), exist_ok=True)
+        patcher = getattr(self.scraper.driver, 'patcher', None)
+        state = {
+            'pid': os.getpid(),
+            'debugger_address': self.address,
+            # 连接时复用同一个打过补丁的chromedriver
+            'driver_path': getattr(patcher, 'executable_path', None),
+            'started_at': time.time()
+        }
+        tmp_file = self.state_file + '.tmp'
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_file, self.state_file)
+
+    def run(self):
+        """启动浏览器并常驻，直到状态文件被删除或收到 Ctrl+C"""
+        if daemon_address(self.state_file):
+            print(f"浏览器守护进程已在运行: {read_state(self.state_file)['debugger_address']}")
+            return
+
+        self.scraper.debugger_address = self.address
+        self.scraper._start_driver()
+        self._write_state()
+        print(f"浏览器守护进程已启动，远程调试地址: {self.address}")
+        print("其他命令加 --attach 即可连接；停止: python main.py --daemon-stop")
+
+        try:
+            while os.path.exists(self.state_file):
+                time.sleep(self.check_interval)
+                if not _debugger_alive(self.address):
+                    print("守护进程中的浏览器已退出，正在重新启动...")
+                    self.scraper._replace_driver()
+                    self._write_state()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.scraper.stop()
+            if os.path.exists(self.state_file):
+                os.remove(self.state_file)
+            print("浏览器守护进程已退出")
+
+
+# 测试代码
+if __name__ == "__main__":
+    state = read_state()
+    print(f"守护进程状态: {state}, 远程调试地址: {daemon_address()}")
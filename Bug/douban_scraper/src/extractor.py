@@ -0,0 +1,155 @@
+"""
+浏览器内提取 - 在页面中执行JavaScript提取短评/影评字段和分页状态，只传回紧凑的JSON，
+省去 driver.page_source 传输整个DOM和在Python中再次解析HTML的开销
+"""
+import json
+from typing import Dict, Optional
+
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import RATING_MAP
+
+# 与 DoubanParser._parse_single_comment / _parse_single_review / parse_page 的规则逐项对应，
+# 返回的字典字段和顺序与解析器一致
+# text() 对应 BeautifulSoup 的 get_text(strip=True)：每段文本去掉首尾空白后直接拼接
+EXTRACT_JS = r"""
+return (function (pageType, ratingMap) {
+    function text(el) {
+        var parts = [];
+        (function walk(node) {
+            for (var child = node.firstChild; child; child = child.nextSibling) {
+                if (child.nodeType === 3) {
+                    var value = child.nodeValue.trim();
+                    if (value) parts.push(value);
+                } else if (child.nodeType === 1) {
+                    walk(child);
+                }
+            }
+        })(el);
+        return parts.join('');
+    }
+
+    function href(el) {
+        return el ? (el.getAttribute('href') || '') : '';
+    }
+
+    function firstNumber(value, pattern) {
+        var match = value.match(pattern || /(\d+)/);
+        return match ? parseInt(match[1], 10) : 0;
+    }
+
+    function rating(item) {
+        var spans = item.querySelectorAll('span[class*="allstar"]');
+        for (var i = 0; i < spans.length; i++) {
+            var classes = (spans[i].getAttribute('class') || '').split(/\s+/);
+            if (!classes.some(function (c) { return /allstar\d+/.test(c); })) continue;
+            var ratingClass = classes.filter(function (c) { return c.indexOf('allstar') === 0; })[0];
+            return ratingClass ? (ratingMap[ratingClass] || 0) : 0;
+        }
+        return 0;
+    }
+
+    function comment(item) {
+        var info = item.querySelector('span.comment-info');
+        var link = info ? info.querySelector('a') : null;
+        var timeEl = item.querySelector('span.comment-time');
+        var contentEl = item.querySelector('span.short');
+        var voteEl = item.querySelector('span.votes');
+        var voteText = voteEl ? text(voteEl) : '';
+        var result = {
+            username: link ? text(link) : '匿名',
+            user_url: href(link),
+            rating: rating(item),
+            time: timeEl ? (timeEl.hasAttribute('title') ? timeEl.getAttribute('title') : text(timeEl)) : '',
+            content: contentEl ? text(contentEl) : '',
+            votes: /^\d+$/.test(voteText) ? parseInt(voteText, 10) : 0,
+            comment_id: item.getAttribute('data-cid') || ''
+        };
+        return result.content ? result : null;
+    }
+
+    function review(item) {
+        var user = item.querySelector('a.name');
+        var heading = item.querySelector('h2');
+        var titleLink = heading ? heading.querySelector('a') : null;
+        var timeEl = item.querySelector('span.main-meta');
+        var contentEl = item.querySelector('div.short-content');
+        var usefulEl = item.querySelector('a.action-btn');
+        var replyEl = item.querySelector('a[href*="#comments"]');
+        var result = {
+            username: user ? text(user) : '匿名',
+            user_url: href(user),
+            title: titleLink ? text(titleLink) : '',
+            review_url: href(titleLink),
+            rating: rating(item),
+            time: timeEl ? text(timeEl) : '',
+            summary: contentEl ? text(contentEl).replace(/\(展开\)$/, '').trim() : '',
+            useful_count: usefulEl ? firstNumber(text(usefulEl)) : 0,
+            reply_count: replyEl ? firstNumber(text(replyEl)) : 0
+        };
+        return (result.title || result.summary) ? result : null;
+    }
+
+    function totalCount() {
+        if (pageType === 'reviews') {
+            var header = document.querySelector('header.main-hd');
+            return header ? firstNumber(header.textContent) : 0;
+        }
+        var tab = document.querySelector('li.is-active');
+        if (tab && /全部\s*(\d+)/.test(tab.textContent)) {
+            return firstNumber(tab.textContent, /全部\s*(\d+)/);
+        }
+        var modHd = document.querySelector('div.mod-hd');
+        return modHd ? firstNumber(modHd.textContent) : 0;
+    }
+
+    function nextLink() {
+        var link = document.querySelector('a.next');
+        if (link) return link;
+        var paginator = document.querySelector('div.paginator');
+        var span = paginator ? paginator.querySelector('span.next') : null;
+        return span ? span.querySelector('a') : null;
+    }
+
+    var parseItem = pageType === 'reviews' ? review : comment;
+    var nodes = document.querySelectorAll(pageType === 'reviews' ? 'div.review-item' : 'div.comment-item');
+    var items = [];
+    for (var i = 0; i < nodes.length; i++) {
+        try {
+            var item = parseItem(nodes[i]);
+            if (item) items.push(item);
+        } catch (e) {
+            // 与解析器一致：单条解析出错时跳过
+        }
+    }
+
+    var next = nextLink();
+    var startMatch = href(next).match(/start=(\d+)/);
+    return JSON.stringify({
+        items: items,
+        total_count: totalCount(),
+        has_next: next !== null,
+        next_start: startMatch ? parseInt(startMatch[1], 10) : null
+    });
+})(arguments[0], arguments[1]);
+"""
+
+
+def extract_page(driver, page_type: str) -> Optional[Dict]:
+    """
+    在当前页面中提取列表数据
+
+    Args:
+        driver: 已加载列表页的浏览器driver
+        page_type: 'comments' 或 'reviews'
+
+    Returns:
+        与 DoubanParser.parse_page 相同结构的字典；脚本执行失败时返回None（调用方改用page_source）
+    """
+    try:
+        return json.loads(driver.execute_script(EXTRACT_JS, page_type, RATING_MAP))
+    except Exception as e:
+        print(f"浏览器内提取失败，改用page_source: {e}")
+        return None
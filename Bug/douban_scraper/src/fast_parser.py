@@ -0,0 +1,444 @@
+"""
+lxml解析后端 - 与 DoubanParser 相同的 parse_* 接口和输出，使用预编译的XPath代替BeautifulSoup的逐层查找
+"""
+import re
+from typing import List, Dict, Optional
+
+from lxml import etree
+
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import RATING_MAP
+from src.parser import DoubanParser, ALLSTAR_PATTERN
+
+
+def _has_class(name: str) -> str:
+    """XPath条件：class属性中包含某个类名（与BeautifulSoup按空白拆分class的匹配方式一致）"""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+def _xpath(expression: str) -> etree.XPath:
+    return etree.XPath(expression, smart_strings=False)
+
+
+# 文本节点（与BeautifulSoup的get_text一致，不包括script/style中的文本和注释）
+TEXT = _xpath(".//text()[not(parent::script) and not(parent::style)]")
+
+COMMENT_ITEMS = _xpath(f".//div[{_has_class('comment-item')}]")
+REVIEW_ITEMS = _xpath(f".//div[{_has_class('review-item')}]")
+
+COMMENT_INFO = _xpath(f"(.//span[{_has_class('comment-info')}])[1]")
+FIRST_LINK = _xpath("(.//a)[1]")
+RATING_SPANS = _xpath(".//span[contains(@class, 'allstar')]")
+COMMENT_TIME = _xpath(f"(.//span[{_has_class('comment-time')}])[1]")
+COMMENT_SHORT = _xpath(f"(.//span[{_has_class('short')}])[1]")
+COMMENT_VOTES = _xpath(f"(.//span[{_has_class('votes')}])[1]")
+
+REVIEW_AUTHOR = _xpath(f"(.//a[{_has_class('name')}])[1]")
+REVIEW_HEADING = _xpath("(.//h2)[1]")
+REVIEW_META = _xpath(f"(.//span[{_has_class('main-meta')}])[1]")
+REVIEW_SHORT = _xpath(f"(.//div[{_has_class('short-content')}])[1]")
+REVIEW_USEFUL = _xpath(f"(.//a[{_has_class('action-btn')}])[1]")
+REVIEW_REPLY = _xpath("(.//a[contains(@href, '#comments')])[1]")
+
+ACTIVE_TAB = _xpath(f"(.//li[{_has_class('is-active')}])[1]")
+MOD_HD = _xpath(f"(.//div[{_has_class('mod-hd')}])[1]")
+MAIN_HD = _xpath(f"(.//header[{_has_class('main-hd')}])[1]")
+
+NEXT_LINK = _xpath(f"(.//a[{_has_class('next')}])[1]")
+PAGINATOR = _xpath(f"(.//div[{_has_class('paginator')}])[1]")
+PAGINATOR_NEXT = _xpath(f"(.//span[{_has_class('next')}])[1]")
+
+MOVIE_TITLE = _xpath("(.//span[@property='v:itemreviewed'])[1]")
+MOVIE_RATING = _xpath(f"(.//strong[{_has_class('rating_num')}])[1]")
+MOVIE_VOTES = _xpath("(.//span[@property='v:votes'])[1]")
+MOVIE_DIRECTORS = _xpath(".//a[contains(concat(' ', normalize-space(@rel), ' '), ' v:directedBy ')]")
+MOVIE_ACTORS = _xpath(".//a[contains(concat(' ', normalize-space(@rel), ' '), ' v:starring ')]")
+MOVIE_GENRES = _xpath(".//span[@property='v:genre']")
+MOVIE_RELEASE = _xpath("(.//span[@property='v:initialReleaseDate'])[1]")
+MOVIE_SUMMARY = _xpath("(.//span[@property='v:summary'])[1]")
+
+FULL_TITLE = _xpath("(.//h1)[1]")
+FULL_AUTHOR = _xpath("(.//span[@property='v:reviewer'])[1]")
+FULL_CONTENT = _xpath(f"(.//div[{_has_class('review-content')}])[1]")
+PARAGRAPHS = _xpath(".//p")
+REPLY_BLOCK = _xpath("(.//div[@id='comments'])[1]")
+REPLY_HEADER = _xpath(f"(.//div[{_has_class('header')}])[1]")
+REPLY_TIME = _xpath(f"(.//span[{_has_class('pubtime')}])[1]")
+REPLY_QUOTE = _xpath(f"(.//*[{_has_class('reply-quote-content')}])[1]")
+REPLY_TEXT = _xpath(f"(.//*[{_has_class('comment-text')}])[1]")
+REPLY_CONTENT = _xpath(f"(.//*[{_has_class('comment-content')}])[1]")
+
+
+def _first(xpath: etree.XPath, element):
+    """XPath的第一个结果，没有则返回None"""
+    result = xpath(element)
+    return result[0] if result else None
+
+
+def _text(element, separator: str = '') -> str:
+    """等价于 BeautifulSoup 的 get_text(separator, strip=True)"""
+    return separator.join(text for text in (s.strip() for s in TEXT(element)) if text)
+
+
+def _raw_text(element) -> str:
+    """等价于 BeautifulSoup 的 get_text()"""
+    return ''.join(TEXT(element))
+
+
+class LxmlParser(DoubanParser):
+    """基于lxml的豆瓣页面解析器，输出与 DoubanParser 完全一致"""
+
+    def _root(self, html: str):
+        """解析HTML文档（空文档返回一个空的html元素，与BeautifulSoup解析空字符串的结果一致）"""
+        root = etree.HTML(html) if html and html.strip() else None
+        return root if root is not None else etree.Element('html')
+
+    def parse_movie_info(self, html: str) -> Dict:
+        root = self._root(html)
+        info = {}
+
+        title_elem = _first(MOVIE_TITLE, root)
+        info['title'] = _text(title_elem) if title_elem is not None else "未知"
+
+        rating_elem = _first(MOVIE_RATING, root)
+        info['rating'] = float(_text(rating_elem)) if rating_elem is not None else 0.0
+
+        rating_people = _first(MOVIE_VOTES, root)
+        info['votes'] = int(_text(rating_people)) if rating_people is not None else 0
+
+        info['directors'] = [_text(d) for d in MOVIE_DIRECTORS(root)]
+        info['actors'] = [_text(a) for a in MOVIE_ACTORS(root)[:10]]
+        info['genres'] = [_text(g) for g in MOVIE_GENRES(root)]
+
+        release_date = _first(MOVIE_RELEASE, root)
+        info['release_date'] = _text(release_date) if release_date is not None else "未知"
+
+        summary_elem = _first(MOVIE_SUMMARY, root)
+        info['summary'] = _text(summary_elem) if summary_elem is not None else ""
+
+        return info
+
+    def parse_comments_page(self, html: str) -> List[Dict]:
+        return self.parse_page(html, 'comments')['items']
+
+    def parse_reviews_page(self, html: str) -> List[Dict]:
+        return self.parse_page(html, 'reviews')['items']
+
+    def _rating(self, item) -> int:
+        """评分（与解析器一致：第一个class匹配 allstar\\d+ 的span）"""
+        for span in RATING_SPANS(item):
+            classes = span.get('class', '').split()
+            if not any(ALLSTAR_PATTERN.search(c) for c in classes):
+                continue
+            rating_class = [c for c in classes if c.startswith('allstar')]
+            return RATING_MAP.get(rating_class[0], 0) if rating_class else 0
+        return 0
+
+    def _parse_single_comment(self, item) -> Optional[Dict]:
+        try:
+            comment = {}
+
+            user_elem = _first(COMMENT_INFO, item)
+            user_link = _first(FIRST_LINK, user_elem) if user_elem is not None else None
+            comment['username'] = _text(user_link) if user_link is not None else "匿名"
+            comment['user_url'] = user_link.get('href', '') if user_link is not None else ""
+
+            comment['rating'] = self._rating(item)
+
+            time_elem = _first(COMMENT_TIME, item)
+            if time_elem is None:
+                comment['time'] = ""
+            else:
+                title = time_elem.get('title')
+                comment['time'] = title if title is not None else _text(time_elem)
+
+            content_elem = _first(COMMENT_SHORT, item)
+            comment['content'] = _text(content_elem) if content_elem is not None else ""
+
+            vote_elem = _first(COMMENT_VOTES, item)
+            vote_text = _text(vote_elem) if vote_elem is not None else ""
+            comment['votes'] = int(vote_text) if vote_text.isdigit() else 0
+
+            comment['comment_id'] = item.get('data-cid', '')
+
+            return comment if comment['content'] else None
+
+        except Exception as e:
+            print(f"解析评论出错: {e}")
+            return None
+
+    def _parse_single_review(self, item) -> Optional[Dict]:
+        try:
+            review = {}
+
+            user_elem = _first(REVIEW_AUTHOR, item)
+            review['username'] = _text(user_elem) if user_elem is not None else "匿名"
+            review['user_url'] = user_elem.get('href', '') if user_elem is not None else ""
+
+            title_elem = _first(REVIEW_HEADING, item)
+            title_link = _first(FIRST_LINK, title_elem) if title_elem is not None else None
+            review['title'] = _text(title_link) if title_link is not None else ""
+            review['review_url'] = title_link.get('href', '') if title_link is not None else ""
+
+            review['rating'] = self._rating(item)
+
+            time_elem = _first(REVIEW_META, item)
+            review['time'] = _text(time_elem) if time_elem is not None else ""
+
+            content_elem = _first(REVIEW_SHORT, item)
+            review['summary'] = (re.sub(r'\(展开\)$', '', _text(content_elem)).strip()
+                                 if content_elem is not None else "")
+
+            useful_elem = _first(REVIEW_USEFUL, item)
+            match = re.search(r'(\d+)', _text(useful_elem)) if useful_elem is not None else None
+            review['useful_count'] = int(match.group(1)) if match else 0
+
+            reply_elem = _first(REVIEW_REPLY, item)
+            match = re.search(r'(\d+)', _text(reply_elem)) if reply_elem is not None else None
+            review['reply_count'] = int(match.group(1)) if match else 0
+
+            return review if review['title'] or review['summary'] else None
+
+        except Exception as e:
+            print(f"解析影评出错: {e}")
+            return None
+
+    def parse_full_review(self, html: str) -> Dict:
+        root = self._root(html)
+        review = {}
+
+        title_elem = _first(FULL_TITLE, root)
+        review['title'] = _text(title_elem) if title_elem is not None else ""
+
+        author_elem = _first(FULL_AUTHOR, root)
+        review['author'] = _text(author_elem) if author_elem is not None else ""
+
+        content_elem = _first(FULL_CONTENT, root)
+        if content_elem is not None:
+            paragraphs = PARAGRAPHS(content_elem)
+            if paragraphs:
+                review['content'] = '\n'.join([_text(p) for p in paragraphs])
+            else:
+                review['content'] = _text(content_elem, '\n')
+        else:
+            review['content'] = ""
+
+        review['replies'] = self._parse_replies(root)
+
+        comments_elem = _first(REPLY_BLOCK, root)
+        next_start = None
+        if comments_elem is not None:
+            next_link = self._find_next_link(comments_elem.getparent())
+            if next_link is not None:
+                match = re.search(r'start=(\d+)', next_link.get('href', ''))
+                next_start = int(match.group(1)) if match else None
+        review['replies_next_start'] = next_start
+
+        return review
+
+    def _parse_replies(self, root) -> List[Dict]:
+        replies = []
+        comments_elem = _first(REPLY_BLOCK, root)
+        if comments_elem is None:
+            return replies
+
+        for item in COMMENT_ITEMS(comments_elem):
+            try:
+                reply = {}
+                reply['reply_id'] = item.get('data-cid', '')
+
+                header = _first(REPLY_HEADER, item)
+                author_link = _first(FIRST_LINK, header) if header is not None else None
+                reply['username'] = _text(author_link) if author_link is not None else "匿名"
+                reply['user_url'] = author_link.get('href', '') if author_link is not None else ""
+
+                time_elem = _first(REPLY_TIME, item)
+                reply['time'] = _text(time_elem) if time_elem is not None else ""
+
+                quote_elem = _first(REPLY_QUOTE, item)
+                reply['reply_to'] = _text(quote_elem) if quote_elem is not None else ""
+
+                content_elem = _first(REPLY_TEXT, item)
+                if content_elem is None:
+                    content_elem = _first(REPLY_CONTENT, item)
+                reply['content'] = _text(content_elem) if content_elem is not None else ""
+
+                if reply['content']:
+                    replies.append(reply)
+            except Exception as e:
+                print(f"解析回应出错: {e}")
+
+        return replies
+
+    def parse_page(self, html: str, page_type: str = 'comments') -> Dict:
+        root = self._root(html)
+
+        if page_type == 'reviews':
+            items = [self._parse_single_review(item) for item in REVIEW_ITEMS(root)]
+            total_count = self._count_reviews(root)
+        else:
+            items = [self._parse_single_comment(item) for item in COMMENT_ITEMS(root)]
+            total_count = self._count_comments(root)
+
+        next_link = self._find_next_link(root)
+        next_start = None
+        if next_link is not None:
+            match = re.search(r'start=(\d+)', next_link.get('href', ''))
+            if match:
+                next_start = int(match.group(1))
+
+        return {
+            'items': [item for item in items if item],
+            'total_count': total_count,
+            'has_next': next_link is not None,
+            'next_start': next_start
+        }
+
+    def get_total_comments_count(self, html: str) -> int:
+        return self._count_comments(self._root(html))
+
+    def _count_comments(self, root) -> int:
+        tab_elem = _first(ACTIVE_TAB, root)
+        if tab_elem is not None:
+            match = re.search(r'全部\s*(\d+)', _raw_text(tab_elem))
+            if match:
+                return int(match.group(1))
+
+        count_elem = _first(MOD_HD, root)
+        if count_elem is not None:
+            match = re.search(r'(\d+)', _raw_text(count_elem))
+            if match:
+                return int(match.group(1))
+
+        return 0
+
+    def get_total_reviews_count(self, html: str) -> int:
+        return self._count_reviews(self._root(html))
+
+    def _count_reviews(self, root) -> int:
+        header = _first(MAIN_HD, root)
+        if header is not None:
+            match = re.search(r'(\d+)', _raw_text(header))
+            if match:
+                return int(match.group(1))
+
+        return 0
+
+    def has_next_page(self, html: str) -> bool:
+        return self._find_next_link(self._root(html)) is not None
+
+    def _find_next_link(self, root):
+        next_link = _first(NEXT_LINK, root)
+        if next_link is not None:
+            return next_link
+
+        paginator = _first(PAGINATOR, root)
+        if paginator is not None:
+            next_btn = _first(PAGINATOR_NEXT, paginator)
+            if next_btn is not None:
+                return _first(FIRST_LINK, next_btn)
+
+        return None
+
+
+def check_parity(html: str, page_type: str) -> bool:
+    """
+    比较两个解析后端对同一页面的输出
+
+    Args:
+        html: 页面HTML内容
+        page_type: 'comments'、'reviews'、'full_review' 或 'movie_info'
+
+    Returns:
+        输出是否完全一致（包括字段顺序）
+    """
+    results = []
+    for parser in (DoubanParser(), LxmlParser()):
+        if page_type == 'full_review':
+            result = parser.parse_full_review(html)
+        elif page_type == 'movie_info':
+            try:
+                result = parser.parse_movie_info(html)
+            except ValueError as e:
+                result = repr(e)
+        else:
+            result = parser.parse_page(html, page_type)
+        results.append(repr(result))
+    return results[0] == results[1]
+
+
+# 仓库附带的页面样本（包括缺少ID、没有下一页等边界情况），不依赖本地页面缓存
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks', 'fixtures')
+
+# 样本文件名前缀 -> 页面类型（review_detail 要在 reviews 之前匹配）
+FIXTURE_TYPES = [
+    ('review_detail', 'full_review'),
+    ('reviews', 'reviews'),
+    ('comments', 'comments'),
+    ('movie', 'movie_info'),
+]
+
+
+def check_fixtures(fixture_dir: str = None) -> List[str]:
+    """
+    用页面样本比较两个解析后端的输出
+
+    Args:
+        fixture_dir: 样本目录，None时使用 benchmarks/fixtures
+
+    Returns:
+        输出不一致的样本文件名
+    """
+    fixture_dir = fixture_dir or FIXTURE_DIR
+    mismatched = []
+    for name in sorted(os.listdir(fixture_dir)):
+        page_type = next((kind for prefix, kind in FIXTURE_TYPES if name.startswith(prefix)), None)
+        if not name.endswith('.html') or page_type is None:
+            continue
+        with open(os.path.join(fixture_dir, name), 'r', encoding='utf-8') as f:
+            html = f.read()
+        if not check_parity(html, page_type):
+            mismatched.append(name)
+    return mismatched
+
+
+# 测试代码：用仓库附带的页面样本和页面缓存中的所有页面检查两个后端输出一致，并比较耗时
+if __name__ == "__main__":
+    import time
+    from src.cache import PageCache
+
+    fixture_mismatches = check_fixtures()
+    for name in fixture_mismatches:
+        print(f"样本输出不一致: {name}")
+    print(f"检查 {len(os.listdir(FIXTURE_DIR))} 个页面样本，不一致 {len(fixture_mismatches)} 个")
+
+    cache = PageCache()
+    kinds = {'/comments': 'comments', '/reviews': 'reviews', '/review/': 'full_review'}
+    timings = {'bs4': 0.0, 'lxml': 0.0}
+    checked = mismatched = 0
+
+    for url in cache.entries:
+        page_type = next((kind for marker, kind in kinds.items() if marker in url), 'movie_info')
+        html = cache.get(url)
+        if html is None:
+            continue
+        checked += 1
+        if not check_parity(html, page_type):
+            mismatched += 1
+            print(f"输出不一致: {url}")
+
+        for name, parser in (('bs4', DoubanParser()), ('lxml', LxmlParser())):
+            started = time.perf_counter()
+            if page_type in ('comments', 'reviews'):
+                parser.parse_page(html, page_type)
+            elif page_type == 'full_review':
+                parser.parse_full_review(html)
+            timings[name] += time.perf_counter() - started
+
+    print(f"检查 {checked} 个缓存页面，不一致 {mismatched} 个")
+    if timings['lxml']:
+        print(f"bs4 {timings['bs4']:.2f}s，lxml {timings['lxml']:.2f}s，加速 {timings['bs4'] / timings['lxml']:.1f}x")
+    sys.exit(1 if fixture_mismatches or mismatched else 0)
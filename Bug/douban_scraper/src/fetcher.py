@@ -0,0 +1,141 @@
+"""
+HTTP抓取器 - 使用连接池直接请求豆瓣页面
+大部分页面无需执行JavaScript，只有遇到安全验证或登录墙时才交给浏览器处理
+"""
+import json
+import os
+from typing import List, Dict, Optional
+
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+except ImportError:
+    print("请先安装依赖: pip install requests")
+    raise
+
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import USER_AGENT, COOKIE_FILE, REQUEST_TIMEOUT, HTTP_POOL_SIZE
+
+
+# 需要浏览器介入的跳转目标
+CHALLENGE_HOSTS = ('sec.douban.com', 'accounts.douban.com')
+
+# fetch() 失败原因（HttpFetcher.failure）：
+#   challenge  安全验证或登录墙（需要浏览器处理）
+#   timeout    请求超时
+#   error      429或5xx，服务端过载或限流
+#   request    连接错误、404等其他失败，与请求频率无关
+FAILURE_REASONS = ('challenge', 'timeout', 'error', 'request')
+
+
+class HttpFetcher:
+    """基于requests连接池的页面抓取器"""
+
+    def __init__(self, pool_size: int = None):
+        """
+        初始化抓取器
+
+        Args:
+            pool_size: 连接池大小，None时使用配置文件设置
+        """
+        pool_size = pool_size or HTTP_POOL_SIZE
+        # 最近一次 fetch() 的失败原因（见 FAILURE_REASONS），成功时为None
+        self.failure = None
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update({
+            'User-Agent': USER_AGENT,
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+            'Accept-Language': 'zh-CN,zh;q=0.9,en;q=0.8',
+            'Referer': 'https://movie.douban.com/',
+        })
+
+    def load_cookies(self, cookies: List[Dict] = None) -> bool:
+        """
+        加载Cookie到会话
+
+        Args:
+            cookies: Selenium格式的Cookie列表，None时从COOKIE_FILE读取
+
+        Returns:
+            是否成功加载
+        """
+        if cookies is None:
+            if not os.path.exists(COOKIE_FILE):
+                return False
+            try:
+                with open(COOKIE_FILE, 'r', encoding='utf-8') as f:
+                    cookies = json.load(f)
+            except Exception as e:
+                print(f"加载Cookie失败: {e}")
+                return False
+
+        for cookie in cookies:
+            self.session.cookies.set(
+                cookie['name'],
+                cookie['value'],
+                domain=cookie.get('domain', ''),
+                path=cookie.get('path', '/')
+            )
+        return True
+
+    def needs_browser(self, response) -> bool:
+        """
+        判断响应是否是安全验证或登录墙
+
+        Args:
+            response: requests响应对象
+
+        Returns:
+            是否需要交给浏览器处理
+        """
+        urls = [r.headers.get('Location', '') for r in response.history] + [response.url]
+        if any(host in url for url in urls for host in CHALLENGE_HOSTS):
+            return True
+
+        # 403通常是被判定为异常请求
+        return response.status_code == 403
+
+    def fetch(self, url: str) -> Optional[str]:
+        """
+        获取页面内容
+
+        Args:
+            url: 页面URL
+
+        Returns:
+            页面HTML内容；需要浏览器处理或请求失败时返回None，失败原因记录在 self.failure
+        """
+        self.failure = None
+        try:
+            response = self.session.get(url, timeout=REQUEST_TIMEOUT)
+        except requests.Timeout as e:
+            print(f"HTTP请求超时: {e}")
+            self.failure = 'timeout'
+            return None
+        except requests.RequestException as e:
+            print(f"HTTP请求失败: {e}")
+            self.failure = 'request'
+            return None
+
+        if self.needs_browser(response):
+            print("\n⚠️  HTTP请求遇到安全验证或登录墙，切换到浏览器...")
+            self.failure = 'challenge'
+            return None
+
+        if response.status_code != 200:
+            print(f"HTTP状态码异常 ({response.status_code}): {url}")
+            self.failure = 'error' if response.status_code == 429 or response.status_code >= 500 else 'request'
+            return None
+
+        response.encoding = response.encoding or 'utf-8'
+        return response.text
+
+    def close(self):
+        """关闭会话，释放连接池"""
+        self.session.close()
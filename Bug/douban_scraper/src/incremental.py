@@ -0,0 +1,67 @@
+"""
+已知条目索引 - 记录历次爬取得到的短评ID和影评URL，用于增量爬取
+"""
+import json
+import os
+from typing import Iterable, Set
+
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import KNOWN_INDEX_FILE
+
+
+class KnownIndex:
+    """已知条目索引（按电影ID分组）"""
+
+    def __init__(self, movie_id: str, path: str = None):
+        """
+        初始化索引
+
+        Args:
+            movie_id: 电影ID
+            path: 索引文件路径，None时使用配置文件设置
+        """
+        self.movie_id = movie_id
+        self.path = path or KNOWN_INDEX_FILE
+        self.data = {}
+
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self.data = json.load(f)
+            except Exception as e:
+                print(f"读取已知条目索引失败: {e}")
+
+    def ids(self, kind: str) -> Set[str]:
+        """
+        获取某类数据的已知ID
+
+        Args:
+            kind: 'comments' 或 'reviews'
+
+        Returns:
+            已知ID集合
+        """
+        return set(self.data.get(self.movie_id, {}).get(kind, []))
+
+    def update(self, kind: str, ids: Iterable[str]):
+        """
+        合并新的ID到索引
+
+        Args:
+            kind: 'comments' 或 'reviews'
+            ids: 条目ID
+        """
+        movie = self.data.setdefault(self.movie_id, {})
+        known = set(movie.get(kind, []))
+        known.update(str(i) for i in ids if i)
+        movie[kind] = sorted(known)
+
+    def save(self):
+        """原子写入索引文件"""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.data, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
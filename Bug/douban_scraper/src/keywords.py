@@ -0,0 +1,186 @@
+"""
+关键词统计 - 在有限的样本上提取关键词，关键词较多时用Aho-Corasick自动机一次扫描统计所有关键词的出现次数
+"""
+from collections import Counter, deque
+from typing import Dict, Iterable, List, Sequence
+
+try:
+    # 可选：C实现的Aho-Corasick自动机，未安装时使用纯Python实现，结果相同
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# 关键词数达到该值时使用自动机；更少的关键词逐个用 str.count 统计更快（C实现的字符串查找）。
+# 纯Python实现的自动机逐字符扫描较慢，关键词更多时才划算
+AUTOMATON_MIN_KEYWORDS = 64 if ahocorasick else 200
+
+
+def sample_texts(texts: Sequence[str], max_chars: int) -> List[str]:
+    """
+    抽取总长度不超过上限的文本样本，用于关键词提取
+
+    总长度不超过上限时返回全部文本；否则按固定间隔等距抽取，结果可复现且覆盖整个数据集
+
+    Args:
+        texts: 文本列表
+        max_chars: 样本总字符数上限（0表示不限制）
+
+    Returns:
+        文本样本（保持原有顺序）
+    """
+    total = sum(len(text) for text in texts)
+    if not max_chars or total <= max_chars:
+        return list(texts)
+    step = -(-total // max_chars)
+    sample = []
+    size = 0
+    for text in texts[::step]:
+        if size + len(text) > max_chars and sample:
+            break
+        sample.append(text)
+        size += len(text)
+    return sample
+
+
+class KeywordCounter:
+    """多关键词计数器
+
+    关键词较多时每段文本只用自动机扫描一次，得到每个关键词的出现次数，与 text.count(keyword) 相同
+    （同一关键词的匹配互不重叠、从左到右计数，不同关键词之间可以重叠）；
+    关键词少于 AUTOMATON_MIN_KEYWORDS 个时逐个调用 str.count
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        """
+        构建自动机
+
+        Args:
+            keywords: 关键词（忽略空字符串；重复出现的关键词只匹配一次，计数时按重复次数累加）
+        """
+        self.weights = Counter(keyword for keyword in keywords if keyword)
+        self.keywords = list(self.weights)
+        self.lengths = [len(keyword) for keyword in self.keywords]
+        self.use_automaton = len(self.keywords) >= AUTOMATON_MIN_KEYWORDS
+
+        if not self.use_automaton:
+            return
+        if ahocorasick:
+            self._automaton = ahocorasick.Automaton()
+            for index, keyword in enumerate(self.keywords):
+                self._automaton.add_word(keyword, index)
+            if self.keywords:
+                self._automaton.make_automaton()
+        else:
+            self._build()
+
+    def _build(self):
+        """构建纯Python的Aho-Corasick自动机（goto表、失败指针、输出表）"""
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail = [0]
+        self._output: List[List[int]] = [[]]
+
+        for index, keyword in enumerate(self.keywords):
+            state = 0
+            for char in keyword:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                state = next_state
+            self._output[state].append(index)
+
+        # 按层次遍历计算失败指针，并把失败状态的输出并入当前状态
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def _matches(self, text: str):
+        """依次产生所有匹配的 (结束位置, 关键词序号)，包括相互重叠的匹配"""
+        if ahocorasick:
+            yield from self._automaton.iter(text)
+            return
+
+        goto, fail, output = self._goto, self._fail, self._output
+        state = 0
+        for end, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for index in output[state]:
+                yield end, index
+
+    def _count_matches(self, text: str) -> Dict[int, int]:
+        """统计一段文本中出现过的关键词（关键词序号 -> 次数），只为找到的关键词分配计数"""
+        if not self.use_automaton:
+            return {index: text.count(keyword) for index, keyword in enumerate(self.keywords) if keyword in text}
+
+        counts: Dict[int, int] = {}
+        # 每个关键词上一次计数的匹配结束位置，与之重叠的匹配不计数
+        last_end: Dict[int, int] = {}
+        lengths = self.lengths
+        for end, index in self._matches(text):
+            if end - lengths[index] >= last_end.get(index, -1):
+                counts[index] = counts.get(index, 0) + 1
+                last_end[index] = end
+        return counts
+
+    def count(self, text: str) -> List[int]:
+        """
+        统计一段文本中每个关键词的出现次数
+
+        Args:
+            text: 文本
+
+        Returns:
+            与 self.keywords 顺序对应的次数列表，等于 [text.count(keyword) for keyword in self.keywords]
+        """
+        counts = [0] * len(self.keywords)
+        if self.keywords:
+            for index, count in self._count_matches(text).items():
+                counts[index] = count
+        return counts
+
+    def count_all(self, texts: Iterable[str]) -> Counter:
+        """
+        统计所有文本中每个关键词的出现总次数
+
+        关键词在Counter中的先后顺序与逐条文本、逐个关键词累加时相同
+        （先按首次出现的文本，再按关键词顺序），most_common 对次数相同的关键词排序一致
+
+        Args:
+            texts: 文本
+
+        Returns:
+            关键词 -> 出现次数（只包含出现过的关键词）
+        """
+        totals: Dict[int, int] = {}
+        first_seen = {}
+        if self.keywords:
+            for position, text in enumerate(texts):
+                for index, count in self._count_matches(text).items():
+                    totals[index] = totals.get(index, 0) + count
+                    first_seen.setdefault(index, position)
+
+        order = sorted(first_seen, key=lambda index: (first_seen[index], index))
+        return Counter({
+            self.keywords[index]: totals[index] * self.weights[self.keywords[index]] for index in order
+        })
+
+
+# 测试代码
+if __name__ == "__main__":
+    texts = ["这部电影太好看了，好看好看", "剧情一般，演员不错", "aaaa 电影院"]
+    keywords = ["好看", "电影", "电影院", "aa", "演员"]
+    counter = KeywordCounter(keywords)
+    print(counter.count_all(texts))
+    print(all(counter.count(text) == [text.count(keyword) for keyword in counter.keywords] for text in texts))
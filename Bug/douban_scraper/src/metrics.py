@@ -0,0 +1,231 @@
+"""
+爬取指标 - 记录每次页面请求和每页解析的耗时，输出JSONL明细、Prometheus文本格式和运行摘要
+"""
+import json
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+from typing import Dict
+
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import LOG_FILE, LOG_LEVEL, METRICS_FILE, METRICS_PROM_FILE
+
+logger = logging.getLogger('douban_scraper')
+
+
+def setup_logging(log_file: str = None, level: str = None):
+    """
+    配置日志文件（指标明细以DEBUG级别、运行摘要以INFO级别写入）
+
+    Args:
+        log_file: 日志文件路径，None时使用配置文件设置
+        level: 日志级别，None时使用配置文件设置
+    """
+    if logger.handlers:
+        return
+    log_file = log_file or LOG_FILE
+    os.makedirs(os.path.dirname(log_file), exist_ok=True)
+    handler = logging.FileHandler(log_file, encoding='utf-8')
+    handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(message)s'))
+    logger.addHandler(handler)
+    logger.setLevel(level or LOG_LEVEL)
+
+
+class CrawlMetrics:
+    """爬取指标收集器（线程安全，浏览器池的worker共用一个实例）
+
+    每条记录追加到 METRICS_FILE（JSONL），带有本次运行的 run_id（启动时间和进程号），event 为:
+        fetch   一次页面获取: source、ok、navigation_s、wait_s、delay_s、page_bytes、retries、challenge
+        parse   一页解析: kind、items、new_items、parse_s
+    结束时汇总写入 METRICS_PROM_FILE（Prometheus文本格式）
+    """
+
+    def __init__(self, metrics_file: str = None, prom_file: str = None):
+        """
+        初始化指标收集器
+
+        Args:
+            metrics_file: JSONL明细文件路径，None时使用配置文件设置
+            prom_file: Prometheus文本格式文件路径，None时使用配置文件设置
+        """
+        self.metrics_file = metrics_file or METRICS_FILE
+        self.prom_file = prom_file or METRICS_PROM_FILE
+        self.started_at = time.time()
+        # 明细文件跨运行追加，用 run_id 区分每次运行的记录
+        self.run_id = f"{time.strftime('%Y%m%d-%H%M%S', time.localtime(self.started_at))}-{os.getpid()}"
+        self._file = None
+        self._lock = threading.Lock()
+        self.fetches = defaultdict(int)     # (source, status) -> 次数
+        self.fetch_totals = defaultdict(float)
+        self.pages = defaultdict(int)       # kind -> 页数
+        self.items = defaultdict(int)       # kind -> 条目数
+        self.parse_seconds = defaultdict(float)
+
+    def _write(self, event: Dict):
+        """追加一条明细（调用方需持有锁）"""
+        if self._file is None:
+            os.makedirs(os.path.dirname(self.metrics_file), exist_ok=True)
+            self._file = open(self.metrics_file, 'a', encoding='utf-8')
+        line = json.dumps({'run_id': self.run_id, **event}, ensure_ascii=False)
+        self._file.write(line + '\n')
+        self._file.flush()
+        logger.debug(line)
+
+    def record_fetch(self, url: str, source: str, ok: bool, navigation: float = 0.0,
+                     wait: float = 0.0, delay: float = 0.0, page_bytes: int = 0,
+                     retries: int = 0, challenge: bool = False):
+        """
+        记录一次页面获取
+
+        Args:
+            url: 页面URL
+            source: 获取方式（browser/http/cache）
+            ok: 是否获取成功
+            navigation: 导航耗时（driver.get 或 HTTP请求，秒）
+            wait: 等待页面元素的耗时（秒）
+            delay: 节流等待耗时（秒）
+            page_bytes: page_source 大小（字节）
+            retries: 本次是第几次重试（0表示首次请求）
+            challenge: 是否遇到安全验证
+        """
+        event = {
+            'event': 'fetch', 'ts': round(time.time(), 3), 'url': url, 'source': source, 'ok': ok,
+            'navigation_s': round(navigation, 3), 'wait_s': round(wait, 3), 'delay_s': round(delay, 3),
+            'page_bytes': page_bytes, 'retries': retries, 'challenge': challenge
+        }
+        with self._lock:
+            self.fetches[(source, 'ok' if ok else 'failed')] += 1
+            self.fetch_totals['navigation_seconds'] += navigation
+            self.fetch_totals['wait_seconds'] += wait
+            self.fetch_totals['delay_seconds'] += delay
+            self.fetch_totals['page_bytes'] += page_bytes
+            # 每次重试都会单独记录一条，retries>0 的记录即为一次重试
+            self.fetch_totals['retries'] += int(retries > 0)
+            self.fetch_totals['challenges'] += int(challenge)
+            self._write(event)
+
+    def record_parse(self, kind: str, url: str, items: int, new_items: int, parse_time: float):
+        """
+        记录一页解析
+
+        Args:
+            kind: 页面类型（comments/reviews/full_reviews/movie_info）
+            url: 页面URL
+            items: 解析出的条目数
+            new_items: 去重后新增的条目数
+            parse_time: 解析耗时（秒）
+        """
+        event = {
+            'event': 'parse', 'ts': round(time.time(), 3), 'kind': kind, 'url': url,
+            'items': items, 'new_items': new_items, 'parse_s': round(parse_time, 4)
+        }
+        with self._lock:
+            self.pages[kind] += 1
+            self.items[kind] += items
+            self.parse_seconds[kind] += parse_time
+            self._write(event)
+
+    def summary(self) -> Dict:
+        """
+        汇总本次运行的指标
+
+        Returns:
+            摘要字典
+        """
+        with self._lock:
+            requests = sum(self.fetches.values())
+            pages = sum(self.pages.values())
+            return {
+                'run_id': self.run_id,
+                'elapsed_s': round(time.time() - self.started_at, 1),
+                'requests': requests,
+                'by_source': {f'{source}/{status}': count for (source, status), count in self.fetches.items()},
+                'failed': sum(count for (_, status), count in self.fetches.items() if status == 'failed'),
+                'retries': int(self.fetch_totals['retries']),
+                'challenges': int(self.fetch_totals['challenges']),
+                'navigation_s': round(self.fetch_totals['navigation_seconds'], 1),
+                'wait_s': round(self.fetch_totals['wait_seconds'], 1),
+                'delay_s': round(self.fetch_totals['delay_seconds'], 1),
+                'parse_s': round(sum(self.parse_seconds.values()), 2),
+                'avg_page_kb': round(self.fetch_totals['page_bytes'] / requests / 1024, 1) if requests else 0,
+                'pages': pages,
+                'avg_items_per_page': round(sum(self.items.values()) / pages, 1) if pages else 0
+            }
+
+    def print_summary(self):
+        """打印运行摘要"""
+        summary = self.summary()
+        if not summary['requests'] and not summary['pages']:
+            return
+
+        print("\n" + "-"*50)
+        print("📊 爬取指标")
+        print("-"*50)
+        print(f"总耗时: {summary['elapsed_s']}s，请求 {summary['requests']} 次，失败 {summary['failed']}，"
+              f"重试 {summary['retries']}，安全验证 {summary['challenges']}")
+        print(f"请求来源: {summary['by_source']}")
+        print(f"时间分布: 导航 {summary['navigation_s']}s，等待元素 {summary['wait_s']}s，"
+              f"节流 {summary['delay_s']}s，解析 {summary['parse_s']}s")
+        print(f"平均页面大小: {summary['avg_page_kb']}KB，解析 {summary['pages']} 页，"
+              f"平均每页 {summary['avg_items_per_page']} 条")
+        print(f"明细: {self.metrics_file}（run_id={summary['run_id']}）")
+        logger.info("爬取指标摘要: %s", json.dumps(summary, ensure_ascii=False))
+
+    def write_prometheus(self):
+        """把累计指标写成Prometheus文本格式（可由node_exporter的textfile收集器读取）"""
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {kind}')
+            for labels, value in samples:
+                label_text = ','.join(f'{key}="{val}"' for key, val in labels.items())
+                lines.append(f'{name}{{{label_text}}} {value}' if label_text else f'{name} {value}')
+
+        with self._lock:
+            metric('douban_fetch_requests_total', 'counter', '页面获取次数',
+                   [({'source': source, 'status': status}, count)
+                    for (source, status), count in sorted(self.fetches.items())])
+            for key, help_text in (('navigation_seconds', '导航耗时'), ('wait_seconds', '等待页面元素耗时'),
+                                   ('delay_seconds', '节流等待耗时'), ('page_bytes', '页面大小（字节）'),
+                                   ('retries', '重试次数'), ('challenges', '安全验证次数')):
+                metric(f'douban_fetch_{key}_total', 'counter', help_text,
+                       [({}, round(self.fetch_totals[key], 3))])
+            metric('douban_parse_pages_total', 'counter', '解析页数',
+                   [({'kind': kind}, count) for kind, count in sorted(self.pages.items())])
+            metric('douban_parse_items_total', 'counter', '解析出的条目数',
+                   [({'kind': kind}, count) for kind, count in sorted(self.items.items())])
+            metric('douban_parse_seconds_total', 'counter', '解析耗时',
+                   [({'kind': kind}, round(seconds, 4)) for kind, seconds in sorted(self.parse_seconds.items())])
+
+        os.makedirs(os.path.dirname(self.prom_file), exist_ok=True)
+        tmp_path = self.prom_file + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+        os.replace(tmp_path, self.prom_file)
+
+    def close(self):
+        """写出Prometheus文件、打印摘要并关闭明细文件"""
+        self.write_prometheus()
+        self.print_summary()
+        with self._lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+
+
+# 测试代码
+if __name__ == "__main__":
+    import tempfile
+
+    tmp_dir = tempfile.mkdtemp()
+    metrics = CrawlMetrics(os.path.join(tmp_dir, 'metrics.jsonl'), os.path.join(tmp_dir, 'metrics.prom'))
+    metrics.record_fetch('https://movie.douban.com/subject/1/comments?start=0', 'browser', True,
+                         navigation=1.2, wait=0.3, delay=5.0, page_bytes=90000)
+    metrics.record_parse('comments', 'https://movie.douban.com/subject/1/comments?start=0', 20, 20, 0.05)
+    metrics.close()
+    print(open(metrics.prom_file, encoding='utf-8').read())
@@ -0,0 +1,178 @@
+"""
+解析进程池 - 获取与解析分离：获取线程把原始HTML放入有界队列，多个解析进程并行解析，结果按页顺序返回
+"""
+import multiprocessing
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, Future
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import PARSE_QUEUE_SIZE
+from src.parser import create_parser
+
+# 解析进程中的解析器（每个进程创建一次）
+_worker_parser = None
+
+# 获取线程结束的标记
+_DONE = object()
+
+
+def _init_worker(backend: Optional[str]):
+    """解析进程初始化"""
+    global _worker_parser
+    _worker_parser = create_parser(backend)
+
+
+def _parse_in_worker(html: str, page_type: str) -> Tuple[Dict, float]:
+    """在解析进程中解析一个列表页，返回 (parse_page 结果, 解析耗时)"""
+    started = time.monotonic()
+    result = _worker_parser.parse_page(html, page_type)
+    return result, time.monotonic() - started
+
+
+def _is_last_page(result: Optional[Dict]) -> bool:
+    """页面是否为最后一页（没有条目或没有下一页）；获取失败的页面不算"""
+    return result is not None and (not result['items'] or not result['has_next'])
+
+
+class ParsePool:
+    """列表页解析进程池
+
+    单线程爬取时浏览器要等当前页解析完才去获取下一页，解析还要和tqdm、pandas争抢GIL；
+    解析进程池把获取放到单独的线程中，获取到的页面立即提交给解析进程，主线程按页顺序取回结果。
+    队列满（解析跟不上或主线程还在处理前面的页）时获取线程阻塞，最多领先 queue_size 页
+    """
+
+    def __init__(self, workers: int, backend: str = None, queue_size: int = None):
+        """
+        初始化解析进程池
+
+        Args:
+            workers: 解析进程数量
+            backend: 解析后端（"bs4" 或 "lxml"），None时使用配置文件设置
+            queue_size: 获取线程最多领先的页数，None时使用配置文件设置
+        """
+        self.workers = workers
+        self.backend = backend
+        self.queue_size = queue_size or PARSE_QUEUE_SIZE
+        self._executor = None
+
+    def start(self):
+        """启动解析进程（spawn方式：获取线程和浏览器池线程运行时fork进程并不安全）"""
+        if not self._executor:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker,
+                initargs=(self.backend,)
+            )
+
+    def stop(self):
+        """停止解析进程"""
+        if self._executor:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def parse_ordered(self, pages: Iterable[Tuple[object, object]],
+                      page_type: str) -> Iterator[Tuple[object, object, Optional[Dict], float]]:
+        """
+        在后台线程中迭代获取页面，并行解析，按输入顺序逐个返回
+
+        获取线程持续获取，最多领先 queue_size 页；按顺序取回的页面是最后一页（没有条目或没有下一页）时
+        返回这一页后结束迭代，并通知获取线程不再获取。调用方提前停止迭代时同样通知获取线程，
+        获取线程在当前页完成后停止，返回前会等它退出，不会有两个线程同时使用同一个浏览器；
+        排队中的解析任务被取消
+
+        Args:
+            pages: (key, page) 序列（可以是惰性生成器），page为HTML、浏览器内提取的字典或None（获取失败）
+            page_type: 'comments' 或 'reviews'
+
+        Yields:
+            (key, page, result, parse_time) 元组，获取失败时result为None
+        """
+        self.start()
+        slots = queue.Queue(maxsize=self.queue_size)
+        stopping = threading.Event()
+
+        def put(item) -> bool:
+            # 队列满时阻塞，但要能响应调用方的停止
+            while not stopping.is_set():
+                try:
+                    slots.put(item, timeout=0.5)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def produce():
+            try:
+                iterator = iter(pages)
+                while not stopping.is_set():
+                    try:
+                        key, page = next(iterator)
+                    except StopIteration:
+                        break
+                    future = None
+                    if page and not isinstance(page, dict):
+                        future = self._executor.submit(_parse_in_worker, page, page_type)
+                    if not put((key, page, future)) or stopping.is_set():
+                        if future:
+                            future.cancel()
+                        break
+            except Exception as e:
+                put(e)
+            finally:
+                close = getattr(pages, 'close', None)
+                if close:
+                    close()
+                put(_DONE)
+
+        thread = threading.Thread(target=produce, name='page-fetcher', daemon=True)
+        thread.start()
+        try:
+            while True:
+                item = slots.get()
+                if item is _DONE:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+
+                key, page, future = item
+                if future is not None:
+                    result, parse_time = future.result()
+                else:
+                    # 获取失败，或浏览器内提取模式下已经是解析结果
+                    result, parse_time = (page or None), 0.0
+                last = _is_last_page(result)
+                if last:
+                    # 不再获取后面的页面，调用方处理完这一页就结束
+                    stopping.set()
+                yield key, page, result, parse_time
+                if last:
+                    return
+        finally:
+            stopping.set()
+            # 获取线程可能还在获取当前页，等它退出后调用方才能继续使用浏览器
+            thread.join()
+            while True:
+                try:
+                    item = slots.get_nowait()
+                except queue.Empty:
+                    break
+                if isinstance(item, tuple) and item[2] is not None:
+                    item[2].cancel()
+
+
+# 测试代码
+if __name__ == "__main__":
+    html = ('<div class="comment-item" data-cid="1"><span class="short">测试</span></div>'
+            '<a class="next" href="?start=20">后页</a>')
+    parse_pool = ParsePool(2)
+    for start, _, result, parse_time in parse_pool.parse_ordered(((i * 20, html) for i in range(5)), 'comments'):
+        print(start, len(result['items']), f"{parse_time * 1000:.1f}ms")
+    parse_pool.stop()
@@ -9,7 +9,13 @@ import os
 
 # 添加父目录到路径
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from config.settings import RATING_MAP
+from config.settings import RATING_MAP, PARSER_BACKEND
+
+# 评分span的class（预编译，避免每条评论重复编译）
+ALLSTAR_PATTERN = re.compile(r'allstar\d+')
+
+# 可选的解析后端
+PARSER_BACKENDS = ('bs4', 'lxml')
 
 
 class DoubanParser:
@@ -112,7 +118,7 @@ class DoubanParser:
                 comment['user_url'] = ""
             
             # 评分
-            rating_span = item.find('span', class_=re.compile(r'allstar\d+'))
+            rating_span = item.find('span', class_=ALLSTAR_PATTERN)
             if rating_span:
                 rating_class = [c for c in rating_span.get('class', []) if c.startswith('allstar')]
                 if rating_class:
@@ -200,7 +206,7 @@ class DoubanParser:
                 review['review_url'] = ""
             
             # 评分
-            rating_span = item.find('span', class_=re.compile(r'allstar\d+'))
+            rating_span = item.find('span', class_=ALLSTAR_PATTERN)
             if rating_span:
                 rating_class = [c for c in rating_span.get('class', []) if c.startswith('allstar')]
                 if rating_class:
@@ -274,12 +280,122 @@ class DoubanParser:
         if content_elem:
             # 获取所有段落
             paragraphs = content_elem.find_all('p')
-            review['content'] = '\n'.join([p.get_text(strip=True) for p in paragraphs])
+            if paragraphs:
+                review['content'] = '\n'.join([p.get_text(strip=True) for p in paragraphs])
+            else:
+                # 部分影评正文没有<p>分段，直接按换行取文本
+                review['content'] = content_elem.get_text('\n', strip=True)
         else:
             review['content'] = ""
         
+        # 回应
+        review['replies'] = self._parse_replies(soup)
+        
+        # 回应分页（每页100条，后续页为 ?start=100#comments）
+        comments_elem = soup.find('div', id='comments')
+        next_start = None
+        if comments_elem:
+            next_link = self._find_next_link(comments_elem.parent)
+            if next_link:
+                match = re.search(r'start=(\d+)', next_link.get('href', ''))
+                next_start = int(match.group(1)) if match else None
+        review['replies_next_start'] = next_start
+        
         return review
     
+    def parse_review_replies(self, html: str) -> Dict:
+        """
+        解析影评回应分页（影评详情页的第2页及之后）
+        
+        Args:
+            html: 影评详情页面HTML内容
+            
+        Returns:
+            包含 replies（回应列表）和 replies_next_start（下一页偏移）的字典
+        """
+        review = self.parse_full_review(html)
+        return {
+            'replies': review['replies'],
+            'replies_next_start': review['replies_next_start']
+        }
+    
+    def _parse_replies(self, soup) -> List[Dict]:
+        """
+        解析影评详情页中的回应列表
+        
+        Args:
+            soup: 已解析的影评详情页
+            
+        Returns:
+            回应列表
+        """
+        replies = []
+        comments_elem = soup.find('div', id='comments')
+        if not comments_elem:
+            return replies
+        
+        for item in comments_elem.find_all('div', class_='comment-item'):
+            try:
+                reply = {}
+                reply['reply_id'] = item.get('data-cid', '')
+                
+                header = item.find('div', class_='header')
+                author_link = header.find('a') if header else None
+                reply['username'] = author_link.get_text(strip=True) if author_link else "匿名"
+                reply['user_url'] = author_link.get('href', '') if author_link else ""
+                
+                time_elem = item.find('span', class_='pubtime')
+                reply['time'] = time_elem.get_text(strip=True) if time_elem else ""
+                
+                # 引用的上一条回应
+                quote_elem = item.find(class_='reply-quote-content')
+                reply['reply_to'] = quote_elem.get_text(strip=True) if quote_elem else ""
+                
+                content_elem = item.find(class_='comment-text') or item.find(class_='comment-content')
+                reply['content'] = content_elem.get_text(strip=True) if content_elem else ""
+                
+                if reply['content']:
+                    replies.append(reply)
+            except Exception as e:
+                print(f"解析回应出错: {e}")
+        
+        return replies
+    
+    def parse_page(self, html: str, page_type: str = 'comments') -> Dict:
+        """
+        解析列表页面（短评或长评），整个文档只解析一次
+        
+        Args:
+            html: 列表页面HTML内容
+            page_type: 页面类型，'comments' 或 'reviews'
+            
+        Returns:
+            包含 items（条目列表）、total_count（总数）、
+            has_next（是否有下一页）、next_start（下一页偏移，无则为None）的字典
+        """
+        soup = BeautifulSoup(html, 'lxml')
+        
+        if page_type == 'reviews':
+            items = [self._parse_single_review(item) for item in soup.find_all('div', class_='review-item')]
+            total_count = self._count_reviews(soup)
+        else:
+            items = [self._parse_single_comment(item) for item in soup.find_all('div', class_='comment-item')]
+            total_count = self._count_comments(soup)
+        
+        next_link = self._find_next_link(soup)
+        next_start = None
+        if next_link:
+            match = re.search(r'start=(\d+)', next_link.get('href', ''))
+            if match:
+                next_start = int(match.group(1))
+        
+        return {
+            'items': [item for item in items if item],
+            'total_count': total_count,
+            'has_next': next_link is not None,
+            'next_start': next_start
+        }
+    
     def get_total_comments_count(self, html: str) -> int:
         """
         获取短评总数
@@ -290,8 +406,10 @@ class DoubanParser:
         Returns:
             评论总数
         """
-        soup = BeautifulSoup(html, 'lxml')
-        
+        return self._count_comments(BeautifulSoup(html, 'lxml'))
+    
+    def _count_comments(self, soup) -> int:
+        """从已解析的短评页面中获取短评总数"""
         # 尝试从标签页获取
         tab_elem = soup.find('li', class_='is-active')
         if tab_elem:
@@ -320,8 +438,10 @@ class DoubanParser:
         Returns:
             影评总数
         """
-        soup = BeautifulSoup(html, 'lxml')
-        
+        return self._count_reviews(BeautifulSoup(html, 'lxml'))
+    
+    def _count_reviews(self, soup) -> int:
+        """从已解析的长评页面中获取影评总数"""
         header = soup.find('header', class_='main-hd')
         if header:
             text = header.get_text()
@@ -341,24 +461,45 @@ class DoubanParser:
         Returns:
             是否有下一页
         """
-        soup = BeautifulSoup(html, 'lxml')
-        
+        return self._find_next_link(BeautifulSoup(html, 'lxml')) is not None
+    
+    def _find_next_link(self, soup):
+        """在已解析的页面中查找下一页链接，没有则返回None"""
         # 查找下一页链接
         next_link = soup.find('a', class_='next')
         if next_link:
-            return True
+            return next_link
         
         # 检查分页器
         paginator = soup.find('div', class_='paginator')
         if paginator:
             next_btn = paginator.find('span', class_='next')
             if next_btn and next_btn.find('a'):
-                return True
+                return next_btn.find('a')
         
-        return False
+        return None
+
+
+def create_parser(backend: str = None) -> DoubanParser:
+    """
+    创建页面解析器
+
+    Args:
+        backend: 解析后端，'bs4'（BeautifulSoup）或 'lxml'（预编译XPath，速度更快），None时使用配置文件设置
+
+    Returns:
+        解析器实例，两种后端的 parse_* 接口和输出完全一致
+    """
+    backend = backend or PARSER_BACKEND
+    if backend == 'lxml':
+        from src.fast_parser import LxmlParser
+        return LxmlParser()
+    if backend not in PARSER_BACKENDS:
+        raise ValueError(f"未知的解析后端: {backend}")
+    return DoubanParser()
 
 
 # 测试代码
 if __name__ == "__main__":
-    parser = DoubanParser()
+    parser = create_parser()
     print("Parser模块加载成功")
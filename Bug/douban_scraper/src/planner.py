@@ -0,0 +1,130 @@
+"""
+多维度爬取计划 - 豆瓣对单一排序的短评只提供有限页数，按 状态 × 排序 × 评分段 分别翻页以覆盖更多短评
+"""
+from typing import Dict, List, Optional, Tuple
+
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import (
+    COMMENTS_FACET_URL_TEMPLATE, COMMENT_FACETS, COMMENTS_PER_PAGE, FACET_STALE_PAGES
+)
+
+
+def facet_key(facet: Dict) -> str:
+    """维度的唯一标识，例如 P/new_score/h"""
+    return f"{facet['status']}/{facet['sort']}/{facet.get('percent_type', '')}"
+
+
+class FacetPlanner:
+    """多维度爬取计划
+
+    每个维度各自翻页，同一时刻每个维度最多有一个页面在途（下一页是否需要取决于这一页的结果）；
+    某个维度出现空页、没有下一页、达到最大页数，或连续 stale_pages 页都没有新短评时停止该维度，
+    后加入的维度与已爬取维度高度重叠时很快就会停止
+    """
+
+    def __init__(self, movie_id: str, facets: List[Dict] = None, max_pages: int = None,
+                 stale_pages: int = None, saved: Dict = None):
+        """
+        初始化爬取计划
+
+        Args:
+            movie_id: 电影ID
+            facets: 维度列表（status、sort、percent_type），None时使用配置文件设置
+            max_pages: 每个维度的最大页数，None表示不限制
+            stale_pages: 连续多少页没有新短评时停止该维度，None时使用配置文件设置
+            saved: 上次中断时保存的进度（snapshot() 的返回值）
+        """
+        self.movie_id = movie_id
+        self.max_pages = max_pages
+        self.stale_pages = stale_pages or FACET_STALE_PAGES
+        self.facets = {}
+        saved = saved or {}
+
+        for facet in (facets or COMMENT_FACETS):
+            key = facet_key(facet)
+            progress = saved.get(key, {})
+            self.facets[key] = {
+                'facet': facet,
+                'start': progress.get('start', 0),
+                'pages': progress.get('pages', 0),
+                'stale': progress.get('stale', 0),
+                'done': progress.get('done', False),
+                'in_flight': False
+            }
+
+    def url(self, key: str, start: int) -> str:
+        """某个维度某一页的URL"""
+        facet = self.facets[key]['facet']
+        return COMMENTS_FACET_URL_TEMPLATE.format(
+            movie_id=self.movie_id, start=start, status=facet['status'],
+            sort=facet['sort'], percent_type=facet.get('percent_type', '')
+        )
+
+    def ready(self) -> List[str]:
+        """可以请求下一页的维度（未结束且没有在途页面），按配置顺序"""
+        return [key for key, state in self.facets.items() if not state['done'] and not state['in_flight']]
+
+    def take(self, key: str) -> Tuple[int, str]:
+        """
+        领取某个维度的下一页
+
+        Args:
+            key: 维度标识
+
+        Returns:
+            (start, url) 元组
+        """
+        state = self.facets[key]
+        state['in_flight'] = True
+        return state['start'], self.url(key, state['start'])
+
+    def record(self, key: str, result: Optional[Dict], new_items: int):
+        """
+        记录某个维度一页的结果，决定该维度是否继续
+
+        Args:
+            key: 维度标识
+            result: parse_page 的结果，获取失败时为None（跳过该页）
+            new_items: 去重后新增的短评数
+        """
+        state = self.facets[key]
+        state['in_flight'] = False
+        state['start'] += COMMENTS_PER_PAGE
+        state['pages'] += 1
+
+        if result is not None:
+            state['stale'] = 0 if new_items else state['stale'] + 1
+            if not result['items'] or not result['has_next'] or state['stale'] >= self.stale_pages:
+                state['done'] = True
+        if self.max_pages and state['pages'] >= self.max_pages:
+            state['done'] = True
+
+    @property
+    def finished(self) -> bool:
+        """所有维度是否都已结束"""
+        return all(state['done'] for state in self.facets.values())
+
+    def snapshot(self) -> Dict:
+        """
+        当前进度（写入爬取状态，用于断点续爬）
+
+        Returns:
+            {维度标识: {start, pages, stale, done}}
+        """
+        return {
+            key: {name: state[name] for name in ('start', 'pages', 'stale', 'done')}
+            for key, state in self.facets.items()
+        }
+
+
+# 测试代码
+if __name__ == "__main__":
+    planner = FacetPlanner('36176155', max_pages=3)
+    for key in planner.ready():
+        start, url = planner.take(key)
+        print(key, url)
+        planner.record(key, {'items': [1], 'has_next': True}, 0)
+    print(planner.snapshot())
@@ -0,0 +1,120 @@
+"""
+浏览器池 - 多个浏览器worker并发获取页面，结果按页顺序返回
+"""
+import queue
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Callable, Iterable, Iterator, Optional, Tuple
+
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import PREFETCH_PAGES
+
+
+class BrowserPool:
+    """浏览器worker池"""
+
+    def __init__(self, size: int, factory: Callable):
+        """
+        初始化浏览器池
+
+        Args:
+            size: worker数量
+            factory: 创建worker的函数，worker需提供 start()、stop() 和 _get_page(url, wait_selector)
+        """
+        self.size = size
+        self.factory = factory
+        self.workers = []
+        self._idle = queue.Queue()
+        self._executor = None
+
+    def start(self):
+        """依次启动所有worker（并发启动会争用chromedriver补丁文件）"""
+        print(f"正在启动 {self.size} 个浏览器worker...")
+        for _ in range(self.size):
+            worker = self.factory()
+            worker.start()
+            self.workers.append(worker)
+            self._idle.put(worker)
+        self._executor = ThreadPoolExecutor(max_workers=self.size)
+
+    def stop(self):
+        """停止所有worker"""
+        if self._executor:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+        for worker in self.workers:
+            worker.stop()
+        self.workers = []
+        self._idle = queue.Queue()
+
+    def fetch(self, url: str, wait_selector: str = None) -> Optional[str]:
+        """
+        借用一个空闲worker获取页面（阻塞）
+
+        Args:
+            url: 页面URL
+            wait_selector: 精简模式下等待的内容元素CSS选择器
+
+        Returns:
+            页面HTML内容或None
+        """
+        worker = self._idle.get()
+        try:
+            return worker._get_page(url, wait_selector)
+        finally:
+            self._idle.put(worker)
+
+    def submit(self, url: str, wait_selector: str = None) -> Future:
+        """
+        提交页面获取任务
+
+        Args:
+            url: 页面URL
+            wait_selector: 精简模式下等待的内容元素CSS选择器
+
+        Returns:
+            结果为HTML内容（或None）的Future
+        """
+        return self._executor.submit(self.fetch, url, wait_selector)
+
+    def fetch_ordered(self, urls: Iterable[str], prefetch: int = None,
+                      wait_selector: str = None) -> Iterator[Tuple[str, Optional[str]]]:
+        """
+        并发获取一组页面，按输入顺序逐个返回
+
+        始终保持 size + prefetch 个请求在途，调用方解析当前页时空闲worker继续预取后续页面；
+        调用方提前停止迭代时，尚未开始的请求会被取消
+
+        Args:
+            urls: 页面URL序列（可以是惰性生成器）
+            prefetch: 额外预取页数，None时使用配置文件设置
+            wait_selector: 精简模式下等待的内容元素CSS选择器
+
+        Yields:
+            (url, html) 元组
+        """
+        prefetch = PREFETCH_PAGES if prefetch is None else prefetch
+        window = self.size + prefetch
+        urls = iter(urls)
+        pending = deque()
+
+        def fill():
+            while len(pending) < window:
+                url = next(urls, None)
+                if url is None:
+                    return
+                pending.append((url, self.submit(url, wait_selector)))
+
+        try:
+            fill()
+            while pending:
+                url, future = pending.popleft()
+                html = future.result()
+                fill()
+                yield url, html
+        finally:
+            for _, future in pending:
+                future.cancel()
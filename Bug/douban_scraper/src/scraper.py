@@ -2,16 +2,22 @@
 豆瓣电影爬虫核心模块
 使用Selenium + undetected-chromedriver绕过反爬虫机制
 """
+import itertools
 import json
 import os
 import random
+import threading
 import time
-from typing import List, Dict, Optional
+from concurrent.futures import wait, FIRST_COMPLETED
+from contextlib import closing, nullcontext
+from typing import List, Dict, Iterable, Iterator, Optional, Tuple
 from tqdm import tqdm
 
 try:
     import undetected_chromedriver as uc
+    from selenium import webdriver
     from selenium.webdriver.common.by import By
+    from selenium.webdriver.chrome.service import Service
     from selenium.webdriver.support.ui import WebDriverWait
     from selenium.webdriver.support import expected_conditions as EC
     from selenium.common.exceptions import TimeoutException, WebDriverException
@@ -23,40 +29,199 @@ import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from config.settings import (
-    MOVIE_URL, MOVIE_ID,
+    MOVIE_ID, MOVIE_URL_TEMPLATE, MOVIES_DIR,
     COMMENTS_URL_TEMPLATE, REVIEWS_URL_TEMPLATE,
+    COMMENTS_LATEST_URL_TEMPLATE, REVIEWS_LATEST_URL_TEMPLATE,
     REQUEST_DELAY_MIN, REQUEST_DELAY_MAX,
     COMMENTS_PER_PAGE, REVIEWS_PER_PAGE,
     MAX_COMMENT_PAGES, MAX_REVIEW_PAGES,
-    MAX_RETRIES, REQUEST_TIMEOUT,
+    MAX_RETRIES, REQUEST_TIMEOUT, RETRY_BACKOFF_BASE, RETRY_BACKOFF_MAX, STANDBY_DRIVER,
     HEADLESS, USER_AGENT, COOKIE_FILE,
-    DATA_DIR
+    DATA_DIR, CRAWL_STATE_FILE, FETCH_MODE, STREAM_TO_DISK,
+    BROWSER_WORKERS, POOL_REQUEST_INTERVAL_MIN, POOL_REQUEST_INTERVAL_MAX,
+    LEAN_PAGE_LOAD, BLOCKED_URL_PATTERNS, CONTENT_WAIT_TIMEOUT,
+    PAGE_CACHE_ENABLED, MOVIE_INFO_CACHE_TTL,
+    FETCH_FULL_REVIEWS, MAX_REPLY_PAGES, ADAPTIVE_PACING, METRICS_ENABLED,
+    FACET_CRAWL, PREFETCH_PAGES, BROWSER_EXTRACT, PARSE_WORKERS,
+    USE_CHROME_PROFILE, CHROME_PROFILE_DIR, USE_BROWSER_DAEMON
 )
-from src.parser import DoubanParser
+from src.parser import create_parser
+from src.fetcher import HttpFetcher
+from src.pool import BrowserPool
+from src.parse_pool import ParsePool
+from src.throttle import RateLimiter, AdaptiveRateLimiter, CircuitBreaker
+from src.supervisor import DriverSupervisor
+from src.checkpoint import CrawlState
+from src.incremental import KnownIndex
+from src.storage import JsonlSink, FIELDS, read_jsonl, export_csv, item_key
+from src.cache import PageCache
+from src.metrics import CrawlMetrics
+from src.planner import FacetPlanner
+from src.extractor import extract_page
+from src.daemon import daemon_address, daemon_driver_path
+
+
+# 各类条目用于去重和断点记录的ID字段
+ITEM_ID_FIELDS = {
+    'comments': 'comment_id',
+    'reviews': 'review_url',
+}
+
+# 精简模式下列表页等待的内容元素
+CONTENT_SELECTORS = {
+    'comments': 'div.comment-item',
+    'reviews': 'div.review-item',
+}
+
+# 浏览器内提取模式下，按等待的内容元素判断页面类型
+EXTRACT_PAGE_TYPES = {selector: page_type for page_type, selector in CONTENT_SELECTORS.items()}
+
+# 创建浏览器时持有的锁（浏览器池和备用浏览器都可能在不同线程中创建浏览器）
+DRIVER_INIT_LOCK = threading.Lock()
+
+# 影评详情页等待的正文元素
+FULL_REVIEW_SELECTOR = 'div.review-content'
+
+# 影评回应每页条数
+REPLIES_PER_PAGE = 100
+
+# 豆瓣登录Cookie的名称，以及检查/注入Cookie时使用的站点
+LOGIN_COOKIE = 'dbcl2'
+COOKIE_URLS = ['https://www.douban.com', 'https://movie.douban.com']
+
+
+class _NullSink(nullcontext):
+    """不写入任何内容的 JsonlSink 替身"""
+
+    def write_page(self, items: List[Dict]):
+        pass
 
 
 class DoubanScraper:
     """豆瓣电影爬虫"""
     
-    def __init__(self, headless: bool = None):
+    def __init__(self, headless: bool = None, fetch_mode: str = None,
+                 workers: int = None, rate_limiter: RateLimiter = None,
+                 resume: bool = False, incremental: bool = False, stream: bool = None,
+                 movie_id: str = None, lean: bool = None, replay: bool = False,
+                 full_reviews: bool = None, adaptive: bool = None,
+                 metrics: CrawlMetrics = None, standby: bool = None,
+                 breaker: CircuitBreaker = None, facets: bool = None, extract: bool = None,
+                 parser_backend: str = None, parse_workers: int = None,
+                 profile: bool = None, profile_name: str = None, attach: bool = None,
+                 cache: bool = None):
         """
         初始化爬虫
         
         Args:
             headless: 是否使用无头模式，None时使用配置文件设置
+            fetch_mode: 页面获取方式（"browser" 或 "hybrid"），None时使用配置文件设置
+            workers: 并发浏览器数量，None时使用配置文件设置
+            rate_limiter: 共享的全局节流器（浏览器池内部使用）
+            resume: 是否从上次中断的断点继续爬取
+            incremental: 是否增量爬取（按时间倒序，遇到全是已知条目的页即停止）
+            stream: 是否逐页流式写入磁盘而不在内存中累积，None时使用配置文件设置
+            movie_id: 目标电影ID，None时使用配置文件设置
+            lean: 是否使用精简加载模式（屏蔽图片/字体/样式，eager加载），None时使用配置文件设置
+            replay: 离线重放模式，只从页面缓存读取，不启动浏览器也不发出请求
+            full_reviews: 是否抓取影评详情页的完整正文和回应，None时使用配置文件设置
+            adaptive: 是否根据页面加载情况自适应调整请求间隔（AIMD），None时使用配置文件设置
+            metrics: 共享的指标收集器（浏览器池内部使用），None时按配置文件设置创建
+            standby: 是否在后台预热备用浏览器，浏览器失效时立即替换，None时使用配置文件设置
+            breaker: 共享的安全验证熔断器（浏览器池内部使用），None时新建
+            facets: 是否按 状态 × 排序 × 评分段 多维度爬取短评，None时使用配置文件设置
+            extract: 是否在浏览器内用JavaScript提取列表页数据（不传输page_source），None时使用配置文件设置
+            parser_backend: 页面解析后端（"bs4" 或 "lxml"），None时使用配置文件设置
+            parse_workers: 列表页解析进程数（0表示在主线程中解析），None时使用配置文件设置
+            profile: 是否使用持久化的浏览器配置目录（保留登录状态和HTTP缓存），None时使用配置文件设置
+            profile_name: 配置目录名（浏览器池中每个worker使用各自的目录），None时为 main
+            attach: 是否连接浏览器守护进程中的Chrome（守护进程未运行时自己启动浏览器），None时使用配置文件设置
+            cache: 是否把抓取到的页面写入页面缓存（供 --replay 使用），None时使用配置文件设置
         """
         self.headless = headless if headless is not None else HEADLESS
+        self.fetch_mode = fetch_mode or FETCH_MODE
+        self.workers = workers or BROWSER_WORKERS
+        self.rate_limiter = rate_limiter
         self.driver = None
-        self.parser = DoubanParser()
+        self.supervisor = None
+        self.attach = attach if attach is not None else USE_BROWSER_DAEMON
+        # 守护进程只有一个浏览器，连接守护进程时不预热备用浏览器
+        self.standby = (standby if standby is not None else STANDBY_DRIVER) and not self.attach
+        # 在固定的远程调试地址上启动浏览器（浏览器守护进程使用）
+        self.debugger_address = None
+        self._attached = False
+        self.profile = profile if profile is not None else USE_CHROME_PROFILE
+        self.profile_name = profile_name or 'main'
+        self._profile_flip = False
+        self.breaker = breaker or CircuitBreaker()
+        self.http = None
+        self.pool = None
+        self.resume = resume
+        self.incremental = incremental
+        self.stream = stream if stream is not None else STREAM_TO_DISK
+        self.lean = lean if lean is not None else LEAN_PAGE_LOAD
+        self.replay = replay
+        self.full_reviews = full_reviews if full_reviews is not None else FETCH_FULL_REVIEWS
+        self.facets = facets if facets is not None else FACET_CRAWL
+        self.extract = extract if extract is not None else BROWSER_EXTRACT
+        self.adaptive = adaptive if adaptive is not None else ADAPTIVE_PACING
+        # 自己创建的自适应节流器在停止时保存学到的间隔；浏览器池worker使用主爬虫的节流器
+        self._owns_limiter = rate_limiter is None and self.adaptive and not replay
+        if self._owns_limiter:
+            self.rate_limiter = AdaptiveRateLimiter(REQUEST_DELAY_MIN, name='browser')
+        # 浏览器池中的worker由主爬虫统一写缓存
+        use_cache = cache if cache is not None else PAGE_CACHE_ENABLED
+        self.cache = PageCache() if (use_cache or replay) and not rate_limiter else None
+        # 浏览器池中的worker把指标写入主爬虫的收集器，由主爬虫在停止时汇总
+        self._owns_metrics = metrics is None and METRICS_ENABLED and not rate_limiter
+        self.metrics = CrawlMetrics() if self._owns_metrics else metrics
+        self.parser = create_parser(parser_backend)
+        # 浏览器池中的worker只获取页面，由主爬虫统一解析
+        self.parse_workers = parse_workers if parse_workers is not None else PARSE_WORKERS
+        self.parse_pool = (ParsePool(self.parse_workers, parser_backend)
+                           if self.parse_workers > 0 and not rate_limiter else None)
+        self.set_movie(movie_id or MOVIE_ID)
+    
+    def set_movie(self, movie_id: str, data_dir: str = None):
+        """
+        切换目标电影，浏览器会话和Cookie保持不变
+        
+        Args:
+            movie_id: 电影ID
+            data_dir: 该电影的数据输出目录，None时使用配置文件中的DATA_DIR
+        """
+        self.movie_id = movie_id
+        self.movie_url = MOVIE_URL_TEMPLATE.format(movie_id=movie_id)
+        self.data_dir = data_dir or DATA_DIR
+        self.state = CrawlState(movie_id, os.path.join(self.data_dir, os.path.basename(CRAWL_STATE_FILE)),
+                                persist=not self.replay)
+        self.known_index = KnownIndex(movie_id)
         self.movie_info = {}
         self.comments = []
         self.reviews = []
+        self.item_counts = {'comments': 0, 'reviews': 0}
     
     def _init_driver(self):
         """初始化Chrome浏览器驱动"""
+        self.driver = self._create_driver()
+    
+    def _create_driver(self):
+        """
+        创建Chrome浏览器驱动
+        
+        Returns:
+            driver
+        """
+        if self.attach:
+            driver = self._attach_driver()
+            if driver is not None:
+                return driver
+        
         print("正在初始化浏览器...")
         
         options = uc.ChromeOptions()
+        if self.debugger_address:
+            options.debugger_address = self.debugger_address
         
         if self.headless:
             options.add_argument('--headless')
@@ -71,19 +236,177 @@ class DoubanScraper:
         # 禁用自动化检测
         options.add_argument('--disable-blink-features=AutomationControlled')
         
+        if self.lean:
+            # DOM解析完成即返回，不等待图片等资源
+            options.page_load_strategy = 'eager'
+            options.add_experimental_option('prefs', {
+                'profile.managed_default_content_settings.images': 2
+            })
+        
         try:
             # 自动检测Chrome版本并下载匹配的chromedriver
-            self.driver = uc.Chrome(options=options, version_main=143)
-            self.driver.implicitly_wait(10)
+            # 备用浏览器在后台线程创建，与其他浏览器同时启动会争用chromedriver补丁文件
+            with DRIVER_INIT_LOCK:
+                profile_dir = self._next_profile_dir()
+                if profile_dir:
+                    print(f"使用浏览器配置目录: {profile_dir}")
+                driver = uc.Chrome(options=options, version_main=143, user_data_dir=profile_dir)
+            driver.implicitly_wait(10)
+            self._block_resources(driver)
+            
             print("浏览器初始化成功")
+            return driver
         except Exception as e:
             print(f"浏览器初始化失败: {e}")
             raise
     
-    def _random_delay(self):
-        """随机延迟，模拟人类行为"""
-        delay = random.uniform(REQUEST_DELAY_MIN, REQUEST_DELAY_MAX)
-        time.sleep(delay)
+    def _block_resources(self, driver):
+        """精简模式下通过DevTools屏蔽用不到的资源类型"""
+        if self.lean:
+            driver.execute_cdp_cmd('Network.enable', {})
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': BLOCKED_URL_PATTERNS})
+    
+    def _attach_driver(self):
+        """
+        通过远程调试端口连接浏览器守护进程中的Chrome（跳过浏览器启动和登录准备）
+        
+        使用守护进程记录的undetected-chromedriver补丁版chromedriver；没有记录时（旧版守护进程）
+        由Selenium Manager查找或下载普通chromedriver，浏览器本身仍是守护进程中的Chrome
+        
+        Returns:
+            driver；守护进程未运行或连接失败时返回None
+        """
+        address = daemon_address()
+        if not address:
+            print("浏览器守护进程未运行，改为启动新的浏览器（python main.py --daemon 可启动守护进程）")
+            return None
+        
+        options = webdriver.ChromeOptions()
+        options.debugger_address = address
+        if self.lean:
+            options.page_load_strategy = 'eager'
+        driver_path = daemon_driver_path()
+        if not driver_path:
+            print("守护进程没有记录chromedriver路径，由Selenium Manager查找chromedriver（重启守护进程可修复）")
+        try:
+            service = Service(executable_path=driver_path) if driver_path else None
+            driver = webdriver.Chrome(options=options, service=service)
+            driver.implicitly_wait(10)
+            self._block_resources(driver)
+        except Exception as e:
+            print(f"连接浏览器守护进程失败，改为启动新的浏览器: {e}")
+            return None
+        
+        self._attached = True
+        print(f"已连接浏览器守护进程: {address}")
+        return driver
+    
+    def _quit_driver(self):
+        """关闭当前浏览器；连接的是守护进程中的浏览器时只断开连接，浏览器继续运行"""
+        if self._attached:
+            self._attached = False
+            self.driver.service.stop()
+        else:
+            self.driver.quit()
+    
+    def _next_profile_dir(self) -> Optional[str]:
+        """
+        下一个浏览器使用的配置目录
+        
+        同一个配置目录不能同时被两个Chrome打开：启用备用浏览器时当前浏览器和备用浏览器轮流使用两个目录
+        （换上备用浏览器前失效的浏览器已经关闭，它的目录正好留给下一个备用浏览器）
+        
+        Returns:
+            配置目录路径；不使用持久化配置目录时返回None
+        """
+        if not self.profile:
+            return None
+        name = self.profile_name
+        if self.standby:
+            if self._profile_flip:
+                name += '-b'
+            self._profile_flip = not self._profile_flip
+        profile_dir = os.path.abspath(os.path.join(CHROME_PROFILE_DIR, name))
+        os.makedirs(profile_dir, exist_ok=True)
+        return profile_dir
+    
+    def _warm_driver(self):
+        """
+        创建浏览器并准备登录状态（备用浏览器使用）
+        
+        Returns:
+            可以直接使用的driver
+        """
+        driver = self._create_driver()
+        self._prepare_session(driver)
+        return driver
+    
+    def _start_driver(self):
+        """启动浏览器并准备登录状态；启用备用浏览器时同时在后台预热一个"""
+        if self.standby:
+            self.supervisor = DriverSupervisor(self._warm_driver)
+            self.driver = self.supervisor.start()
+        else:
+            self._init_driver()
+            self._prepare_session()
+    
+    def _replace_driver(self):
+        """替换失效的浏览器：有备用浏览器时直接换上，否则冷启动"""
+        if self.supervisor:
+            self.driver = self.supervisor.replace(self.driver)
+            return
+        
+        try:
+            self._quit_driver()
+        except Exception:
+            pass
+        self._init_driver()
+        self._prepare_session()
+    
+    def _random_delay(self) -> float:
+        """
+        随机延迟，模拟人类行为；浏览器池或自适应模式下改为等待节流器
+        
+        Returns:
+            实际等待的秒数
+        """
+        started = time.monotonic()
+        if self.rate_limiter:
+            self.rate_limiter.wait()
+        else:
+            time.sleep(random.uniform(REQUEST_DELAY_MIN, REQUEST_DELAY_MAX))
+        return time.monotonic() - started
+    
+    def _record_fetch(self, url: str, source: str, ok: bool, **fields):
+        """记录一次页面获取的指标（参数见 CrawlMetrics.record_fetch）"""
+        if self.metrics:
+            self.metrics.record_fetch(url, source, ok, **fields)
+    
+    def _record_parse(self, kind: str, url: str, items: int, new_items: int, parse_time: float):
+        """记录一页解析的指标"""
+        if self.metrics:
+            self.metrics.record_parse(kind, url, items, new_items, parse_time)
+    
+    def _report_pacing(self, ok: bool, reason: str = '', challenge: bool = False):
+        """
+        把页面加载结果反馈给熔断器和节流器（自适应模式下据此调整请求间隔）
+        
+        Args:
+            ok: 页面是否正常加载
+            reason: 失败原因（challenge/timeout/empty）
+            challenge: 页面是在安全验证之后才加载成功的（不清零熔断器的连续验证计数）
+        """
+        if ok and not challenge:
+            self.breaker.record_success()
+        elif reason == 'challenge':
+            self.breaker.record_challenge()
+        
+        if not self.rate_limiter:
+            return
+        if ok:
+            self.rate_limiter.success()
+        else:
+            self.rate_limiter.failure(reason)
     
     def _save_cookies(self):
         """保存Cookie到文件"""
@@ -94,20 +417,115 @@ class DoubanScraper:
                 json.dump(cookies, f, ensure_ascii=False, indent=2)
             print(f"Cookie已保存到: {COOKIE_FILE}")
     
-    def _load_cookies(self) -> bool:
+    def _browser_cookies(self, driver=None) -> Optional[List[Dict]]:
+        """
+        通过DevTools读取浏览器中的豆瓣Cookie（不需要先打开豆瓣页面）
+        
+        Args:
+            driver: 读取哪个浏览器，None时为当前浏览器
+            
+        Returns:
+            DevTools格式的Cookie列表；读取失败时返回None
+        """
+        driver = driver or self.driver
+        try:
+            return driver.execute_cdp_cmd('Network.getCookies', {'urls': COOKIE_URLS})['cookies']
+        except Exception as e:
+            print(f"读取浏览器Cookie失败: {e}")
+            return None
+    
+    @staticmethod
+    def _login_cookie(cookies: List[Dict]) -> Optional[Dict]:
+        """
+        从DevTools格式的Cookie列表中找出未过期的登录Cookie
+        
+        Returns:
+            登录Cookie；没有登录或已过期时返回None
+        """
+        for cookie in cookies:
+            if cookie['name'] != LOGIN_COOKIE:
+                continue
+            # 会话Cookie的expires为-1
+            if cookie.get('session') or cookie.get('expires', -1) > time.time():
+                return cookie
+        return None
+    
+    def _prepare_session(self, driver=None) -> bool:
+        """
+        准备登录状态：持久化配置目录中的登录仍然有效时直接使用，否则加载保存的Cookie
+        
+        Args:
+            driver: 准备哪个浏览器，None时为当前浏览器
+            
+        Returns:
+            是否有可用的登录状态
+        """
+        driver = driver or self.driver
+        if self.profile or self._attached:
+            cookies = self._browser_cookies(driver)
+            if cookies and self._login_cookie(cookies):
+                print("使用浏览器守护进程中的登录状态" if self._attached else "使用浏览器配置目录中的登录状态")
+                return True
+            print("浏览器中没有有效的登录状态，改为加载保存的Cookie")
+        
+        if not self._load_cookies(driver):
+            return False
+        cookies = self._browser_cookies(driver)
+        if cookies is not None and not self._login_cookie(cookies):
+            print("⚠️  保存的Cookie中没有有效的登录状态（可能已过期），请运行 python main.py --login 重新登录")
+            return False
+        return True
+    
+    def _set_cookies(self, driver, cookies: List[Dict]) -> bool:
+        """
+        通过DevTools写入Cookie：不需要先打开豆瓣页面，并保留sameSite和过期时间
+        
+        Args:
+            driver: 写入哪个浏览器
+            cookies: driver.get_cookies() 格式的Cookie列表
+            
+        Returns:
+            是否全部写入成功
+        """
+        params = []
+        for cookie in cookies:
+            param = {name: cookie[name] for name in ('name', 'value', 'domain', 'path', 'secure', 'httpOnly')
+                     if name in cookie}
+            if 'expiry' in cookie:
+                param['expires'] = cookie['expiry']
+            if cookie.get('sameSite') in ('Strict', 'Lax', 'None'):
+                param['sameSite'] = cookie['sameSite']
+            params.append(param)
+        
+        try:
+            driver.execute_cdp_cmd('Network.setCookies', {'cookies': params})
+            return True
+        except Exception as e:
+            print(f"通过DevTools写入Cookie失败，改为打开主页后逐个添加: {e}")
+            return False
+    
+    def _load_cookies(self, driver=None) -> bool:
         """
         从文件加载Cookie
         
+        Args:
+            driver: 加载到哪个浏览器，None时为当前浏览器
+            
         Returns:
             是否成功加载
         """
+        driver = driver or self.driver
         if os.path.exists(COOKIE_FILE):
             try:
                 with open(COOKIE_FILE, 'r', encoding='utf-8') as f:
                     cookies = json.load(f)
                 
+                if self._set_cookies(driver, cookies):
+                    print("Cookie加载成功")
+                    return True
+                
                 # 先访问豆瓣主页
-                self.driver.get("https://www.douban.com")
+                driver.get("https://www.douban.com")
                 time.sleep(2)
                 
                 # 添加Cookie
@@ -116,7 +534,7 @@ class DoubanScraper:
                         # 移除可能导致问题的字段
                         cookie.pop('sameSite', None)
                         cookie.pop('expiry', None)
-                        self.driver.add_cookie(cookie)
+                        driver.add_cookie(cookie)
                     except Exception as e:
                         print(f"添加Cookie失败: {e}")
                 
@@ -155,83 +573,302 @@ class DoubanScraper:
     
     def start(self):
         """启动爬虫"""
-        if not self.driver:
-            self._init_driver()
+        if self.replay:
+            print("离线重放模式：只读取页面缓存，不启动浏览器")
+            return
+        
+        if self.workers > 1:
+            # 页面由浏览器池获取，所有worker共享同一个节流器
+            if not self.pool:
+                if self.adaptive:
+                    limiter = AdaptiveRateLimiter(POOL_REQUEST_INTERVAL_MIN, name='pool')
+                    # 主爬虫解析出异常空页时也要反馈给池的节流器
+                    self.rate_limiter = limiter
+                else:
+                    limiter = RateLimiter(POOL_REQUEST_INTERVAL_MIN, POOL_REQUEST_INTERVAL_MAX)
+                # 每个worker使用各自的浏览器配置目录
+                worker_ids = itertools.count(1)
+                self.pool = BrowserPool(self.workers, lambda: DoubanScraper(
+                    headless=self.headless,
+                    fetch_mode=self.fetch_mode,
+                    workers=1,
+                    rate_limiter=limiter,
+                    lean=self.lean,
+                    metrics=self.metrics,
+                    standby=self.standby,
+                    breaker=self.breaker,
+                    extract=self.extract,
+                    profile=self.profile,
+                    profile_name=f'worker-{next(worker_ids)}',
+                    attach=False
+                ))
+                self.pool.start()
+            return
         
-        # 尝试加载已保存的Cookie
-        self._load_cookies()
+        if self.fetch_mode == 'hybrid':
+            # 浏览器延迟到遇到安全验证时才启动
+            if not self.http:
+                self.http = HttpFetcher()
+                if self.http.load_cookies():
+                    print("Cookie已加载到HTTP会话")
+            return
+        
+        # 启动浏览器并尝试加载已保存的Cookie
+        if not self.driver:
+            self._start_driver()
     
     def stop(self):
         """停止爬虫，关闭浏览器"""
+        if self._owns_limiter:
+            self.rate_limiter.save()
+        
+        if self._owns_metrics:
+            self.metrics.close()
+        
+        if self.pool:
+            self.pool.stop()
+            self.pool = None
+        
+        if self.parse_pool:
+            self.parse_pool.stop()
+        
+        if self.http:
+            self.http.close()
+            self.http = None
+        
+        if self.supervisor:
+            self.supervisor.stop()
+            self.supervisor = None
+        
         if self.driver:
-            self.driver.quit()
+            attached = self._attached
+            self._quit_driver()
             self.driver = None
-            print("浏览器已关闭")
+            print("已断开浏览器守护进程" if attached else "浏览器已关闭")
     
-    def _get_page(self, url: str, retry: int = 0) -> Optional[str]:
+    def _get_page(self, url: str, wait_selector: str = None, max_age: float = None) -> Optional[str]:
         """
-        获取页面内容
+        获取页面内容，并写入页面缓存
+        
+        离线重放模式下只读缓存；指定max_age时有效期内的缓存直接返回
         
         Args:
             url: 页面URL
-            retry: 当前重试次数
+            wait_selector: 精简模式下浏览器等待的内容元素CSS选择器
+            max_age: 缓存有效期（秒），None表示总是重新抓取
             
         Returns:
             页面HTML内容或None
         """
+        if self.replay:
+            html = self.cache.get(url)
+            if html is None:
+                print(f"缓存中没有该页面: {url}")
+            self._record_fetch(url, 'cache', html is not None, page_bytes=len(html or ''))
+            return html
+        
+        if self.cache and max_age is not None:
+            html = self.cache.get(url, max_age)
+            if html is not None:
+                self._record_fetch(url, 'cache', True, page_bytes=len(html))
+                return html
+        
+        html = self._fetch_page(url, wait_selector)
+        self._cache_page(url, html)
+        return html
+    
+    def _cache_page(self, url: str, page):
+        """把获取到的HTML写入页面缓存（浏览器内提取的结果不是HTML，不缓存）"""
+        if page and self.cache and isinstance(page, str):
+            self.cache.put(url, page)
+    
+    def _fetch_page(self, url: str, wait_selector: str = None) -> Optional[str]:
+        """
+        抓取页面内容
+        
+        hybrid模式下优先使用HTTP请求，遇到安全验证、登录墙或请求失败时交给浏览器，
+        并把浏览器中刷新后的Cookie同步回HTTP会话。只有安全验证和登录墙计入熔断器，
+        超时和429/5xx让节流器拉长间隔，连接错误、404等不反馈
+        
+        Args:
+            url: 页面URL
+            wait_selector: 精简模式下浏览器等待的内容元素CSS选择器
+            
+        Returns:
+            页面HTML内容或None
+        """
+        if self.pool:
+            return self.pool.fetch(url, wait_selector)
+        
+        if not self.http:
+            return self._get_browser_page(url, wait_selector=wait_selector)
+        
+        started = time.monotonic()
+        html = self.http.fetch(url)
+        navigation = time.monotonic() - started
+        if html is not None:
+            self._report_pacing(True)
+            delay = self._random_delay()
+            self._record_fetch(url, 'http', True, navigation=navigation, delay=delay, page_bytes=len(html))
+            return html
+        challenge = self.http.failure == 'challenge'
+        if challenge or self.http.failure in ('timeout', 'error'):
+            self._report_pacing(False, self.http.failure)
+        self._record_fetch(url, 'http', False, navigation=navigation, challenge=challenge)
+        
+        if not self.driver:
+            self._start_driver()
+        
+        html = self._get_browser_page(url, wait_selector=wait_selector, after_challenge=challenge)
+        
+        # 同步浏览器Cookie，后续请求继续走HTTP
+        try:
+            self.http.load_cookies(self.driver.get_cookies())
+            self._save_cookies()
+        except WebDriverException as e:
+            print(f"同步Cookie失败: {e}")
+        
+        return html
+    
+    def _get_browser_page(self, url: str, wait_selector: str = None,
+                          after_challenge: bool = False) -> Optional[str]:
+        """
+        通过浏览器获取页面内容
+        
+        失败时循环重试，每次重试前按带随机抖动的指数退避等待；熔断器打开时先暂停
+        
+        Args:
+            url: 页面URL
+            wait_selector: 精简模式下等待的内容元素CSS选择器
+            after_challenge: HTTP请求刚遇到安全验证，由浏览器接手（加载成功也不清零熔断器计数）
+            
+        Returns:
+            页面HTML内容或None
+        """
+        for retry in range(MAX_RETRIES + 1):
+            if retry > 0:
+                backoff = min(RETRY_BACKOFF_MAX, RETRY_BACKOFF_BASE * 2 ** (retry - 1)) * random.uniform(0.5, 1.5)
+                print(f"重试 ({retry}/{MAX_RETRIES})，{backoff:.1f} 秒后...")
+                time.sleep(backoff)
+            
+            self.breaker.wait()
+            html = self._load_browser_page(url, retry, wait_selector, after_challenge)
+            if html is not None:
+                return html
+        
+        return None
+    
+    def _load_browser_page(self, url: str, retry: int, wait_selector: str = None,
+                           after_challenge: bool = False) -> Optional[str]:
+        """
+        在浏览器中加载一次页面（不重试）
+        
+        Args:
+            url: 页面URL
+            retry: 当前重试次数（记录指标用）
+            wait_selector: 精简模式下等待的内容元素CSS选择器
+            after_challenge: HTTP请求刚遇到安全验证，由浏览器接手
+            
+        Returns:
+            页面HTML内容；失败时返回None
+        """
+        navigation = delay = 0.0
+        challenge = False
         try:
             # 检查浏览器是否还活着
             try:
                 _ = self.driver.current_url
             except:
-                print("\n⚠️  浏览器窗口已关闭，正在重新初始化...")
-                self._init_driver()
-                self._load_cookies()
+                print("\n⚠️  浏览器窗口已关闭，正在替换...")
+                self._replace_driver()
             
+            # 先占用节流器的请求名额再发起导航：浏览器池的各worker共享节流器，
+            # 每次 driver.get() 之间都保持间隔，包括刚启动时的第一批请求
+            delay = self._random_delay()
+            started = time.monotonic()
             self.driver.get(url)
-            self._random_delay()
+            navigation = time.monotonic() - started
             
             # 检查是否被重定向到安全验证页面
             current_url = self.driver.current_url
             if 'sec.douban.com' in current_url:
+                challenge = True
+                self._report_pacing(False, 'challenge')
                 print("\n⚠️  检测到安全验证，请在浏览器中完成验证...")
                 input("完成验证后按回车继续...")
+                delay += self._random_delay()
+                started = time.monotonic()
                 self.driver.get(url)
-                self._random_delay()
+                navigation += time.monotonic() - started
+            
+            # 精简模式：等待真正要解析的内容元素
+            wait_started = time.monotonic()
+            if self.lean and wait_selector:
+                try:
+                    WebDriverWait(self.driver, CONTENT_WAIT_TIMEOUT).until(
+                        EC.presence_of_element_located((By.CSS_SELECTOR, wait_selector))
+                    )
+                    return self._browser_page_loaded(url, retry, navigation, wait_started, delay, challenge,
+                                                     wait_selector, after_challenge)
+                except TimeoutException:
+                    # 没有内容元素（例如已翻过最后一页），交给解析器判断
+                    pass
             
             # 等待页面加载
             WebDriverWait(self.driver, REQUEST_TIMEOUT).until(
                 EC.presence_of_element_located((By.TAG_NAME, "body"))
             )
             
-            return self.driver.page_source
+            return self._browser_page_loaded(url, retry, navigation, wait_started, delay, challenge,
+                                             wait_selector, after_challenge)
             
         except TimeoutException:
             print(f"页面加载超时: {url}")
-            if retry < MAX_RETRIES:
-                print(f"重试 ({retry + 1}/{MAX_RETRIES})...")
-                self._random_delay()
-                return self._get_page(url, retry + 1)
+            self._report_pacing(False, 'timeout')
+            self._record_fetch(url, 'browser', False, navigation=navigation, delay=delay,
+                               retries=retry, challenge=challenge)
             return None
             
         except WebDriverException as e:
             print(f"浏览器错误: {e}")
-            # 如果是窗口关闭错误，尝试重新初始化
+            self._record_fetch(url, 'browser', False, navigation=navigation, delay=delay,
+                               retries=retry, challenge=challenge)
+            # 如果是窗口关闭错误，换一个浏览器后重试
             if "no such window" in str(e) or "target window already closed" in str(e):
-                print("\n⚠️  浏览器窗口已关闭，正在重新初始化...")
+                print("\n⚠️  浏览器窗口已关闭，正在替换...")
                 try:
-                    self._init_driver()
-                    self._load_cookies()
-                    if retry < MAX_RETRIES:
-                        return self._get_page(url, retry + 1)
+                    self._replace_driver()
                 except Exception as init_error:
                     print(f"重新初始化失败: {init_error}")
-            elif retry < MAX_RETRIES:
-                print(f"重试 ({retry + 1}/{MAX_RETRIES})...")
-                self._random_delay()
-                return self._get_page(url, retry + 1)
             return None
     
+    def _browser_page_loaded(self, url: str, retry: int, navigation: float, wait_started: float,
+                             delay: float, challenge: bool, wait_selector: str = None,
+                             after_challenge: bool = False):
+        """
+        页面加载完成：反馈节流器、记录指标并返回页面内容
+        
+        手动完成安全验证后才加载成功的页面（包括HTTP遇到验证后交给浏览器的页面）不算正常加载，
+        不清零熔断器的连续验证计数，否则熔断器永远不会打开
+        
+        浏览器内提取模式下，列表页（按wait_selector判断）直接在页面中提取，返回 parse_page 结构的字典
+        
+        Returns:
+            page_source，或浏览器内提取的结果
+        """
+        wait = time.monotonic() - wait_started
+        page_type = EXTRACT_PAGE_TYPES.get(wait_selector) if self.extract else None
+        page = extract_page(self.driver, page_type) if page_type else None
+        if page is not None:
+            page_bytes = len(json.dumps(page, ensure_ascii=False))
+        else:
+            page = self.driver.page_source
+            page_bytes = len(page)
+        self._report_pacing(True, challenge=challenge or after_challenge)
+        self._record_fetch(url, 'browser', True, navigation=navigation, wait=wait, delay=delay,
+                           page_bytes=page_bytes, retries=retry, challenge=challenge)
+        return page
+    
     def scrape_movie_info(self) -> Dict:
         """
         爬取电影基本信息
@@ -239,11 +876,13 @@ class DoubanScraper:
         Returns:
             电影信息字典
         """
-        print(f"\n正在获取电影信息: {MOVIE_URL}")
+        print(f"\n正在获取电影信息: {self.movie_url}")
         
-        html = self._get_page(MOVIE_URL)
+        html = self._get_page(self.movie_url, max_age=MOVIE_INFO_CACHE_TTL)
         if html:
+            started = time.monotonic()
             self.movie_info = self.parser.parse_movie_info(html)
+            self._record_parse('movie_info', self.movie_url, 1, 1, time.monotonic() - started)
             print(f"电影: {self.movie_info.get('title', '未知')}")
             print(f"评分: {self.movie_info.get('rating', 0)}")
             print(f"评价人数: {self.movie_info.get('votes', 0)}")
@@ -252,151 +891,632 @@ class DoubanScraper:
         
         return self.movie_info
     
-    def scrape_comments(self, max_pages: int = None) -> List[Dict]:
+    def _page_starts(self, per_page: int, max_pages: int = None) -> Iterator[int]:
         """
-        爬取所有短评
+        生成列表页偏移（start参数）
+        
+        Args:
+            per_page: 每页条目数
+            max_pages: 最大页数，None表示不限制
+            
+        Returns:
+            页面偏移迭代器
+        """
+        starts = itertools.count(0, per_page)
+        if max_pages:
+            starts = itertools.islice(starts, max_pages)
+        return starts
+    
+    def _iter_pages(self, url_template: str, starts: Iterable[int],
+                    wait_selector: str = None) -> Iterator[Tuple[int, Optional[str]]]:
+        """
+        按顺序获取列表页；启用浏览器池时并发获取并预取后续页面
+        
+        Args:
+            url_template: 列表页URL模板
+            starts: 页面偏移序列
+            wait_selector: 精简模式下等待的内容元素CSS选择器
+            
+        Yields:
+            (start, html) 元组，获取失败时html为None
+        """
+        starts, url_starts = itertools.tee(starts)
+        urls = (url_template.format(movie_id=self.movie_id, start=start) for start in url_starts)
+        
+        with closing(self._iter_urls(urls, wait_selector)) as pages:
+            for start, (url, html) in zip(starts, pages):
+                yield start, html
+    
+    def _iter_urls(self, urls: Iterable[str],
+                   wait_selector: str = None) -> Iterator[Tuple[str, Optional[str]]]:
+        """
+        按顺序获取一组页面；启用浏览器池时并发获取并预取后续页面
         
         Args:
+            urls: 页面URL序列（可以是惰性生成器）
+            wait_selector: 精简模式下等待的内容元素CSS选择器
+            
+        Yields:
+            (url, html) 元组，获取失败时html为None
+        """
+        if self.pool:
+            for url, html in self.pool.fetch_ordered(urls, wait_selector=wait_selector):
+                self._cache_page(url, html)
+                yield url, html
+            return
+        
+        for url in urls:
+            yield url, self._get_page(url, wait_selector)
+    
+    def _parse_list_page(self, page, page_type: str) -> Dict:
+        """
+        解析列表页；浏览器内提取模式下获取到的已经是解析结果
+        
+        Args:
+            page: 页面HTML，或浏览器内提取得到的字典
+            page_type: 'comments' 或 'reviews'
+            
+        Returns:
+            parse_page 结构的字典
+        """
+        if isinstance(page, dict):
+            return page
+        return self.parser.parse_page(page, page_type)
+    
+    def _iter_parsed(self, pages: Iterator[Tuple[int, Optional[str]]],
+                     page_type: str) -> Iterator[Tuple[int, Optional[str], Optional[Dict], float]]:
+        """
+        解析按顺序获取到的列表页；启用解析进程池时获取与解析并行进行
+        
+        Args:
+            pages: _iter_pages 返回的 (start, html) 迭代器
+            page_type: 'comments' 或 'reviews'
+            
+        Yields:
+            (start, html, result, parse_time) 元组，获取失败时result为None
+        """
+        if self.parse_pool:
+            yield from self.parse_pool.parse_ordered(pages, page_type)
+            return
+        
+        with closing(pages):
+            for start, html in pages:
+                started = time.monotonic()
+                result = self._parse_list_page(html, page_type) if html else None
+                yield start, html, result, time.monotonic() - started
+    
+    def _load_saved_items(self, page_type: str) -> List[Dict]:
+        """
+        从已保存的原始数据中取回全部条目（增量合并时使用）
+        
+        Args:
+            page_type: 'comments' 或 'reviews'
+            
+        Returns:
+            条目列表
+        """
+        import pandas as pd
+        
+        csv_file = os.path.join(self.data_dir, f'{page_type}.csv')
+        if not os.path.exists(csv_file):
+            return []
+        
+        id_field = ITEM_ID_FIELDS[page_type]
+        df = pd.read_csv(csv_file, dtype={id_field: str}, keep_default_na=False)
+        items = df.to_dict('records')
+        print(f"已从 {csv_file} 恢复 {len(items)} 条")
+        return items
+    
+    def _load_page_items(self, page_type: str, item_ids: set) -> List[Dict]:
+        """
+        断点续爬时从逐页写入的JSONL中取回已完成页面的条目
+        
+        中断在条目已写入、页面还没记录完成之间时，这些条目不在item_ids中，该页会重新爬取
+        
+        Args:
+            page_type: 'comments' 或 'reviews'
+            item_ids: 断点中已完成页面的条目标识
+            
+        Returns:
+            条目列表（按写入顺序，重复写入的条目只取一次）
+        """
+        path = self._stream_path(page_type)
+        if not item_ids or not os.path.exists(path):
+            return []
+        
+        id_field = ITEM_ID_FIELDS[page_type]
+        items = {}
+        for item in read_jsonl(path):
+            key = item_key(item, id_field)
+            if key in item_ids:
+                items.setdefault(key, item)
+        print(f"已从 {path} 恢复 {len(items)} 条")
+        return list(items.values())
+    
+    def _page_sink(self, page_type: str):
+        """
+        逐页写入条目的JSONL文件
+        
+        流式模式下这是唯一的数据文件；非流式模式下条目同时留在内存中，
+        记录断点时也写入该文件，进程被强制结束后断点续爬从这里恢复。离线重放时不写断点，也不写该文件
+        
+        Returns:
+            JsonlSink，或不写入任何内容的 _NullSink
+        """
+        if not self.stream and not self.state.persist:
+            return _NullSink()
+        return JsonlSink(self._stream_path(page_type), truncate=not self.resume)
+    
+    def _saved_ids(self, page_type: str) -> set:
+        """
+        只读取已保存原始数据中的条目ID（流式增量模式使用，避免整表载入内存）
+        
+        Args:
+            page_type: 'comments' 或 'reviews'
+            
+        Returns:
+            条目ID集合
+        """
+        import pandas as pd
+        
+        csv_file = os.path.join(self.data_dir, f'{page_type}.csv')
+        if not os.path.exists(csv_file):
+            return set()
+        
+        id_field = ITEM_ID_FIELDS[page_type]
+        # 只读取组成条目标识需要的列
+        key_fields = {id_field, 'username', 'time', 'content', 'title'}
+        df = pd.read_csv(csv_file, usecols=lambda name: name in key_fields, dtype=str, keep_default_na=False)
+        return {item_key(item, id_field) for item in df.to_dict('records')}
+    
+    def _stream_path(self, page_type: str) -> str:
+        """流式模式下某类条目的JSONL文件路径"""
+        return os.path.join(self.data_dir, f'{page_type}.jsonl')
+    
+    def _full_reviews_path(self) -> str:
+        """影评详情（完整正文和回应）的JSONL文件路径"""
+        return os.path.join(self.data_dir, 'full_reviews.jsonl')
+    
+    def _load_full_reviews(self) -> Dict[str, Dict]:
+        """
+        读取已抓取的影评详情
+        
+        Returns:
+            {影评URL: 详情字典}，同一URL以最后一次抓取为准
+        """
+        path = self._full_reviews_path()
+        if not os.path.exists(path):
+            return {}
+        return {review['review_url']: review for review in read_jsonl(path)}
+    
+    def _review_urls(self) -> List[str]:
+        """
+        取出本次爬取到的影评URL并去重（保持顺序）
+        
+        Returns:
+            影评URL列表
+        """
+        if self.stream:
+            stream_file = self._stream_path('reviews')
+            reviews = read_jsonl(stream_file) if os.path.exists(stream_file) else []
+        else:
+            reviews = self.reviews
+        return list(dict.fromkeys(review['review_url'] for review in reviews if review.get('review_url')))
+    
+    def _fetch_more_replies(self, review_url: str, next_start: Optional[int]) -> List[Dict]:
+        """
+        抓取影评第2页及之后的回应
+        
+        Args:
+            review_url: 影评URL
+            next_start: 第一页解析出的下一页偏移，None表示没有更多回应
+            
+        Returns:
+            后续页的回应列表
+        """
+        replies = []
+        pages = 1
+        while next_start is not None and (MAX_REPLY_PAGES is None or pages < MAX_REPLY_PAGES):
+            html = self._get_page(f"{review_url}?start={next_start}", FULL_REVIEW_SELECTOR)
+            if not html:
+                print(f"\n获取回应失败: {review_url}?start={next_start}")
+                break
+            result = self.parser.parse_review_replies(html)
+            replies.extend(result['replies'])
+            pages += 1
+            # 防止分页链接指回当前页时死循环
+            if result['replies_next_start'] is None or result['replies_next_start'] <= next_start:
+                break
+            next_start = result['replies_next_start']
+        return replies
+    
+    def _scrape_list(self, page_type: str, url_template: str, per_page: int,
+                     max_pages: int = None) -> List[Dict]:
+        """
+        爬取短评或长评列表页，每页完成后写入爬取状态
+        
+        增量模式下已有数据整体保留在新条目之后，遇到一整页都是已知条目时停止
+        
+        Args:
+            page_type: 'comments' 或 'reviews'
+            url_template: 列表页URL模板
+            per_page: 每页条目数
             max_pages: 最大爬取页数，None表示爬取全部
             
         Returns:
-            短评列表
+            条目列表（增量模式下为新条目 + 已有条目）
         """
-        print("\n" + "="*50)
-        print("开始爬取短评...")
-        print("="*50)
+        label = '短评' if page_type == 'comments' else '影评'
+        id_field = ITEM_ID_FIELDS[page_type]
+        
+        if not self.resume:
+            self.state.reset(page_type)
+        section = self.state.section(page_type)
+        
+        seen_ids = set(section['item_ids'])
+        if self.stream:
+            # 流式模式：条目只写入磁盘，断点续爬时直接追加在原文件末尾
+            items = []
+            new_count = len(seen_ids)
+        else:
+            items = self._load_page_items(page_type, seen_ids) if self.resume else []
+            new_count = len(items)
+        
+        if self.incremental:
+            if self.stream:
+                seen_ids.update(self._saved_ids(page_type))
+            else:
+                existing = [item for item in self._load_saved_items(page_type)
+                            if item_key(item, id_field) not in seen_ids]
+                items.extend(existing)
+                seen_ids.update(item_key(item, id_field) for item in existing)
+            seen_ids.update(self.known_index.ids(page_type))
+            print(f"增量模式：已知{label} {len(seen_ids)} 条")
+        
+        # 直接累积到实例属性上，中断时已获取的数据也能被保存
+        setattr(self, page_type, items)
+        self.item_counts[page_type] = new_count
         
-        max_pages = max_pages or MAX_COMMENT_PAGES
-        page = 0
-        total_comments = []
+        if section['finished']:
+            print(f"{label}上次已爬取完毕，跳过")
+            return items
         
-        # 获取第一页，确定总数
-        first_url = COMMENTS_URL_TEMPLATE.format(movie_id=MOVIE_ID, start=0)
-        html = self._get_page(first_url)
+        completed = set(section['completed'])
+        if completed:
+            print(f"从断点继续：已完成 {len(completed)} 页，失败待重试 {len(section['failed'])} 页")
+        
+        starts = (start for start in self._page_starts(per_page, max_pages) if start not in completed)
+        
+        # 获取第一个待爬页面，确定总数
+        first_start = next(starts, None)
+        if first_start is None:
+            self.state.finish(page_type)
+            return items
+        
+        html = self._get_page(url_template.format(movie_id=self.movie_id, start=first_start),
+                              CONTENT_SELECTORS[page_type])
         
         if not html:
-            print("获取短评页面失败")
-            return total_comments
+            print(f"获取{label}页面失败")
+            self.state.record_failure(page_type, first_start)
+            return items
         
-        total_count = self.parser.get_total_comments_count(html)
-        total_pages = (total_count + COMMENTS_PER_PAGE - 1) // COMMENTS_PER_PAGE if total_count > 0 else 1
+        started = time.monotonic()
+        result = self._parse_list_page(html, page_type)
+        parse_time = time.monotonic() - started
+        total_count = result['total_count'] or section['total_count']
+        self.state.set_total(page_type, total_count)
+        total_pages = (total_count + per_page - 1) // per_page if total_count > 0 else 1
         
         if max_pages:
             total_pages = min(total_pages, max_pages)
         
-        print(f"预计爬取 {total_pages} 页，共约 {total_count} 条短评")
+        print(f"预计爬取 {total_pages} 页，共约 {total_count} 条{label}")
+
+        # 后续页面的偏移不超过预计的最后一页，浏览器池不会预取最后一页之后的页面
+        starts = itertools.takewhile(lambda start: start < total_pages * per_page, starts)
+
+        sink = self._page_sink(page_type)
+        
+        # 后续页面：启用解析进程池时获取与解析并行
+        pages = self._iter_parsed(self._iter_pages(url_template, starts, CONTENT_SELECTORS[page_type]), page_type)
         
         # 使用进度条
-        with tqdm(total=total_pages, desc="爬取短评") as pbar:
-            while True:
-                start = page * COMMENTS_PER_PAGE
-                url = COMMENTS_URL_TEMPLATE.format(movie_id=MOVIE_ID, start=start)
+        with sink, closing(pages), \
+                tqdm(total=total_pages, initial=min(len(completed), total_pages), desc=f"爬取{label}") as pbar:
+            # 第一页已经获取并解析过了
+            for start, html, result, parse_time in itertools.chain([(first_start, html, result, parse_time)], pages):
+                page = start // per_page
                 
-                if page > 0:  # 第一页已经获取过了
-                    html = self._get_page(url)
+                if not html and self.replay:
+                    # 离线重放时缓存中没有的页面当初就没有爬到（--pages 限制或中断），之后的页面也不会有
+                    print(f"\n缓存中没有第 {page + 1} 页，重放结束")
+                    break
                 
                 if not html:
                     print(f"\n第 {page + 1} 页获取失败，跳过")
-                    page += 1
+                    self.state.record_failure(page_type, start)
                     pbar.update(1)
                     continue
                 
-                comments = self.parser.parse_comments_page(html)
-                
-                if not comments:
-                    print(f"\n第 {page + 1} 页没有评论，可能已到末尾")
+                if not result['items']:
+                    self._record_parse(page_type, url_template.format(movie_id=self.movie_id, start=start),
+                                       0, 0, parse_time)
+                    print(f"\n第 {page + 1} 页没有{label}，可能已到末尾")
+                    if page + 1 < total_pages:
+                        # 还没到预计的最后一页就出现空页，通常是被限流
+                        self._report_pacing(False, 'empty')
                     break
                 
-                total_comments.extend(comments)
-                pbar.update(1)
-                pbar.set_postfix({"已获取": len(total_comments)})
+                # 翻页期间有新评论时，相邻页可能出现重复条目
+                new_items = [item for item in result['items'] if item_key(item, id_field) not in seen_ids]
+                seen_ids.update(item_key(item, id_field) for item in new_items)
+                self._record_parse(page_type, url_template.format(movie_id=self.movie_id, start=start),
+                                   len(result['items']), len(new_items), parse_time)
+                # 条目先落盘再记录该页完成，进程被强制结束后断点续爬也不会丢失
+                sink.write_page(new_items)
+                if not self.stream:
+                    items[new_count:new_count] = new_items
+                new_count += len(new_items)
+                self.item_counts[page_type] = new_count
+                self.state.record_page(page_type, start, [item_key(item, id_field) for item in new_items])
                 
-                page += 1
+                pbar.update(1)
+                pbar.set_postfix({"已获取": new_count})
                 
-                # 检查是否达到最大页数
-                if max_pages and page >= max_pages:
+                if self.incremental and not new_items:
+                    print(f"\n第 {page + 1} 页全部是已知{label}，增量爬取结束")
                     break
                 
                 # 检查是否有下一页
-                if not self.parser.has_next_page(html):
+                if not result['has_next']:
                     break
         
-        self.comments = total_comments
-        print(f"\n短评爬取完成，共获取 {len(total_comments)} 条")
-        
-        return total_comments
+        self.state.finish(page_type)
+        if self.incremental:
+            print(f"\n新增{label} {new_count} 条")
+        return items
     
-    def scrape_reviews(self, max_pages: int = None) -> List[Dict]:
+    def scrape_comments(self, max_pages: int = None) -> List[Dict]:
         """
-        爬取所有长评（影评）
+        爬取所有短评
         
         Args:
             max_pages: 最大爬取页数，None表示爬取全部
             
         Returns:
-            影评列表
+            短评列表
         """
         print("\n" + "="*50)
-        print("开始爬取长评（影评）...")
+        print("开始爬取短评...")
         print("="*50)
         
-        max_pages = max_pages or MAX_REVIEW_PAGES
-        page = 0
-        total_reviews = []
-        
-        # 获取第一页
-        first_url = REVIEWS_URL_TEMPLATE.format(movie_id=MOVIE_ID, start=0)
-        html = self._get_page(first_url)
+        if self.facets and not self.incremental:
+            total_comments = self._scrape_comment_facets(max_pages or MAX_COMMENT_PAGES)
+        else:
+            if self.facets:
+                print("增量模式按时间倒序爬取，不使用多维度爬取")
+            url_template = COMMENTS_LATEST_URL_TEMPLATE if self.incremental else COMMENTS_URL_TEMPLATE
+            total_comments = self._scrape_list(
+                'comments', url_template, COMMENTS_PER_PAGE,
+                max_pages or MAX_COMMENT_PAGES
+            )
+        print(f"\n短评爬取完成，共获取 {self.item_counts['comments']} 条")
         
-        if not html:
-            print("获取影评页面失败")
-            return total_reviews
+        return total_comments
+    
+    def _iter_facet_pages(self, planner: FacetPlanner) -> Iterator[Tuple[str, str, Optional[str]]]:
+        """
+        按爬取计划获取各维度的页面；启用浏览器池时各维度并发获取
         
-        total_count = self.parser.get_total_reviews_count(html)
-        total_pages = (total_count + REVIEWS_PER_PAGE - 1) // REVIEWS_PER_PAGE if total_count > 0 else 1
+        调用方处理完一页（调用 planner.record）后才会继续，以便根据结果决定该维度是否还有下一页
         
-        if max_pages:
-            total_pages = min(total_pages, max_pages)
+        Args:
+            planner: 多维度爬取计划
+            
+        Yields:
+            (维度标识, url, html) 元组，获取失败时html为None
+        """
+        wait_selector = CONTENT_SELECTORS['comments']
         
-        print(f"预计爬取 {total_pages} 页，共约 {total_count} 条影评")
+        if not self.pool:
+            # 单浏览器：各维度轮流翻页
+            while not planner.finished:
+                for key in planner.ready():
+                    _, url = planner.take(key)
+                    yield key, url, self._get_page(url, wait_selector)
+            return
         
-        with tqdm(total=total_pages, desc="爬取影评") as pbar:
+        window = self.pool.size + PREFETCH_PAGES
+        in_flight = {}
+        try:
             while True:
-                start = page * REVIEWS_PER_PAGE
-                url = REVIEWS_URL_TEMPLATE.format(movie_id=MOVIE_ID, start=start)
+                for key in planner.ready()[:max(0, window - len(in_flight))]:
+                    _, url = planner.take(key)
+                    in_flight[self.pool.submit(url, wait_selector)] = (key, url)
+                if not in_flight:
+                    return
                 
-                if page > 0:
-                    html = self._get_page(url)
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    key, url = in_flight.pop(future)
+                    html = future.result()
+                    self._cache_page(url, html)
+                    yield key, url, html
+        finally:
+            for future in in_flight:
+                future.cancel()
+    
+    def _scrape_comment_facets(self, max_pages: int = None) -> List[Dict]:
+        """
+        多维度爬取短评，按comment_id去重合并
+        
+        Args:
+            max_pages: 每个维度的最大页数，None表示不限制
+            
+        Returns:
+            短评列表
+        """
+        page_type = 'comments'
+        id_field = ITEM_ID_FIELDS[page_type]
+        
+        if not self.resume:
+            self.state.reset(page_type)
+            self.state.reset('comment_facets')
+        section = self.state.section(page_type)
+        facet_section = self.state.section('comment_facets')
+        
+        seen_ids = set(section['item_ids'])
+        if self.stream:
+            items = []
+            new_count = len(seen_ids)
+        else:
+            items = self._load_page_items(page_type, seen_ids) if self.resume else []
+            new_count = len(items)
+        
+        setattr(self, page_type, items)
+        self.item_counts[page_type] = new_count
+        
+        planner = FacetPlanner(self.movie_id, max_pages=max_pages, saved=facet_section.get('facets'))
+        if planner.finished:
+            print("短评上次已爬取完毕，跳过")
+            return items
+        
+        print(f"多维度爬取短评：{len(planner.facets)} 个维度，各维度连续无新短评时停止")
+        
+        sink = self._page_sink(page_type)
+        
+        with sink, closing(self._iter_facet_pages(planner)) as pages, \
+                tqdm(desc="多维度爬取短评", unit="页") as pbar:
+            for key, url, html in pages:
+                if not html and self.replay:
+                    # 离线重放时缓存中没有的页面按空页处理，该维度到此结束
+                    planner.record(key, {'items': [], 'has_next': False}, 0)
+                    pbar.update(1)
+                    continue
                 
                 if not html:
-                    print(f"\n第 {page + 1} 页获取失败，跳过")
-                    page += 1
+                    print(f"\n{key} 页面获取失败，跳过: {url}")
+                    planner.record(key, None, 0)
                     pbar.update(1)
                     continue
                 
-                reviews = self.parser.parse_reviews_page(html)
+                started = time.monotonic()
+                result = self._parse_list_page(html, page_type)
+                parse_time = time.monotonic() - started
                 
-                if not reviews:
-                    print(f"\n第 {page + 1} 页没有影评，可能已到末尾")
-                    break
+                # 不同维度之间大量重叠，按到达顺序去重
+                new_items = [item for item in result['items'] if item_key(item, id_field) not in seen_ids]
+                seen_ids.update(item_key(item, id_field) for item in new_items)
+                self._record_parse(page_type, url, len(result['items']), len(new_items), parse_time)
                 
-                total_reviews.extend(reviews)
-                pbar.update(1)
-                pbar.set_postfix({"已获取": len(total_reviews)})
-                
-                page += 1
+                sink.write_page(new_items)
+                if not self.stream:
+                    items.extend(new_items)
+                new_count += len(new_items)
+                self.item_counts[page_type] = new_count
                 
-                if max_pages and page >= max_pages:
-                    break
+                planner.record(key, result, len(new_items))
+                facet_section['facets'] = planner.snapshot()
+                self.state.record_page(page_type, url, [item_key(item, id_field) for item in new_items])
                 
-                if not self.parser.has_next_page(html):
-                    break
+                pbar.update(1)
+                pbar.set_postfix({"已获取": new_count, "进行中维度": len(planner.facets) - sum(
+                    state['done'] for state in planner.facets.values())})
         
-        self.reviews = total_reviews
-        print(f"\n影评爬取完成，共获取 {len(total_reviews)} 条")
+        self.state.finish(page_type)
+        for key, state in planner.facets.items():
+            print(f"  {key}: {state['pages']} 页")
+        return items
+    
+    def scrape_reviews(self, max_pages: int = None) -> List[Dict]:
+        """
+        爬取所有长评（影评）
+        
+        Args:
+            max_pages: 最大爬取页数，None表示爬取全部
+            
+        Returns:
+            影评列表
+        """
+        print("\n" + "="*50)
+        print("开始爬取长评（影评）...")
+        print("="*50)
+        
+        url_template = REVIEWS_LATEST_URL_TEMPLATE if self.incremental else REVIEWS_URL_TEMPLATE
+        total_reviews = self._scrape_list(
+            'reviews', url_template, REVIEWS_PER_PAGE,
+            max_pages or MAX_REVIEW_PAGES
+        )
+        print(f"\n影评爬取完成，共获取 {self.item_counts['reviews']} 条")
         
         return total_reviews
     
+    def scrape_full_reviews(self) -> Dict[str, Dict]:
+        """
+        抓取影评详情页，获取完整正文和回应
+        
+        影评URL来自 scrape_reviews 的结果，去重后与列表页共用节流器并发获取（启用浏览器池时），
+        每篇写入 full_reviews.jsonl 并记录断点；保存原始数据时完整正文合并到 reviews.csv 的
+        full_content 列
+        
+        Returns:
+            {影评URL: 详情字典}
+        """
+        print("\n" + "="*50)
+        print("开始抓取影评全文...")
+        print("="*50)
+        
+        kind = 'full_reviews'
+        if not self.resume:
+            self.state.reset(kind)
+        section = self.state.section(kind)
+        
+        # 增量模式下已抓取过的影评不再重复获取
+        keep_existing = self.resume or self.incremental
+        done = set(section['completed'])
+        if self.incremental:
+            done.update(self._load_full_reviews())
+        
+        urls = self._review_urls()
+        pending = [url for url in urls if url not in done]
+        self.state.set_total(kind, len(urls))
+        
+        if section['finished'] or not pending:
+            print("影评全文已全部抓取，跳过")
+            self.state.finish(kind)
+            return self._load_full_reviews()
+        
+        print(f"共 {len(urls)} 篇影评，待抓取 {len(pending)} 篇")
+        
+        with JsonlSink(self._full_reviews_path(), truncate=not keep_existing) as sink, \
+                closing(self._iter_urls(pending, FULL_REVIEW_SELECTOR)) as pages, \
+                tqdm(total=len(urls), initial=len(urls) - len(pending), desc="抓取影评全文") as pbar:
+            for url, html in pages:
+                if not html:
+                    print(f"\n影评获取失败，跳过: {url}")
+                    self.state.record_failure(kind, url)
+                    pbar.update(1)
+                    continue
+                
+                started = time.monotonic()
+                review = self.parser.parse_full_review(html)
+                self._record_parse('full_reviews', url, 1, 1, time.monotonic() - started)
+                next_start = review.pop('replies_next_start')
+                review['replies'].extend(self._fetch_more_replies(url, next_start))
+                review['review_url'] = url
+                
+                sink.write_page([review])
+                self.state.record_page(kind, url, [])
+                pbar.update(1)
+        
+        # 有失败的影评时不标记完成，--resume 时重试
+        if not section['failed']:
+            self.state.finish(kind)
+        full_reviews = self._load_full_reviews()
+        print(f"\n影评全文抓取完成，共 {len(full_reviews)} 篇")
+        return full_reviews
+    
     def scrape_all(self, max_comment_pages: int = None, max_review_pages: int = None) -> Dict:
         """
         爬取所有数据（电影信息、短评、长评）
@@ -411,47 +1531,127 @@ class DoubanScraper:
         self.start()
         
         try:
-            # 爬取电影信息
-            self.scrape_movie_info()
-            
-            # 爬取短评
-            self.scrape_comments(max_comment_pages)
-            
-            # 爬取长评
-            self.scrape_reviews(max_review_pages)
-            
-            return {
-                'movie_info': self.movie_info,
-                'comments': self.comments,
-                'reviews': self.reviews
-            }
+            return self._scrape_movie(max_comment_pages, max_review_pages)
+        finally:
+            self.stop()
+    
+    def _scrape_movie(self, max_comment_pages: int = None, max_review_pages: int = None) -> Dict:
+        """爬取当前电影的所有数据（浏览器需已启动）"""
+        # 爬取电影信息
+        self.scrape_movie_info()
+        
+        # 爬取短评
+        self.scrape_comments(max_comment_pages)
+        
+        # 爬取长评
+        self.scrape_reviews(max_review_pages)
+        
+        # 抓取影评全文
+        if self.full_reviews:
+            self.scrape_full_reviews()
+        
+        # 全部完成，断点不再需要
+        self.state.clear()
+        
+        return {
+            'movie_info': self.movie_info,
+            'comments': self.comments,
+            'reviews': self.reviews,
+            'counts': dict(self.item_counts)
+        }
+    
+    def scrape_batch(self, movie_ids: List[str], max_comment_pages: int = None,
+                     max_review_pages: int = None) -> Dict[str, Dict]:
+        """
+        批量爬取多部电影，共用一个已预热的浏览器会话和Cookie
+        
+        所有电影的页面都经过同一个节流器（或浏览器池），每部电影的数据写入 MOVIES_DIR/<电影ID>/
+        
+        Args:
+            movie_ids: 电影ID列表
+            max_comment_pages: 每部电影的短评最大页数
+            max_review_pages: 每部电影的长评最大页数
             
+        Returns:
+            {电影ID: {'title': 标题, 'comments': 短评数, 'reviews': 影评数}}，失败的电影带有 'error'
+        """
+        self.start()
+        summary = {}
+        
+        try:
+            for index, movie_id in enumerate(movie_ids, 1):
+                print("\n" + "#"*50)
+                print(f"[{index}/{len(movie_ids)}] 电影 {movie_id}")
+                print("#"*50)
+                
+                self.set_movie(movie_id, os.path.join(MOVIES_DIR, movie_id))
+                try:
+                    self._scrape_movie(max_comment_pages, max_review_pages)
+                    summary[movie_id] = {'title': self.movie_info.get('title', '未知')}
+                except KeyboardInterrupt:
+                    self.save_raw_data()
+                    raise
+                except Exception as e:
+                    # 单部电影出错不影响后续电影，断点保留以便 --resume
+                    print(f"\n❌ 电影 {movie_id} 爬取出错: {e}")
+                    summary[movie_id] = {'error': str(e)}
+                
+                self.save_raw_data()
+                summary[movie_id].update(self.item_counts)
         finally:
             self.stop()
+        
+        return summary
     
     def save_raw_data(self):
-        """保存原始数据到文件"""
+        """保存原始数据到文件；流式模式下把JSONL转换为CSV"""
         import pandas as pd
         
-        os.makedirs(DATA_DIR, exist_ok=True)
+        os.makedirs(self.data_dir, exist_ok=True)
+        
+        # 已抓取的影评全文合并到影评数据的 full_content 列
+        full_reviews = self._load_full_reviews()
+        
+        def with_full_content(reviews):
+            for review in reviews:
+                full = full_reviews.get(review.get('review_url'))
+                yield dict(review, full_content=full['content']) if full else review
         
-        # 保存短评
-        if self.comments:
-            comments_file = os.path.join(DATA_DIR, 'comments.csv')
-            df_comments = pd.DataFrame(self.comments)
-            df_comments.to_csv(comments_file, index=False, encoding='utf-8-sig')
-            print(f"短评已保存到: {comments_file}")
+        # 保存短评、影评，并更新已知条目索引供下次增量爬取使用
+        for page_type, label in (('comments', '短评'), ('reviews', '影评')):
+            csv_file = os.path.join(self.data_dir, f'{page_type}.csv')
+            id_field = ITEM_ID_FIELDS[page_type]
+            items = getattr(self, page_type)
+            fields = FIELDS[page_type]
+            merge_full = page_type == 'reviews' and full_reviews
+            if merge_full:
+                fields = fields + ['full_content']
+            
+            if self.stream:
+                stream_file = self._stream_path(page_type)
+                if not os.path.exists(stream_file):
+                    continue
+                rows = read_jsonl(stream_file)
+                ids = export_csv(
+                    with_full_content(rows) if merge_full else rows, csv_file, fields, id_field,
+                    existing_csv=csv_file if self.incremental else None
+                )
+            elif items:
+                if merge_full:
+                    items = list(with_full_content(items))
+                pd.DataFrame(items).to_csv(csv_file, index=False, encoding='utf-8-sig')
+                ids = [item_key(item, id_field) for item in items]
+            else:
+                continue
+            
+            print(f"{label}已保存到: {csv_file}")
+            self.known_index.update(page_type, ids)
         
-        # 保存影评
-        if self.reviews:
-            reviews_file = os.path.join(DATA_DIR, 'reviews.csv')
-            df_reviews = pd.DataFrame(self.reviews)
-            df_reviews.to_csv(reviews_file, index=False, encoding='utf-8-sig')
-            print(f"影评已保存到: {reviews_file}")
+        self.known_index.save()
         
         # 保存电影信息
         if self.movie_info:
-            info_file = os.path.join(DATA_DIR, 'movie_info.json')
+            info_file = os.path.join(self.data_dir, 'movie_info.json')
             with open(info_file, 'w', encoding='utf-8') as f:
                 json.dump(self.movie_info, f, ensure_ascii=False, indent=2)
             print(f"电影信息已保存到: {info_file}")
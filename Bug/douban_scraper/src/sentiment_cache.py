@@ -0,0 +1,187 @@
+"""
+情感分析缓存 - 以评论内容哈希为键，把SnowNLP情感分析结果持久化到SQLite，重复分析时不再调用模型
+"""
+import hashlib
+import os
+import sqlite3
+import sys
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import (
+    SENTIMENT_CACHE_FILE, SENTIMENT_CACHE_MAX_ENTRIES,
+    SENTIMENT_POSITIVE_THRESHOLD, SENTIMENT_NEGATIVE_THRESHOLD
+)
+
+# 单条SQL语句中的参数个数上限（SQLite默认999）
+_BATCH_SIZE = 500
+
+
+def _digest(text: str) -> str:
+    """评论内容的SHA-256"""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def model_version() -> str:
+    """
+    当前情感模型和阈值对应的缓存版本
+
+    模型文件（snownlp/sentiment/sentiment.marshal[.3]）的内容哈希加上正面/负面阈值，
+    重新训练模型、升级SnowNLP或修改阈值后版本随之变化
+
+    Returns:
+        版本字符串；找不到SnowNLP时返回空字符串
+    """
+    try:
+        import snownlp
+    except ImportError:
+        return ''
+    model_file = os.path.join(os.path.dirname(snownlp.__file__), 'sentiment', 'sentiment.marshal')
+    # Python 3 下 SnowNLP 读取带 .3 后缀的模型文件
+    if os.path.exists(model_file + '.3'):
+        model_file += '.3'
+    with open(model_file, 'rb') as f:
+        model_digest = hashlib.sha256(f.read()).hexdigest()[:16]
+    return f"{model_digest}:{SENTIMENT_POSITIVE_THRESHOLD}:{SENTIMENT_NEGATIVE_THRESHOLD}"
+
+
+class SentimentCache:
+    """情感分析结果缓存
+
+    表结构:
+        meta(key, value)                               记录缓存版本
+        sentiments(digest, score, sentiment, used_at)  评论内容哈希 -> (情感分数, 情感类别)
+
+    打开时版本与当前模型和阈值不一致则清空缓存，过期结果不会被复用；
+    条目数超过上限时按最近使用时间淘汰
+    """
+
+    def __init__(self, db_file: str = None, max_entries: int = None, version: str = None):
+        """
+        打开缓存数据库
+
+        Args:
+            db_file: SQLite文件路径，None时使用配置文件设置
+            max_entries: 最多保留的条目数（0表示不限制），None时使用配置文件设置
+            version: 缓存版本，None时根据当前模型文件和阈值计算
+        """
+        self.db_file = db_file or SENTIMENT_CACHE_FILE
+        self.max_entries = max_entries if max_entries is not None else SENTIMENT_CACHE_MAX_ENTRIES
+        self.version = version if version is not None else model_version()
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_file)), exist_ok=True)
+        self.conn = sqlite3.connect(self.db_file)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)')
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS sentiments '
+            '(digest TEXT PRIMARY KEY, score REAL NOT NULL, sentiment TEXT NOT NULL, used_at REAL NOT NULL)'
+        )
+        self.conn.execute('CREATE INDEX IF NOT EXISTS idx_sentiments_used_at ON sentiments (used_at)')
+
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        if not row or row[0] != self.version:
+            if row:
+                print("情感模型或阈值已变化，清空情感分析缓存")
+            self.conn.execute('DELETE FROM sentiments')
+            self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('version', ?)", (self.version,))
+        self.conn.commit()
+
+        self.count = self.conn.execute('SELECT COUNT(*) FROM sentiments').fetchone()[0]
+
+    def __len__(self) -> int:
+        return self.count
+
+    def get_many(self, texts: Iterable[str]) -> Dict[str, Tuple[float, str]]:
+        """
+        批量查询缓存，命中的条目同时更新最近使用时间
+
+        Args:
+            texts: 评论内容
+
+        Returns:
+            {评论内容: (情感分数, 情感类别)}，只包含命中的条目
+        """
+        digests = {}
+        for text in texts:
+            digests.setdefault(_digest(text), text)
+
+        found = {}
+        keys = list(digests)
+        now = time.time()
+        for i in range(0, len(keys), _BATCH_SIZE):
+            batch = keys[i:i + _BATCH_SIZE]
+            placeholders = ','.join('?' * len(batch))
+            rows = self.conn.execute(
+                f'SELECT digest, score, sentiment FROM sentiments WHERE digest IN ({placeholders})', batch
+            ).fetchall()
+            for digest, score, sentiment in rows:
+                found[digests[digest]] = (score, sentiment)
+            if rows:
+                hit = [digest for digest, _, _ in rows]
+                self.conn.execute(
+                    f"UPDATE sentiments SET used_at = ? WHERE digest IN ({','.join('?' * len(hit))})",
+                    [now] + hit
+                )
+        self.conn.commit()
+        return found
+
+    def get(self, text: str) -> Optional[Tuple[float, str]]:
+        """
+        查询一条评论的缓存结果
+
+        Returns:
+            (情感分数, 情感类别)；未缓存时返回None
+        """
+        return self.get_many([text]).get(text)
+
+    def put_many(self, results: Dict[str, Tuple[float, str]]):
+        """
+        批量写入分析结果，超过条目上限时淘汰最久未使用的条目
+
+        Args:
+            results: {评论内容: (情感分数, 情感类别)}
+        """
+        if not results:
+            return
+        now = time.time()
+        rows = [(_digest(text), score, sentiment, now) for text, (score, sentiment) in results.items()]
+        before = self.conn.total_changes
+        self.conn.executemany(
+            'INSERT OR IGNORE INTO sentiments (digest, score, sentiment, used_at) VALUES (?, ?, ?, ?)', rows
+        )
+        self.count += self.conn.total_changes - before
+        self.prune()
+        self.conn.commit()
+
+    def put(self, text: str, score: float, sentiment: str):
+        """写入一条分析结果"""
+        self.put_many({text: (score, sentiment)})
+
+    def prune(self):
+        """条目数超过上限时按最近使用时间淘汰"""
+        excess = self.count - self.max_entries
+        if not self.max_entries or excess <= 0:
+            return
+        self.conn.execute(
+            'DELETE FROM sentiments WHERE digest IN '
+            '(SELECT digest FROM sentiments ORDER BY used_at LIMIT ?)', (excess,)
+        )
+        self.count = self.max_entries
+        self.conn.commit()
+
+    def close(self):
+        """关闭数据库"""
+        self.conn.commit()
+        self.conn.close()
+
+
+# 测试代码
+if __name__ == "__main__":
+    cache = SentimentCache()
+    print(f"缓存版本: {cache.version}, 条目数: {len(cache)}")
+    print(cache.get("这部电影太好看了"))
+    cache.close()
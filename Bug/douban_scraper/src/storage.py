@@ -0,0 +1,142 @@
+"""
+流式存储 - 每爬完一页就把条目追加写入JSONL文件，并可转换回CSV
+"""
+import csv
+import json
+import os
+from typing import List, Dict, Iterable, Iterator
+
+# 输出字段（与解析器输出的字典字段顺序一致）
+COMMENT_FIELDS = ['username', 'user_url', 'rating', 'time', 'content', 'votes', 'comment_id']
+REVIEW_FIELDS = ['username', 'user_url', 'title', 'review_url', 'rating', 'time',
+                 'summary', 'useful_count', 'reply_count']
+
+FIELDS = {
+    'comments': COMMENT_FIELDS,
+    'reviews': REVIEW_FIELDS,
+}
+
+
+def item_key(item: Dict, id_field: str) -> str:
+    """
+    条目去重使用的标识
+
+    有ID时就是ID；ID为空（例如缺少 data-cid 的短评）时由用户名、时间和正文（或标题）开头组成，
+    避免所有没有ID的条目被当作同一条
+
+    Args:
+        item: 短评或影评
+        id_field: ID字段
+
+    Returns:
+        标识字符串
+    """
+    item_id = item.get(id_field)
+    if item_id is not None and item_id != '':
+        return str(item_id)
+    text = item.get('content') or item.get('title') or ''
+    return f"{item.get('username', '')}|{item.get('time', '')}|{str(text)[:50]}"
+
+
+class JsonlSink:
+    """只追加的JSONL写入器，每页写完立即落盘"""
+
+    def __init__(self, path: str, truncate: bool = False):
+        """
+        打开写入器
+
+        Args:
+            path: JSONL文件路径
+            truncate: 是否清空已有内容（新的爬取），否则在末尾追加（断点续爬）
+        """
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.file = open(path, 'w' if truncate else 'a', encoding='utf-8')
+
+    def write_page(self, items: List[Dict]):
+        """
+        写入一页条目并刷新到磁盘
+
+        Args:
+            items: 条目列表
+        """
+        if not items:
+            return
+        self.file.write(''.join(json.dumps(item, ensure_ascii=False) + '\n' for item in items))
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def close(self):
+        """关闭文件"""
+        if not self.file.closed:
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def read_jsonl(path: str) -> Iterator[Dict]:
+    """
+    逐行读取JSONL文件
+
+    崩溃时最后一行可能只写了一半，这样的行会被跳过
+
+    Args:
+        path: JSONL文件路径
+
+    Yields:
+        条目字典
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                print(f"跳过不完整的记录: {line[:50]}")
+
+
+def export_csv(rows: Iterable[Dict], csv_path: str, fields: List[str], id_field: str,
+               existing_csv: str = None) -> List[str]:
+    """
+    把条目流写成CSV（与pandas导出的格式一致），按条目标识去重（见 item_key）
+
+    Args:
+        rows: 条目迭代器（通常来自 read_jsonl）
+        csv_path: 输出CSV路径
+        fields: 列名
+        id_field: 去重使用的ID字段
+        existing_csv: 已有的CSV文件，其中未重复的行追加在新条目之后（增量合并）
+
+    Returns:
+        写入的全部条目标识
+    """
+    seen = set()
+    ids = []
+    tmp_path = csv_path + '.tmp'
+
+    def unique(items):
+        for item in items:
+            key = item_key(item, id_field)
+            if key in seen:
+                continue
+            seen.add(key)
+            ids.append(key)
+            yield item
+
+    with open(tmp_path, 'w', encoding='utf-8-sig', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=fields, extrasaction='ignore', lineterminator='\n')
+        writer.writeheader()
+        writer.writerows(unique(rows))
+
+        if existing_csv and os.path.exists(existing_csv):
+            with open(existing_csv, 'r', encoding='utf-8-sig', newline='') as old:
+                writer.writerows(unique(csv.DictReader(old)))
+
+    os.replace(tmp_path, csv_path)
+    return ids
@@ -0,0 +1,106 @@
+"""
+浏览器守护 - 在后台预热一个已加载Cookie的备用浏览器，当前浏览器失效时立即替换
+"""
+import threading
+from typing import Callable, Optional
+
+
+class DriverSupervisor:
+    """浏览器守护
+
+    冷启动Chrome并访问主页加载Cookie需要20秒以上；守护在后台线程中提前准备好一个备用浏览器，
+    当前浏览器窗口关闭或崩溃时直接换上备用浏览器，再在后台准备下一个
+    """
+
+    def __init__(self, factory: Callable):
+        """
+        初始化浏览器守护
+
+        Args:
+            factory: 创建浏览器的函数，返回已加载Cookie、可以直接使用的driver
+        """
+        self.factory = factory
+        self._standby = None
+        self._standby_error = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """
+        创建当前使用的浏览器，并开始在后台预热备用浏览器
+
+        Returns:
+            当前使用的driver
+        """
+        driver = self.factory()
+        self._spawn_standby()
+        return driver
+
+    def _spawn_standby(self):
+        """在后台线程中创建备用浏览器"""
+        def warm():
+            try:
+                self._standby = self.factory()
+            except Exception as e:
+                self._standby_error = e
+
+        self._standby = None
+        self._standby_error = None
+        self._thread = threading.Thread(target=warm, name='standby-driver', daemon=True)
+        self._thread.start()
+
+    def _take_standby(self):
+        """取出备用浏览器（仍在预热时等待其完成），不可用时返回None"""
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+        driver, self._standby = self._standby, None
+        if self._standby_error:
+            print(f"备用浏览器启动失败: {self._standby_error}")
+            return None
+        if driver is None:
+            return None
+
+        try:
+            _ = driver.current_url
+            return driver
+        except Exception:
+            print("备用浏览器已失效")
+            self._quit(driver)
+            return None
+
+    def replace(self, driver):
+        """
+        关闭失效的浏览器并换上备用浏览器，备用浏览器不可用时冷启动一个新的
+
+        Args:
+            driver: 失效的driver
+
+        Returns:
+            新的driver
+        """
+        self._quit(driver)
+        new_driver = self._take_standby()
+        if new_driver is not None:
+            print("已切换到备用浏览器")
+        else:
+            print("正在冷启动新浏览器...")
+            new_driver = self.factory()
+        self._spawn_standby()
+        return new_driver
+
+    def stop(self):
+        """关闭备用浏览器"""
+        standby = self._take_standby()
+        if standby is not None:
+            self._quit(standby)
+
+    @staticmethod
+    def _quit(driver):
+        """关闭浏览器，忽略已经崩溃的浏览器抛出的错误"""
+        if driver is None:
+            return
+        try:
+            driver.quit()
+        except Exception:
+            pass
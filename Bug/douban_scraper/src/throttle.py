@@ -0,0 +1,179 @@
+"""
+请求节流 - 多个抓取worker共享的全局请求频率控制
+"""
+import json
+import os
+import random
+import threading
+import time
+
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import (
+    PACING_MIN_DELAY, PACING_MAX_DELAY, PACING_DECREASE_STEP,
+    PACING_BACKOFF_FACTOR, PACING_JITTER, PACING_STATE_FILE,
+    CIRCUIT_BREAKER_THRESHOLD, CIRCUIT_BREAKER_COOLDOWN
+)
+
+
+class RateLimiter:
+    """全局请求间隔控制器（线程安全）"""
+
+    def __init__(self, min_interval: float, max_interval: float = None):
+        """
+        初始化节流器
+
+        Args:
+            min_interval: 相邻两次请求的最小间隔（秒）
+            max_interval: 相邻两次请求的最大间隔（秒），None时等于min_interval
+        """
+        self.min_interval = min_interval
+        self.max_interval = max_interval if max_interval is not None else min_interval
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        """阻塞直到轮到当前请求，所有调用方按先后顺序排队"""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + random.uniform(self.min_interval, self.max_interval)
+
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+    def success(self):
+        """页面正常加载（固定间隔节流器忽略反馈）"""
+
+    def failure(self, reason: str = ''):
+        """遇到限流迹象（固定间隔节流器忽略反馈）"""
+
+    def save(self):
+        """保存节流状态（固定间隔节流器无状态）"""
+
+
+class AdaptiveRateLimiter(RateLimiter):
+    """AIMD自适应节流器
+
+    页面正常加载时请求间隔每次减少一个固定步长（加性增加请求速率），
+    遇到安全验证、超时或异常空页时间隔成倍拉长（乘性减少请求速率）；
+    学到的间隔按名称保存到状态文件，下次运行从该间隔开始
+    """
+
+    def __init__(self, initial_interval: float, name: str = 'default', state_file: str = None):
+        """
+        初始化自适应节流器
+
+        Args:
+            initial_interval: 没有保存过的状态时使用的初始间隔（秒）
+            name: 状态名称，单浏览器和浏览器池的请求间隔分开学习
+            state_file: 状态文件路径，None时使用配置文件设置
+        """
+        self.name = name
+        self.state_file = state_file or PACING_STATE_FILE
+        delay = self._load() or initial_interval
+        super().__init__(delay)
+        self._set_delay(delay)
+
+    @property
+    def delay(self) -> float:
+        """当前请求间隔下限（秒）"""
+        return self.min_interval
+
+    def _set_delay(self, delay: float):
+        """把间隔限制在配置范围内，实际间隔在 [delay, delay * (1 + PACING_JITTER)] 之间随机"""
+        delay = min(max(delay, PACING_MIN_DELAY), PACING_MAX_DELAY)
+        self.min_interval = delay
+        self.max_interval = delay * (1 + PACING_JITTER)
+
+    def success(self):
+        """页面正常加载，缩短一个步长"""
+        with self._lock:
+            self._set_delay(self.delay - PACING_DECREASE_STEP)
+
+    def failure(self, reason: str = ''):
+        """
+        遇到限流迹象，间隔成倍拉长，并让下一个请求至少等待新的间隔
+
+        Args:
+            reason: 原因（challenge/timeout/empty等），用于输出提示
+        """
+        with self._lock:
+            self._set_delay(self.delay * PACING_BACKOFF_FACTOR)
+            self._next_slot = max(self._next_slot, time.monotonic() + self.delay)
+            delay = self.delay
+        print(f"\n⚠️  检测到限流迹象（{reason}），请求间隔调整为 {delay:.1f} 秒")
+
+    def _load(self) -> float:
+        """读取上次学到的间隔，没有时返回0"""
+        if not os.path.exists(self.state_file):
+            return 0
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                return float(json.load(f).get(self.name, {}).get('delay', 0))
+        except Exception as e:
+            print(f"读取节流状态失败: {e}")
+            return 0
+
+    def save(self):
+        """原子写入学到的间隔"""
+        data = {}
+        if os.path.exists(self.state_file):
+            try:
+                with open(self.state_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except Exception:
+                data = {}
+        data[self.name] = {'delay': round(self.delay, 3), 'updated_at': time.time()}
+
+        os.makedirs(os.path.dirname(self.state_file), exist_ok=True)
+        tmp_path = self.state_file + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.state_file)
+
+
+class CircuitBreaker:
+    """安全验证熔断器（线程安全，浏览器池的worker共用一个实例）
+
+    连续多次遇到安全验证（中间没有正常加载的页面）说明请求过于频繁，
+    熔断器打开后所有请求暂停一段时间再继续
+    """
+
+    def __init__(self, threshold: int = None, cooldown: float = None):
+        """
+        初始化熔断器
+
+        Args:
+            threshold: 连续安全验证次数阈值，None时使用配置文件设置
+            cooldown: 熔断后暂停的秒数，None时使用配置文件设置
+        """
+        self.threshold = threshold or CIRCUIT_BREAKER_THRESHOLD
+        self.cooldown = cooldown if cooldown is not None else CIRCUIT_BREAKER_COOLDOWN
+        self._challenges = 0
+        self._open_until = 0.0
+        self._lock = threading.Lock()
+
+    def record_challenge(self):
+        """遇到一次安全验证，达到阈值时打开熔断器"""
+        with self._lock:
+            self._challenges += 1
+            if self._challenges < self.threshold:
+                return
+            self._challenges = 0
+            self._open_until = time.monotonic() + self.cooldown
+        print(f"\n⛔ 连续 {self.threshold} 次遇到安全验证，暂停爬取 {self.cooldown:.0f} 秒")
+
+    def record_success(self):
+        """页面正常加载，清零连续安全验证计数"""
+        with self._lock:
+            self._challenges = 0
+
+    def wait(self):
+        """熔断器打开时阻塞到暂停结束"""
+        with self._lock:
+            delay = self._open_until - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)